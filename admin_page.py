@@ -243,6 +243,67 @@ def display_system_info():
         
         st.code('\n'.join(project_files[:20]))
 
+def display_rag_index():
+    """RAG index katalógus (forrás fájlok, topicok, chunk számok)"""
+    st.header("📚 RAG Index")
+    
+    try:
+        from rag_pdf import load_index_catalog
+    except ImportError:
+        st.error("❌ RAG modul nem elérhető!")
+        return
+    
+    catalog = load_index_catalog()
+    if not catalog:
+        st.info("Még nincs beindexelt dokumentum (a katalógus az első RAG elemzéskor készül el).")
+        return
+    
+    summary = catalog.get('summary', {})
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("📄 Források", summary.get('total_sources', 0))
+    with col2:
+        st.metric("🧩 Chunkok", summary.get('total_chunks', 0))
+    with col3:
+        st.metric("📑 Oldalak", summary.get('total_pages', 0))
+    with col4:
+        st.metric("💾 Szöveg", f"{summary.get('text_bytes', 0) / 1024:.1f} KB")
+    
+    st.caption(
+        f"Gyűjtemény: {summary.get('collection')} ({summary.get('backend')}) • "
+        f"Utolsó ingest: {summary.get('last_ingest') or '-'}"
+    )
+    
+    topics = summary.get('topics', {})
+    if topics:
+        st.subheader("🏷️ Topicok")
+        st.dataframe(
+            pd.DataFrame([
+                {'Topic': topic, 'Források': data['sources'], 'Chunkok': data['chunks']}
+                for topic, data in topics.items()
+            ]),
+            use_container_width=True
+        )
+    
+    sources = catalog.get('sources', {})
+    if sources:
+        st.subheader("📄 Forrás fájlok")
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    'Fájl': source['file_name'],
+                    'Topic': source['topic'],
+                    'Chunkok': source['chunks'],
+                    'Oldalak': source['pages'],
+                    'Méret (KB)': round(source['file_bytes'] / 1024, 1),
+                    'Beindexelve': source['ingested_at'][:19].replace('T', ' ')
+                }
+                for source in sources.values()
+            ]),
+            use_container_width=True
+        )
+
 def main():
     """Fő admin funkció"""
     configure_page()
@@ -259,6 +320,7 @@ def main():
                 "📁 Fájl Info",
                 "📄 Nyers Adatok",
                 "🛠️ Eszközök",
+                "📚 RAG Index",
                 "💻 Rendszer Info"
             ]
         )
@@ -290,6 +352,9 @@ def main():
     elif page == "🛠️ Eszközök":
         display_backup_tools()
     
+    elif page == "📚 RAG Index":
+        display_rag_index()
+    
     elif page == "💻 Rendszer Info":
         display_system_info()
 
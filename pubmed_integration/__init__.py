@@ -4,13 +4,20 @@ PubMed integráció a medical chatbot számára.
 LangChain alapú PubMed keresés és elemzés.
 """
 
-from .pubmed_analyzer import PubMedAnalyzer, run_pubmed_analysis
+from .pubmed_analyzer import (
+    PubMedAnalyzer, run_pubmed_analysis, arun_pubmed_analysis, get_shared_analyzer,
+    reset_shared_analyzer, get_pool_stats
+)
 from .advanced_search_strategy import AdvancedPubMedSearchStrategy
 from .config import PUBMED_CONFIG
 
 __all__ = [
     'PubMedAnalyzer',
     'run_pubmed_analysis',
+    'arun_pubmed_analysis',
+    'get_shared_analyzer',
+    'reset_shared_analyzer',
+    'get_pool_stats',
     'AdvancedPubMedSearchStrategy',
     'PUBMED_CONFIG'
 ]
\ No newline at end of file
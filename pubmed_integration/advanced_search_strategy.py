@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from enum import Enum
 import streamlit as st
 
+from .translation_service import DIAGNOSIS_TRANSLATIONS, get_medical_dictionary
+
 class StudyType(Enum):
     META_ANALYSIS = "meta-analysis"
     SYSTEMATIC_REVIEW = "systematic review"
@@ -415,104 +417,14 @@ class AdvancedPubMedSearchStrategy:
     
     # Helper metódusok
     def _translate_symptom(self, symptom: str) -> str:
-        """Tünet fordítása angolra - BŐVÍTETT"""
-        translations = {
-            'fejfájás': 'headache',
-            'láz': 'fever', 
-            'köhögés': 'cough',
-            'torokfájás': 'sore throat',
-            'hányás': 'vomiting',
-            'hasmenés': 'diarrhea',
-            'fáradtság': 'fatigue',
-            'szédülés': 'dizziness',
-            'hasfájás': 'abdominal pain',
-            'hányinger': 'nausea',
-            'légzési nehézség': 'dyspnea',
-            'nehéz légzés': 'dyspnea',
-            'fulladás': 'dyspnea',
-            'mellkasi fájdalom': 'chest pain',
-            'étvágytalanság': 'anorexia',
-            'fogyás': 'weight loss',
-            'hízás': 'weight gain',
-            'gyengeség': 'weakness',
-            'izomfájdalom': 'muscle pain',
-            'ízületi fájdalom': 'joint pain',
-            'hátfájás': 'back pain',
-            'nyakfájás': 'neck pain',
-            'bőrkiütés': 'rash',
-            'viszketés': 'pruritus',
-            'alvászavar': 'sleep disorder',
-            'álmatlanság': 'insomnia',
-            'nyugtalanság': 'restlessness',
-            'idegesség': 'nervousness',
-            'koncentrációs problémák': 'concentration problems',
-            'memóriaproblémák': 'memory problems',
-            'vizeletürítési problémák': 'urination problems',
-            'gyakori vizelés': 'frequent urination',
-            'szomjúság': 'thirst',
-            'szárazság': 'dryness',
-            'izzadás': 'sweating',
-            'hidegrázás': 'chills',
-            'fázékonyság': 'chills',
-            'hőhullámok': 'hot flashes',
-            'vérzés': 'bleeding',
-            'zúzódás': 'bruising',
-            'duzzanat': 'swelling',
-            'fájdalom': 'pain',
-            'égő érzés': 'burning sensation',
-            'zsibbadás': 'numbness',
-            'bizsergés': 'tingling'
-        }
-        
+        """Tünet fordítása angolra - közös (ékezetfüggetlen) orvosi szótárból"""
         symptom_lower = symptom.lower().strip()
-        return translations.get(symptom_lower, symptom_lower)
+        return get_medical_dictionary().lookup(symptom_lower) or symptom_lower
     
     def _translate_condition(self, condition: str) -> str:
-        """Betegség fordítása - BŐVÍTETT"""
-        translations = {
-            'magas vérnyomás': 'hypertension',
-            'cukorbetegség': 'diabetes mellitus',
-            'asztma': 'asthma',
-            'allergia': 'allergy',
-            'szívbetegség': 'heart disease',
-            'szívinfarktus': 'myocardial infarction',
-            'stroke': 'stroke',
-            'rák': 'cancer',
-            'tumor': 'tumor',
-            'epilepszia': 'epilepsy',
-            'migrén': 'migraine',
-            'depresszió': 'depression',
-            'szorongás': 'anxiety',
-            'arthritis': 'arthritis',
-            'osteoporosis': 'osteoporosis',
-            'hypothyroidism': 'hypothyroidism',
-            'hyperthyroidism': 'hyperthyroidism',
-            'veseproblémák': 'kidney disease',
-            'májproblémák': 'liver disease',
-            'tüdőproblémák': 'lung disease',
-            'gastritis': 'gastritis',
-            'reflux': 'gastroesophageal reflux',
-            'colitis': 'colitis',
-            'irritábilis bél': 'irritable bowel syndrome',
-            'krónikus fájdalom': 'chronic pain',
-            'fibromyalgia': 'fibromyalgia',
-            'autoimmun betegség': 'autoimmune disease',
-            'immunhiány': 'immunodeficiency',
-            'obesitas': 'obesity',
-            'anorexia': 'anorexia',
-            'bulimia': 'bulimia',
-            'szkizofrénia': 'schizophrenia',
-            'bipoláris zavar': 'bipolar disorder',
-            'adhd': 'attention deficit hyperactivity disorder',
-            'autizmus': 'autism',
-            'alzheimer': 'alzheimer disease',
-            'parkinson': 'parkinson disease',
-            'multiple sclerosis': 'multiple sclerosis',
-            'lupus': 'systemic lupus erythematosus'
-        }
-        
+        """Betegség fordítása - közös (ékezetfüggetlen) orvosi szótárból"""
         condition_lower = condition.lower().strip()
-        return translations.get(condition_lower, condition_lower)
+        return get_medical_dictionary().lookup(condition_lower) or condition_lower
     
     def _clean_diagnosis(self, diagnosis: str) -> str:
         """Diagnózis tisztítása és normalizálása"""
@@ -533,48 +445,8 @@ class AdvancedPubMedSearchStrategy:
         for pattern in uncertainty_patterns:
             clean_diag = re.sub(pattern, '', clean_diag)
         
-        # Magyar→angol orvosi kifejezések fordítása
-        medical_translations = {
-            'felső légúti fertőzés': 'upper respiratory infection',
-            'vírusos fertőzés': 'viral infection',
-            'bakteriális fertőzés': 'bacterial infection',
-            'gyomor-bél fertőzés': 'gastroenteritis',
-            'influenza': 'influenza',
-            'megfázás': 'common cold',
-            'tonsillitis': 'tonsillitis',
-            'pharyngitis': 'pharyngitis',
-            'bronchitis': 'bronchitis',
-            'pneumonia': 'pneumonia',
-            'sinusitis': 'sinusitis',
-            'otitis': 'otitis',
-            'conjunctivitis': 'conjunctivitis',
-            'dermatitis': 'dermatitis',
-            'allergiás reakció': 'allergic reaction',
-            'étel allergia': 'food allergy',
-            'asztma': 'asthma',
-            'migrén': 'migraine',
-            'tenziós fejfájás': 'tension headache',
-            'gastritis': 'gastritis',
-            'reflux': 'gastroesophageal reflux',
-            'irritábilis bél szindróma': 'irritable bowel syndrome',
-            'húgyúti fertőzés': 'urinary tract infection',
-            'cystitis': 'cystitis',
-            'veseköves': 'nephrolithiasis kidney stones',
-            'magas vérnyomás': 'hypertension',
-            'diabetes': 'diabetes mellitus',
-            'hypothyroidism': 'hypothyroidism',
-            'hyperthyroidism': 'hyperthyroidism',
-            'anémia': 'anemia',
-            'depresszió': 'depression',
-            'szorongás': 'anxiety disorder',
-            'fibromyalgia': 'fibromyalgia',
-            'arthritis': 'arthritis',
-            'osteoarthritis': 'osteoarthritis',
-            'rheumatoid arthritis': 'rheumatoid arthritis'
-        }
-        
         # Keresés a fordítási szótárban
-        for hu_term, en_term in medical_translations.items():
+        for hu_term, en_term in DIAGNOSIS_TRANSLATIONS.items():
             if hu_term in clean_diag:
                 return en_term
         
@@ -0,0 +1,137 @@
+# pubmed_integration/client_pool.py
+"""
+Folyamat szintű HTTP / LLM kliens pool a PubMed elemzéshez.
+
+Az NCBI kérések egyetlen `requests.Session` keep-alive kapcsolatain, az
+OpenAI hívások egyetlen `httpx.Client` kapcsolatain futnak, így az
+elemzésenkénti kliens létrehozás és TLS kézfogás elmarad. A ChatOpenAI
+példányok beállításonként (API kulcs, modell, hőmérséklet, max_tokens)
+egyszer jönnek létre. Async kliens nincs a poolban: az async elemzés is a
+sync klienst használja külön szálon, így egyik event loophoz sem kötődik.
+"""
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from langchain_openai import ChatOpenAI
+
+from .config import PUBMED_CONFIG
+
+_ChatKey = Tuple[str, str, float, Optional[int]]
+
+
+class ClientPool:
+    """Szálbiztos, megosztott NCBI session és OpenAI kliensek"""
+
+    def __init__(self):
+        config = PUBMED_CONFIG["pool"]
+        self._lock = threading.Lock()
+
+        # NCBI: a párhuzamos lekérdezés változatok egy host pooljából dolgoznak
+        self._ncbi_session = requests.Session()
+        self._ncbi_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config["ncbi_pool_maxsize"])
+        self._ncbi_session.mount("https://", self._ncbi_adapter)
+        self._ncbi_session.mount("http://", self._ncbi_adapter)
+
+        # OpenAI: közös keep-alive pool minden sync ChatOpenAI példánynak
+        self._openai_limits = httpx.Limits(
+            max_connections=config["openai_max_connections"],
+            max_keepalive_connections=config["openai_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"]
+        )
+        self.openai_requests = 0
+        self._openai_http_client = httpx.Client(
+            limits=self._openai_limits,
+            event_hooks={'request': [self._count_openai_request]}
+        )
+
+        self._chat_models: Dict[_ChatKey, ChatOpenAI] = {}
+        self.chat_model_hits = 0
+        self.chat_model_misses = 0
+
+    def _count_openai_request(self, request: httpx.Request):
+        with self._lock:
+            self.openai_requests += 1
+
+    def ncbi_session(self) -> requests.Session:
+        return self._ncbi_session
+
+    def chat_model(self, openai_api_key: str, model: str, temperature: float,
+                   max_tokens: Optional[int] = None) -> ChatOpenAI:
+        """Megosztott (sync hívásokra szánt) ChatOpenAI példány"""
+        key = (openai_api_key, model, float(temperature), max_tokens)
+        with self._lock:
+            chat = self._chat_models.get(key)
+            if chat is None:
+                self.chat_model_misses += 1
+                chat = self._create_chat(key, http_client=self._openai_http_client)
+                self._chat_models[key] = chat
+            else:
+                self.chat_model_hits += 1
+            return chat
+
+    @staticmethod
+    def _create_chat(key: _ChatKey, **clients) -> ChatOpenAI:
+        openai_api_key, model, temperature, max_tokens = key
+        params = {'max_tokens': max_tokens} if max_tokens is not None else {}
+        return ChatOpenAI(openai_api_key=openai_api_key, model=model,
+                          temperature=temperature, **params, **clients)
+
+    def _ncbi_pool_stats(self) -> Dict[str, int]:
+        """urllib3 pool számlálók: új (TLS) kapcsolatok és kérések"""
+        connections = requests_sent = 0
+        pools = self._ncbi_adapter.poolmanager.pools
+        for pool_key in list(pools.keys()):
+            pool = pools.get(pool_key)
+            if pool is not None:
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return {'connections_opened': connections, 'requests': requests_sent}
+
+    def _openai_open_connections(self) -> Optional[int]:
+        pool = getattr(getattr(self._openai_http_client, '_transport', None), '_pool', None)
+        return len(pool.connections) if pool is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        ncbi = self._ncbi_pool_stats()
+        with self._lock:
+            return {
+                'ncbi_connections_opened': ncbi['connections_opened'],
+                'ncbi_requests': ncbi['requests'],
+                'openai_requests': self.openai_requests,
+                'openai_open_connections': self._openai_open_connections(),
+                'chat_models': len(self._chat_models),
+                'chat_model_hits': self.chat_model_hits,
+                'chat_model_misses': self.chat_model_misses
+            }
+
+    def close(self):
+        """A megosztott kapcsolatok lezárása"""
+        with self._lock:
+            self._ncbi_session.close()
+            self._openai_http_client.close()
+            self._chat_models.clear()
+
+
+_shared_pool: Optional[ClientPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """A folyamat közös kliens poolja (lusta létrehozás)"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ClientPool()
+        return _shared_pool
+
+
+def reset_client_pool():
+    """A közös pool lezárása (a következő get_client_pool újat hoz létre)"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            _shared_pool = None
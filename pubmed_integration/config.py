@@ -14,6 +14,46 @@ PUBMED_CONFIG = {
     "search": {
         "max_results": 500,  # Maximum hány publikációt kérjünk le
         "min_relevance_score": 0.5,
+        "results_per_query": 5,  # esearch találatok lekérdezés változatonként
+        "max_workers": 3,  # Párhuzamosan futó lekérdezés változatok
+        "required_successes": 2,  # Ennyi sikeres (prioritás szerinti) lekérdezés után a többi megszakad
+    },
+    
+    # NCBI E-utilities kliens
+    "eutils": {
+        "base_url": "https://eutils.ncbi.nlm.nih.gov/entrez/eutils",
+        "timeout": 15,  # Kérésenkénti időkorlát (másodperc)
+        "max_retry": 3,  # 429 / 5xx válasz esetén
+        "tool": "medbot-streamlit",
+        "email": "",  # NCBI ajánlás: kapcsolattartó e-mail cím
+    },
+    
+    # Elemző prompt kontextusa
+    "context": {
+        "token_budget": 2500,  # PubMed rekordok token kerete
+        "rrf_k": 60,  # Lekérdezés változatok rangjainak összevonása
+    },
+    
+    # NCBI E-utilities rate limit (API kulcs nélkül max. 3 kérés/s)
+    "rate_limit": {
+        "requests_per_second": 3,
+        "burst": 3,  # Egyszerre felhasználható kérés keret
+    },
+    
+    # Folyamat szintű kliens pool (keep-alive kapcsolatok a sessionök között)
+    "pool": {
+        "ncbi_pool_maxsize": 10,  # NCBI kapcsolatok (>= search.max_workers)
+        "openai_max_connections": 20,
+        "openai_keepalive_connections": 10,
+        "keepalive_expiry": 30,  # Tétlen kapcsolat élettartama (másodperc)
+    },
+    
+    # PubMed keresési eredmény cache (SQLite)
+    "cache": {
+        "enabled": True,
+        "path": str(PUBMED_DATA_DIR / "search_cache.sqlite3"),
+        "ttl_hours": 72,  # Bejegyzés élettartama
+        "max_entries": 2000,  # LRU kiürítés e felett
     },
     
     # LLM beállítások
@@ -23,6 +63,21 @@ PUBMED_CONFIG = {
         "max_tokens": 3000
     },
     
+    # Betegadat fordítás (szótár először, a többi a RAG fordítási memóriáján és egy LLM hívásón át)
+    "translation": {
+        "model": "gpt-4",
+        "temperature": 0.1,
+        "learned_path": str(PUBMED_DATA_DIR / "learned_translations.json"),  # LLM-mel tanult szótár bejegyzések
+        "max_learned_words": 6,  # Ennél hosszabb szöveg (pl. RAG összefoglaló) nem kerül a szótárba
+    },
+    
+    # Async futtatás időkorlátok (másodperc)
+    "async": {
+        "search_timeout": 60,  # Fordítás + PubMed lekérdezések
+        "rag_wait_timeout": 90,  # RAG eredményre várakozás az elemzés előtt
+        "analysis_timeout": 90,  # LLM elemzés
+    },
+    
     # Nyelvi beállítások
     "language": {
         "search_language": "en",  # PubMed keresés angol nyelven
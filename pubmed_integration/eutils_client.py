@@ -0,0 +1,89 @@
+# pubmed_integration/eutils_client.py
+"""
+NCBI E-utilities kliens strukturált PubMed rekordokhoz.
+
+Lekérdezésenként egy esearch (Best Match sorrend) és egyetlen batch
+efetch kérés megy ki (a LangChain PubMed tool cikkenként külön efetch-et
+küld), minden kérés a közös rate limiteren keresztül. A kérések egy
+`requests.Session` keep-alive kapcsolatain futnak.
+"""
+import time
+from typing import Dict, List, Any, Optional
+
+import requests
+
+from .config import PUBMED_CONFIG
+from .rate_limiter import acquire_request_slot
+from .records import PubMedRecord, parse_efetch_xml
+
+
+class EUtilitiesClient:
+    """
+    esearch + efetch kliens.
+
+    Args:
+        session: Megosztott HTTP session (None: saját)
+        retmax: Találatok száma lekérdezésenként
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, retmax: Optional[int] = None):
+        config = PUBMED_CONFIG["eutils"]
+        self.base_url = config["base_url"].rstrip("/")
+        self.timeout = config["timeout"]
+        self.max_retry = config["max_retry"]
+        self.retmax = retmax or PUBMED_CONFIG["search"]["results_per_query"]
+        self.session = session or requests.Session()
+        self._common_params = {'tool': config["tool"]}
+        if config.get("email"):
+            self._common_params['email'] = config["email"]
+
+    def _get(self, endpoint: str, params: Dict[str, Any]) -> requests.Response:
+        """Rate limitelt GET, 429 / 5xx esetén exponenciális visszalépéssel"""
+        delay = 0.5
+        for attempt in range(self.max_retry + 1):
+            acquire_request_slot()
+            response = self.session.get(f"{self.base_url}/{endpoint}",
+                                        params={**self._common_params, **params},
+                                        timeout=self.timeout)
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt < self.max_retry:
+                    print(f"⏳ E-utilities {response.status_code}, újrapróbálás {delay:.1f} s múlva")
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+            response.raise_for_status()
+            return response
+        raise RuntimeError("E-utilities: elfogytak az újrapróbálások")
+
+    def search(self, query: str, retmax: Optional[int] = None) -> List[str]:
+        """PMID-k relevancia (Best Match) sorrendben"""
+        response = self._get("esearch.fcgi", {
+            'db': 'pubmed',
+            'term': query,
+            'retmode': 'json',
+            'retmax': retmax or self.retmax,
+            'sort': 'relevance'
+        })
+        payload = response.json()
+        result = payload.get('esearchresult', {})
+        # Hibás lekérdezésnél az esearch 200-as válaszban ad hibát - ezt nem szabad üres találatként kezelni
+        error = payload.get('error') or result.get('ERROR')
+        if error:
+            raise RuntimeError(f"E-utilities esearch hiba: {error}")
+        return list(result.get('idlist', []))
+
+    def fetch(self, pmids: List[str]) -> List[PubMedRecord]:
+        """Rekordok egyetlen efetch kéréssel, a megadott PMID sorrendben"""
+        if not pmids:
+            return []
+        response = self._get("efetch.fcgi", {
+            'db': 'pubmed',
+            'id': ",".join(pmids),
+            'retmode': 'xml'
+        })
+        by_pmid = {record.pmid: record for record in parse_efetch_xml(response.text)}
+        return [by_pmid[pmid] for pmid in pmids if pmid in by_pmid]
+
+    def search_records(self, query: str) -> List[PubMedRecord]:
+        """esearch + efetch: a lekérdezés rekordjai relevancia sorrendben"""
+        return self.fetch(self.search(query))
@@ -4,54 +4,87 @@ PubMed alapú orvosi kutatás és elemzés
 """
 import os
 import re
+import asyncio
+import inspect
+import threading
 import streamlit as st
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, Awaitable, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import json
 from pathlib import Path
 
-from langchain_community.tools.pubmed.tool import PubmedQueryRun
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
 from .config import PUBMED_CONFIG, PUBMED_DATA_DIR
+from .rate_limiter import bind_cancel_event
+from .search_cache import get_search_cache
+from .eutils_client import EUtilitiesClient
+from .records import PubMedRecord, merge_records, pack_records
+from .translation_service import TranslationService
+from .client_pool import get_client_pool
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
 from .advanced_search_strategy import AdvancedPubMedSearchStrategy
 
+def _resolve_api_key(openai_api_key: str = None) -> str:
+    """OpenAI API kulcs: paraméter, környezeti változó vagy Streamlit secrets"""
+    if not openai_api_key:
+        openai_api_key = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY")
+    
+    if not openai_api_key:
+        raise ValueError("OpenAI API key nem található")
+    
+    return openai_api_key
+
 class PubMedAnalyzer:
-    """PubMed alapú orvosi elemző"""
+    """
+    PubMed alapú orvosi elemző.
+    
+    A HTTP / LLM kliensek a folyamat közös pooljából jönnek, elemzésenkénti
+    állapotot nem tárol, így egy példány több Streamlit session között is
+    megosztható (lásd get_shared_analyzer).
+    """
     
     def __init__(self, openai_api_key: str = None):
         # API kulcs
-        if not openai_api_key:
-            openai_api_key = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY")
+        self.api_key = _resolve_api_key(openai_api_key)
+        pool = get_client_pool()
         
-        if not openai_api_key:
-            raise ValueError("OpenAI API key nem található")
+        # PubMed E-utilities kliens (közös keep-alive session és NCBI rate limiter)
+        self.pubmed_client = EUtilitiesClient(session=pool.ncbi_session())
         
-        self.api_key = openai_api_key
+        # Keresési eredmény cache (a kliens beállításai a kulcs részei)
+        self.search_cache = get_search_cache(f"eutils-records;retmax={self.pubmed_client.retmax}")
         
-        # PubMed tool inicializálása
-        self.pubmed_tool = PubmedQueryRun()
-        
-        # LLM inicializálása
-        self.llm = ChatOpenAI(
-            openai_api_key=self.api_key,
-            model=PUBMED_CONFIG["llm"]["model"],
-            temperature=PUBMED_CONFIG["llm"]["temperature"],
-            max_tokens=PUBMED_CONFIG["llm"]["max_tokens"]
-        )
+        # LLM inicializálása (megosztott példány és kapcsolat pool)
+        self.llm_params = {
+            'model': PUBMED_CONFIG["llm"]["model"],
+            'temperature': PUBMED_CONFIG["llm"]["temperature"],
+            'max_tokens': PUBMED_CONFIG["llm"]["max_tokens"]
+        }
+        self.llm = pool.chat_model(self.api_key, **self.llm_params)
         
-        # Fordító LLM (kisebb modell a költséghatékonyság miatt)
-        self.translator = ChatOpenAI(
-            openai_api_key=self.api_key,
-            model="gpt-4",
-            temperature=0.1
+        # Fordító LLM - csak a szótárban (beépített + megtanult) nem szereplő kifejezésekhez
+        self.translator = pool.chat_model(
+            self.api_key,
+            model=PUBMED_CONFIG["translation"]["model"],
+            temperature=PUBMED_CONFIG["translation"]["temperature"]
         )
+        self.translation_service = TranslationService(self.translator)
     
     # TOVÁBBFEJLESZTETT ADVANCED SEARCH STRATEGY
-    def run_advanced_pubmed_search(self, patient_data: Dict[str, Any]) -> str:
-        """Újratervezett stratégia alapú lekérdezés és keresés"""
+    def run_advanced_pubmed_search(self, patient_data: Dict[str, Any]) -> List[PubMedRecord]:
+        """
+        Újratervezett stratégia alapú lekérdezés és keresés
+        
+        Returns:
+            List: PMID szerint egyedi rekordok relevancia sorrendben
+        """
         strategy = AdvancedPubMedSearchStrategy()
         
         # Debug információk megjelenítése fejlesztési módban
@@ -63,46 +96,112 @@ class PubMedAnalyzer:
         
         if not queries:
             st.warning("⚠️ Nem sikerült keresési lekérdezéseket generálni")
-            return ""
-        
-        # Lekérdezések végrehajtása
-        all_results = ""
-        successful_queries = 0
+            return []
         
-        for i, q in enumerate(queries):
-            query_string = strategy.format_final_query(q)
-            
+        query_strings = [strategy.format_final_query(q) for q in queries]
+        for i, query_string in enumerate(query_strings):
             if not query_string:
                 st.warning(f"❌ {i+1}. lekérdezés üres")
+        
+        # Lekérdezések párhuzamos végrehajtása, eredmények prioritási sorrendben
+        outcomes = self._run_queries_concurrently(query_strings)
+        
+        used_results = []
+        successful_queries = 0
+        required = PUBMED_CONFIG["search"]["required_successes"]
+        
+        for i, query_string in enumerate(query_strings):
+            if not query_string or i not in outcomes:
                 continue
-                
-            #st.info(f"🔍 {i+1}. lekérdezés ({len(query_string)} karakter): {query_string[:100]}...")
             
-            try:
-                result = self.pubmed_tool.invoke(query_string)
-                if result and len(result.strip()) > 50:  # Csak értelmes eredményeket fogadjuk el
-                    all_results += f"\n--- QUERY {i+1} ---\n{query_string}\n--- RESULT ---\n{result}\n"
-                    successful_queries += 1
-                    #st.success(f"✅ {i+1}. lekérdezés sikeres")
-                else:
-                    st.warning(f"⚠️ {i+1}. lekérdezés üres eredményt adott")
-                
-                # Ha már van 2 sikeres lekérdezés, elég
-                if successful_queries >= 2:
-                    break
-                    
-            except Exception as e:
-                st.error(f"❌ Hiba a {i+1}. lekérdezésnél: {e}")
-                continue
+            records, error = outcomes[i]
+            if error is not None:
+                st.error(f"❌ Hiba a {i+1}. lekérdezésnél: {error}")
+            elif records:
+                used_results.append((i, records))
+                successful_queries += 1
+            else:
+                st.warning(f"⚠️ {i+1}. lekérdezés üres eredményt adott")
+            
+            # Ha már van elég sikeres lekérdezés, elég
+            if successful_queries >= required:
+                break
         
         if successful_queries == 0:
             st.error("❌ Egyik lekérdezés sem volt sikeres")
-            return ""
+            return []
         
         #st.success(f"✅ Összesen {successful_queries} sikeres lekérdezés")
-        return all_results.strip()
+        return merge_records(used_results, rrf_k=PUBMED_CONFIG["context"]["rrf_k"])
     
-    def run_simple_pubmed_search(self, patient_data: Dict[str, Any]) -> str:
+    def _run_queries_concurrently(self, query_strings: List[str]
+                                  ) -> Dict[int, Tuple[List[PubMedRecord], Optional[Exception]]]:
+        """
+        Lekérdezés változatok párhuzamos futtatása a közös NCBI rate limiter alatt.
+        
+        Amint a prioritási sorrendben első `required_successes` sikeres
+        lekérdezés eldőlt (minden előttük álló lekérdezés befejeződött), a
+        még el nem indult lekérdezések törlődnek, a futók a következő
+        E-utilities kérésük előtt megszakadnak.
+        
+        Returns:
+            Dict: lekérdezés index -> (rekordok, hiba vagy None) a befejezett lekérdezésekre
+        """
+        pending = {i: q for i, q in enumerate(query_strings) if q}
+        if not pending:
+            return {}
+        
+        required = PUBMED_CONFIG["search"]["required_successes"]
+        cancel_event = threading.Event()
+        outcomes: Dict[int, Tuple[List[PubMedRecord], Optional[Exception]]] = {}
+        
+        def run_query(query_string: str) -> List[PubMedRecord]:
+            bind_cancel_event(cancel_event)
+            try:
+                return self._search_records(query_string)
+            finally:
+                bind_cancel_event(None)
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(PUBMED_CONFIG["search"]["max_workers"], len(pending)),
+            thread_name_prefix="pubmed-query"
+        )
+        try:
+            futures = {executor.submit(run_query, q): i for i, q in pending.items()}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    outcomes[index] = (future.result(), None)
+                except Exception as e:
+                    outcomes[index] = ([], e)
+                if _quota_settled(sorted(pending), outcomes, required):
+                    break
+        finally:
+            cancel_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        return outcomes
+    
+    def _search_records(self, query_string: str) -> List[PubMedRecord]:
+        """esearch + efetch a keresési cache-en keresztül (hiba esetén kivétel, nem cache-elve)"""
+        if self.search_cache is not None:
+            cached = self.search_cache.get(query_string)
+            if cached is not None:
+                return [PubMedRecord.from_dict(item) for item in json.loads(cached)]
+        
+        records = self.pubmed_client.search_records(query_string)
+        if self.search_cache is not None:
+            self.search_cache.put(query_string, json.dumps([r.to_dict() for r in records], ensure_ascii=False))
+        return records
+    
+    def get_translation_stats(self) -> Dict[str, Any]:
+        """Szótár találati arány és fordítási LLM hívások száma"""
+        return self.translation_service.stats()
+    
+    def get_search_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Keresési cache találati / hiány számlálók"""
+        return self.search_cache.stats() if self.search_cache is not None else None
+    
+    def run_simple_pubmed_search(self, patient_data: Dict[str, Any]) -> List[PubMedRecord]:
         """Egyszerű fallback keresés, ha a komplex keresés nem működik"""
         symptoms = patient_data.get('symptoms', [])
         diagnosis = patient_data.get('diagnosis', '')
@@ -125,7 +224,7 @@ class PubMedAnalyzer:
                 query_parts.append(eng_diagnosis)
         
         if not query_parts:
-            return ""
+            return []
         
         # Egyszerű query összeállítása
         simple_query = " AND ".join(query_parts[:2])  # Max 2 elem
@@ -134,31 +233,17 @@ class PubMedAnalyzer:
         #st.info(f"🔍 Egyszerű keresés: {final_query}")
         
         try:
-            result = self.pubmed_tool.invoke(final_query)
-            return result if result else ""
+            return merge_records([(0, self._search_records(final_query))],
+                                 rrf_k=PUBMED_CONFIG["context"]["rrf_k"])
         except Exception as e:
             st.error(f"❌ Egyszerű keresés is sikertelen: {e}")
-            return ""
+            return []
     
     def _simple_translate(self, text: str) -> str:
-        """Egyszerű magyar-angol fordítás alapvető kifejezésekhez"""
-        simple_translations = {
-            'fejfájás': 'headache',
-            'láz': 'fever',
-            'köhögés': 'cough',
-            'hányás': 'vomiting',
-            'hasmenés': 'diarrhea',
-            'fáradtság': 'fatigue',
-            'szédülés': 'dizziness',
-            'hasfájás': 'abdominal pain',
-            'torokfájás': 'sore throat',
-            'légzési nehézség': 'dyspnea',
-            'influenza': 'influenza',
-            'megfázás': 'common cold',
-            'gastritis': 'gastritis',
-            'allergia': 'allergy',
-            'asztma': 'asthma'
-        }
+        """Egyszerű magyar-angol fordítás a közös orvosi szótárból (LLM hívás nélkül)"""
+        english = self.translation_service.dictionary.lookup(text)
+        if english is not None:
+            return english
         
         text_lower = text.lower().strip()
         
@@ -166,40 +251,34 @@ class PubMedAnalyzer:
         text_lower = re.sub(r'^(lehetséges|valószínű|esetleg|talán)\s+', '', text_lower)
         text_lower = re.sub(r'\s+(gyanúja|gyanú)$', '', text_lower)
         
-        return simple_translations.get(text_lower, text_lower)  
+        return text_lower
     
     def translate_to_english(self, text: str) -> str:
-        """Magyar szöveg fordítása angolra"""
-        if not text:
-            return ""
-        
-        prompt = f"Translate this Hungarian medical text to English. Only return the translation, nothing else:\n{text}"
-        return self.translator.predict(prompt).strip()
+        """Magyar szöveg fordítása angolra (szótár, különben LLM)"""
+        return self.translation_service.translate(text)
     
     def translate_patient_data(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Betegadatok fordítása angolra a PubMed kereséshez"""
+        """Betegadatok fordítása angolra a PubMed kereséshez (egyetlen batch-csel)"""
         translated = {}
         
-        # Tünetek fordítása
-        symptoms = patient_data.get('symptoms', [])
-        if symptoms:
-            translated['symptoms'] = [self.translate_to_english(s) for s in symptoms if s]
-        
-        # Diagnózis fordítása
+        symptoms = [s for s in patient_data.get('symptoms') or [] if s]
         diagnosis = patient_data.get('diagnosis', '')
-        if diagnosis:
-            translated['diagnosis'] = self.translate_to_english(diagnosis)
+        conditions = [c for c in patient_data.get('existing_conditions') or [] if c]
+        medications = [m for m in patient_data.get('medications') or [] if m]
         
-        # Egyéb mezők fordítása
-        if patient_data.get('existing_conditions'):
-            translated['existing_conditions'] = [
-                self.translate_to_english(c) for c in patient_data['existing_conditions'] if c
-            ]
+        # A szótárban nem szereplő kifejezések egyetlen LLM hívásban
+        translations = self.translation_service.translate_many(
+            symptoms + ([diagnosis] if diagnosis else []) + conditions + medications
+        )
         
-        if patient_data.get('medications'):
-            translated['medications'] = [
-                self.translate_to_english(m) for m in patient_data['medications'] if m
-            ]
+        if symptoms:
+            translated['symptoms'] = [translations.get(s, s) for s in symptoms]
+        if diagnosis:
+            translated['diagnosis'] = translations.get(diagnosis, diagnosis)
+        if conditions:
+            translated['existing_conditions'] = [translations.get(c, c) for c in conditions]
+        if medications:
+            translated['medications'] = [translations.get(m, m) for m in medications]
         
         # Számértékek átvétele változtatás nélkül
         translated['age'] = patient_data.get('age')
@@ -252,19 +331,68 @@ class PubMedAnalyzer:
         """PubMed keresés végrehajtása"""
         try:
             #st.info(f"🔍 PubMed keresés: {query[:100]}...")
-            results = self.pubmed_tool.invoke(query)
-            return results
+            records = self._search_records(query)
+            return "\n\n".join(record.to_text() for record in records)
         except Exception as e:
             st.error(f"PubMed keresési hiba: {e}")
             return ""
     
-    def analyze_pubmed_results(self, pubmed_results: str, patient_data: Dict[str, Any], 
+    def analyze_pubmed_results(self, pubmed_results: Union[List[PubMedRecord], str], patient_data: Dict[str, Any], 
                              rag_results: Dict[str, Any] = None) -> Dict[str, Any]:
         """PubMed eredmények elemzése és magyar nyelvű összefoglaló készítése"""
         
         if not pubmed_results:
             return self._create_empty_result()
         
+        try:
+            # Rekordok a token keretig, relevancia sorrendben
+            pubmed_text, sources = self._pack_pubmed_results(pubmed_results)
+            
+            # Elemzés futtatása
+            response = self._create_analysis_chain().run(
+                **self._analysis_inputs(pubmed_text, patient_data, rag_results)
+            )
+            
+            # Válasz feldolgozása
+            return self._attach_sources(self._parse_analysis_response(response), sources)
+            
+        except Exception as e:
+            st.error(f"PubMed elemzési hiba: {e}")
+            return self._create_empty_result()
+    
+    async def aanalyze_pubmed_results(self, pubmed_results: Union[List[PubMedRecord], str],
+                                      patient_data: Dict[str, Any],
+                                      rag_results: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        analyze_pubmed_results async változata: a megosztott (keep-alive) sync
+        klienssel fut külön szálon, így nem kötődik egyik event loophoz sem.
+        Megszakításkor a várakozás áll le, a folyamatban lévő hívás végigfut.
+        """
+        return await _run_in_thread(self.analyze_pubmed_results, pubmed_results, patient_data, rag_results)
+    
+    def _pack_pubmed_results(self, pubmed_results: Union[List[PubMedRecord], str]
+                             ) -> Tuple[str, List[PubMedRecord]]:
+        """Prompt szöveg a rekordokból a token keretig (nyers szövegnél a régi hosszkorlát)"""
+        if isinstance(pubmed_results, str):
+            return pubmed_results[:3000], []
+        return pack_records(pubmed_results, PUBMED_CONFIG["context"]["token_budget"])
+    
+    def _attach_sources(self, result: Dict[str, Any], sources: List[PubMedRecord]) -> Dict[str, Any]:
+        """A promptba került publikációk azonosítói az eredményhez"""
+        if result.get('success') and sources:
+            result['sources'] = [
+                {
+                    'pmid': record.pmid,
+                    'title': record.title,
+                    'published': record.published,
+                    'publication_types': record.publication_types
+                }
+                for record in sources
+            ]
+        return result
+    
+    def _create_analysis_chain(self) -> LLMChain:
+        """Elemző LLM chain"""
         # Prompt template az elemzéshez
         analysis_prompt = PromptTemplate(
             input_variables=["pubmed_results", "patient_info", "rag_context"],
@@ -292,8 +420,11 @@ FONTOS: A válaszod legyen MAGYAR nyelvű, közérthető és praktikus!
         )
         
         # LLM chain
-        chain = LLMChain(llm=self.llm, prompt=analysis_prompt)
-        
+        return LLMChain(llm=self.llm, prompt=analysis_prompt)
+    
+    def _analysis_inputs(self, pubmed_results: str, patient_data: Dict[str, Any],
+                         rag_results: Dict[str, Any] = None) -> Dict[str, str]:
+        """Az elemző prompt bemenetei"""
         # Beteg info összefoglalása
         patient_info = self._format_patient_info(patient_data)
         
@@ -305,20 +436,11 @@ FONTOS: A válaszod legyen MAGYAR nyelvű, közérthető és praktikus!
             Javasolt kezelés: {rag_results.get('symptom_management', 'N/A')}
             """
         
-        try:
-            # Elemzés futtatása
-            response = chain.run(
-                pubmed_results=pubmed_results[:3000],  # Limitáljuk a hosszt
-                patient_info=patient_info,
-                rag_context=rag_context
-            )
-            
-            # Válasz feldolgozása
-            return self._parse_analysis_response(response)
-            
-        except Exception as e:
-            st.error(f"PubMed elemzési hiba: {e}")
-            return self._create_empty_result()
+        return {
+            'pubmed_results': pubmed_results,
+            'patient_info': patient_info,
+            'rag_context': rag_context
+        }
     
     def _format_patient_info(self, patient_data: Dict[str, Any]) -> str:
         """Beteg információk formázása"""
@@ -580,6 +702,177 @@ FONTOS: A válaszod legyen MAGYAR nyelvű, közérthető és praktikus!
             st.error(f"Mentési hiba: {e}")
             return ""
 
+# =============================================================================
+# MEGOSZTOTT ANALYZER - API kulcsonként egy példány
+# =============================================================================
+
+class PubMedAnalyzerRegistry:
+    """
+    Folyamat szintű, szálbiztos PubMedAnalyzer registry.
+    
+    Az analyzer (E-utilities kliens, LLM kliensek, fordító szolgáltatás)
+    API kulcsonként egyszer jön létre és minden Streamlit session között
+    megosztott; a kapcsolatokat a közös kliens pool tartja életben.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._analyzers: Dict[str, PubMedAnalyzer] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, openai_api_key: str = None) -> PubMedAnalyzer:
+        """Megosztott analyzer lekérése (szükség esetén létrehozás)"""
+        openai_api_key = _resolve_api_key(openai_api_key)
+        with self._lock:
+            analyzer = self._analyzers.get(openai_api_key)
+            if analyzer is None:
+                self.misses += 1
+                analyzer = PubMedAnalyzer(openai_api_key)
+                self._analyzers[openai_api_key] = analyzer
+            else:
+                self.hits += 1
+            return analyzer
+    
+    def clear(self):
+        """Összes megosztott analyzer eldobása (következő get újra létrehozza)"""
+        with self._lock:
+            self._analyzers.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'analyzers': len(self._analyzers),
+                'analyzer_hits': self.hits,
+                'analyzer_misses': self.misses
+            }
+
+
+_ANALYZER_REGISTRY = PubMedAnalyzerRegistry()
+
+
+def get_shared_analyzer(openai_api_key: str = None) -> PubMedAnalyzer:
+    """Folyamat szinten megosztott PubMedAnalyzer példány"""
+    return _ANALYZER_REGISTRY.get(openai_api_key)
+
+
+def reset_shared_analyzer():
+    """Megosztott analyzer(ek) eldobása"""
+    _ANALYZER_REGISTRY.clear()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Megosztott analyzerek és kliens pool statisztikái"""
+    return {**_ANALYZER_REGISTRY.stats(), **get_client_pool().stats()}
+
+def _quota_settled(indexes: List[int], outcomes: Dict[int, Tuple[List[PubMedRecord], Optional[Exception]]],
+                   required: int) -> bool:
+    """Eldőlt-e a prioritási sorrend szerinti első `required` sikeres lekérdezés"""
+    successes = 0
+    for index in indexes:
+        if index not in outcomes:
+            return False
+        records, error = outcomes[index]
+        if error is None and records:
+            successes += 1
+            if successes >= required:
+                return True
+    return True
+
+def collect_pubmed_results(analyzer: PubMedAnalyzer, patient_data: Dict[str, Any]) -> List[PubMedRecord]:
+    """
+    Az elemzés keresési fázisa: fordítás és PubMed lekérdezések.
+    
+    A RAG eredményre csak az elemzési lépésnek van szüksége, így ez a
+    fázis a RAG elemzéssel párhuzamosan futtatható.
+    """
+    # 1. Magyar adatok fordítása angolra
+    #st.info("🌐 Adatok előkészítése a kereséshez...")
+    translated_data = analyzer.translate_patient_data(patient_data)
+    
+    # 2-3. PubMed keresés - TOVÁBBFEJLESZTETT STRATÉGIA
+    #st.info("🔍 Optimalizált PubMed keresés indítása...")
+    pubmed_results = analyzer.run_advanced_pubmed_search(translated_data)
+    
+    # Ha a fejlett keresés nem működött, próbáljuk az egyszerű keresést
+    if not pubmed_results:
+        st.warning("⚠️ Fejlett keresés sikertelen, egyszerű keresés próbálása...")
+        pubmed_results = analyzer.run_simple_pubmed_search(patient_data)
+    
+    return pubmed_results
+
+async def _run_in_thread(func, *args):
+    """Blokkoló függvény futtatása külön szálon, a Streamlit script kontextus átadásával"""
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    
+    def runner():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+    
+    return await asyncio.get_running_loop().run_in_executor(None, runner)
+
+async def arun_pubmed_analysis(patient_data: Dict[str, Any],
+                               rag_results: Union[Dict[str, Any], Awaitable, None] = None,
+                               openai_api_key: str = None) -> Dict[str, Any]:
+    """
+    run_pubmed_analysis async változata.
+    
+    A keresési fázis azonnal indul; a RAG eredményt (ami lehet még futó
+    task / coroutine is) csak az elemzési lépés előtt várjuk meg. Ha a RAG
+    nem készül el időben, kontextus nélkül elemzünk. Megszakításkor a
+    CancelledError továbbterjed (a RAG taskot nem szakítjuk meg).
+    
+    Args:
+        patient_data: Beteg adatok
+        rag_results: RAG eredmény dict vagy awaitable (opcionális)
+        openai_api_key: OpenAI API kulcs
+    """
+    async_config = PUBMED_CONFIG["async"]
+    
+    try:
+        analyzer = get_shared_analyzer(openai_api_key)
+        
+        try:
+            pubmed_results = await asyncio.wait_for(
+                _run_in_thread(collect_pubmed_results, analyzer, patient_data),
+                timeout=async_config["search_timeout"]
+            )
+        except asyncio.TimeoutError:
+            st.warning(f"⏱️ PubMed keresés időtúllépés ({async_config['search_timeout']} s)")
+            pubmed_results = []
+        
+        if inspect.isawaitable(rag_results):
+            try:
+                rag_results = await asyncio.wait_for(
+                    asyncio.shield(rag_results), timeout=async_config["rag_wait_timeout"]
+                )
+            except asyncio.TimeoutError:
+                print("⏱️ RAG eredmény nem készült el időben, elemzés RAG kontextus nélkül")
+                rag_results = None
+        if rag_results and not rag_results.get('success', False):
+            rag_results = None
+        
+        if not pubmed_results:
+            st.warning("⚠️ Nem találtunk releváns publikációkat egyik módszerrel sem")
+            return analyzer._create_empty_result()
+        
+        try:
+            analysis_results = await asyncio.wait_for(
+                analyzer.aanalyze_pubmed_results(pubmed_results, patient_data, rag_results),
+                timeout=async_config["analysis_timeout"]
+            )
+        except asyncio.TimeoutError:
+            st.warning(f"⏱️ PubMed elemzés időtúllépés ({async_config['analysis_timeout']} s)")
+            return analyzer._create_empty_result()
+        
+        analyzer.save_results(analysis_results, patient_data)
+        return analysis_results
+        
+    except Exception as e:
+        st.error(f"❌ PubMed elemzési hiba: {e}")
+        return {'success': False, 'error': str(e)}
+
 def run_pubmed_analysis(patient_data: Dict[str, Any], 
                     rag_results: Dict[str, Any] = None,
                     openai_api_key: str = None) -> Dict[str, Any]:
@@ -597,25 +890,11 @@ def run_pubmed_analysis(patient_data: Dict[str, Any],
     try:
         #st.info("🔬 PubMed mélykutatás indítása...")
         
-        # Analyzer inicializálása
-        analyzer = PubMedAnalyzer(openai_api_key)
-        
-        # 1. Magyar adatok fordítása angolra
-        #st.info("🌐 Adatok előkészítése a kereséshez...")
-        translated_data = analyzer.translate_patient_data(patient_data)
-        
-        # 2. Keresési query összeállítása
-        search_query = analyzer.build_search_query(translated_data, rag_results)
-        #st.info(f"🔍 Keresési kifejezés: {search_query}")
-        
-        # 3. PubMed keresés - TOVÁBBFEJLESZTETT STRATÉGIA
-        #st.info("🔍 Optimalizált PubMed keresés indítása...")
-        pubmed_results = analyzer.run_advanced_pubmed_search(translated_data)
+        # Megosztott analyzer (közös kliens pool)
+        analyzer = get_shared_analyzer(openai_api_key)
         
-        # Ha a fejlett keresés nem működött, próbáljuk az egyszerű keresést
-        if not pubmed_results or len(pubmed_results.strip()) < 100:
-            st.warning("⚠️ Fejlett keresés sikertelen, egyszerű keresés próbálása...")
-            pubmed_results = analyzer.run_simple_pubmed_search(patient_data)
+        # 1-3. Fordítás és PubMed keresés (nem függ a RAG eredménytől)
+        pubmed_results = collect_pubmed_results(analyzer, patient_data)
         
         if not pubmed_results:
             st.warning("⚠️ Nem találtunk releváns publikációkat egyik módszerrel sem")
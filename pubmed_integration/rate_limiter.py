@@ -0,0 +1,115 @@
+# pubmed_integration/rate_limiter.py
+"""
+Folyamat szintű token bucket rate limiter az NCBI E-utilities hívásokhoz.
+
+Az NCBI API kulcs nélkül legfeljebb 3 kérést enged másodpercenként (IP
+címenként), ezért minden PubMed kérés - száltól és Streamlit sessiontől
+függetlenül - ugyanazon a limiteren osztozik. A limit HTTP kérés
+szinten érvényes (minden esearch / efetch kérés egy token).
+"""
+import time
+import threading
+from typing import Optional
+
+from .config import PUBMED_CONFIG
+
+
+class TokenBucket:
+    """
+    Szálbiztos token bucket.
+
+    Args:
+        rate: Utántöltés (token / másodperc)
+        capacity: Maximális löket (egyszerre felhasználható tokenek)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None,
+                cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Tokenek lefoglalása, szükség esetén várakozással.
+
+        Returns:
+            bool: True, ha sikerült; False időtúllépés vagy megszakítás esetén
+        """
+        tokens = min(float(tokens), self.capacity)
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.acquired += 1
+                    self.waited_seconds += now - start
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            if cancel_event is not None:
+                if cancel_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+    def stats(self):
+        return {
+            'rate': self.rate,
+            'capacity': self.capacity,
+            'acquired': self.acquired,
+            'waited_seconds': round(self.waited_seconds, 3)
+        }
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """A folyamat közös NCBI rate limitere (lusta létrehozás)"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            config = PUBMED_CONFIG["rate_limit"]
+            _shared_limiter = TokenBucket(config["requests_per_second"], config["burst"])
+        return _shared_limiter
+
+
+class QueryCancelled(Exception):
+    """A lekérdezés megszakítva (a sikeres lekérdezések száma már elegendő)"""
+
+
+_thread_state = threading.local()
+
+
+def bind_cancel_event(cancel_event: Optional[threading.Event]):
+    """Az aktuális szál PubMed kéréseinek megszakítási eseménye (None: nincs)"""
+    _thread_state.cancel_event = cancel_event
+
+
+def acquire_request_slot():
+    """Egy E-utilities kérés engedélyezése (QueryCancelled, ha a szál lekérdezését megszakították)"""
+    cancel_event = getattr(_thread_state, 'cancel_event', None)
+    if cancel_event is not None and cancel_event.is_set():
+        raise QueryCancelled()
+    if not get_rate_limiter().acquire(cancel_event=cancel_event):
+        raise QueryCancelled()
+
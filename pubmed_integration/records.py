@@ -0,0 +1,223 @@
+# pubmed_integration/records.py
+"""
+Strukturált PubMed rekordok: efetch XML feldolgozás, PMID szerinti
+összevonás a lekérdezés változatok között, relevancia rangsor és
+token-keretes prompt összeállítás.
+
+Relevancia: a változatok esearch (Best Match) rangjainak reciprocal rank
+fusion összege, az evidencia szinttel (publikáció típus) súlyozva.
+"""
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+
+# Becslés, ha a tiktoken kódolás nem érhető el (offline környezet)
+CHARS_PER_TOKEN = 4
+
+# Publikáció típus -> evidencia szint (magasabb = erősebb evidencia)
+EVIDENCE_LEVELS = [
+    ("meta-analysis", 10),
+    ("systematic review", 9),
+    ("randomized controlled trial", 8),
+    ("practice guideline", 8),
+    ("guideline", 7),
+    ("clinical trial", 7),
+    ("observational study", 5),
+    ("review", 4),
+    ("case report", 2),
+]
+
+_MONTHS = {name: f"{i:02d}" for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+
+
+@dataclass
+class PubMedRecord:
+    """Egy PubMed publikáció a prompthoz szükséges mezőkkel"""
+    pmid: str
+    title: str = ""
+    published: str = ""
+    publication_types: List[str] = field(default_factory=list)
+    abstract: str = ""
+    journal: str = ""
+    ranks: Dict[int, int] = field(default_factory=dict)  # lekérdezés index -> esearch rang
+    score: float = 0.0
+
+    @property
+    def evidence_level(self) -> int:
+        return evidence_level(self.publication_types)
+
+    def to_text(self, max_abstract_chars: Optional[int] = None) -> str:
+        abstract = self.abstract or "No abstract available"
+        if max_abstract_chars is not None and len(abstract) > max_abstract_chars:
+            abstract = abstract[:max_abstract_chars].rsplit(" ", 1)[0] + " ..."
+        return (f"PMID: {self.pmid}\n"
+                f"Title: {self.title}\n"
+                f"Published: {self.published}\n"
+                f"Publication type: {', '.join(self.publication_types) or 'N/A'}\n"
+                f"Abstract: {abstract}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['ranks'] = {str(k): v for k, v in self.ranks.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PubMedRecord":
+        data = dict(data)
+        data['ranks'] = {int(k): v for k, v in (data.get('ranks') or {}).items()}
+        return cls(**data)
+
+
+def evidence_level(publication_types: Iterable[str]) -> int:
+    level = 0
+    for publication_type in publication_types:
+        lowered = publication_type.lower()
+        for name, value in EVIDENCE_LEVELS:
+            if name in lowered:
+                level = max(level, value)
+                break
+    return level
+
+
+# ----------------------------------------------------------------------
+# efetch XML feldolgozás
+# ----------------------------------------------------------------------
+def _text(element: Optional[ET.Element]) -> str:
+    return " ".join("".join(element.itertext()).split()) if element is not None else ""
+
+
+def _publication_date(article: ET.Element) -> str:
+    """ÉÉÉÉ-HH-NN (ami elérhető): ArticleDate, különben a folyóirat szám dátuma"""
+    for path in ("ArticleDate", "Journal/JournalIssue/PubDate"):
+        date = article.find(path)
+        if date is None:
+            continue
+        year = _text(date.find("Year"))
+        if not year:
+            medline_date = _text(date.find("MedlineDate"))
+            if medline_date:
+                return medline_date
+            continue
+        month = _text(date.find("Month"))
+        month = _MONTHS.get(month[:3].lower(), month.zfill(2) if month.isdigit() else "")
+        day = _text(date.find("Day"))
+        return "-".join(part for part in (year, month, day.zfill(2) if day else "") if part)
+    return ""
+
+
+def parse_efetch_xml(xml_text: str) -> List[PubMedRecord]:
+    """efetch (db=pubmed, retmode=xml) válasz -> rekordok"""
+    root = ET.fromstring(xml_text)
+    records = []
+    for article_node in root.iter("PubmedArticle"):
+        citation = article_node.find("MedlineCitation")
+        article = citation.find("Article") if citation is not None else None
+        if article is None:
+            continue
+
+        sections = []
+        for abstract_text in article.findall("Abstract/AbstractText"):
+            text = _text(abstract_text)
+            label = abstract_text.get("Label")
+            if text:
+                sections.append(f"{label}: {text}" if label else text)
+
+        records.append(PubMedRecord(
+            pmid=_text(citation.find("PMID")),
+            title=_text(article.find("ArticleTitle")),
+            published=_publication_date(article),
+            publication_types=[_text(pt) for pt in article.findall("PublicationTypeList/PublicationType")],
+            abstract="\n".join(sections),
+            journal=_text(article.find("Journal/Title"))
+        ))
+    return records
+
+
+# ----------------------------------------------------------------------
+# Összevonás és rangsor
+# ----------------------------------------------------------------------
+def merge_records(results: Iterable[Tuple[int, List[PubMedRecord]]], rrf_k: int = 60) -> List[PubMedRecord]:
+    """
+    Lekérdezés változatok eredményeinek összevonása PMID szerint.
+
+    Args:
+        results: (lekérdezés index, esearch sorrendű rekordok) párok
+
+    Returns:
+        List: Egyedi rekordok relevancia szerint csökkenő sorrendben
+    """
+    merged: Dict[str, PubMedRecord] = {}
+    for query_index, records in results:
+        for rank, record in enumerate(records):
+            if not record.pmid:
+                continue
+            target = merged.get(record.pmid)
+            if target is None:
+                target = PubMedRecord.from_dict(record.to_dict())
+                target.ranks = {}
+                merged[record.pmid] = target
+            target.ranks[query_index] = min(rank, target.ranks.get(query_index, rank))
+
+    for record in merged.values():
+        fusion = sum(1.0 / (rrf_k + rank + 1) for rank in record.ranks.values())
+        record.score = fusion * (1.0 + record.evidence_level / 10.0)
+
+    return sorted(merged.values(), key=lambda r: (-r.score, r.pmid))
+
+
+# ----------------------------------------------------------------------
+# Token-keretes összeállítás
+# ----------------------------------------------------------------------
+_ENCODER: Dict[str, Any] = {}
+_ENCODER_LOCK = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """tiktoken (cl100k_base) token szám, hiányában karakter alapú becslés"""
+    with _ENCODER_LOCK:
+        if 'encoder' not in _ENCODER:
+            try:
+                import tiktoken
+                _ENCODER['encoder'] = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"⚠️ tiktoken nem elérhető, token becslés karakterszám alapján: {e}")
+                _ENCODER['encoder'] = None
+        encoder = _ENCODER['encoder']
+    if encoder is None:
+        return max(1, len(text or "") // CHARS_PER_TOKEN)
+    return len(encoder.encode(text or "", disallowed_special=()))
+
+
+def pack_records(records: List[PubMedRecord], token_budget: int,
+                 counter: Callable[[str], int] = count_tokens) -> Tuple[str, List[PubMedRecord]]:
+    """
+    Rekordok relevancia sorrendben, amíg a token keret engedi.
+
+    A keretbe nem férő rekordot kihagyjuk (egy rövidebb még beférhet); ha
+    még semmi sincs a promptban, a legrelevánsabb rekord absztraktját
+    rövidítjük a keretre.
+
+    Returns:
+        Tuple: (prompt szöveg, felhasznált rekordok)
+    """
+    separator = "\n\n"
+    used_tokens = 0
+    blocks, packed = [], []
+
+    for record in records:
+        text = record.to_text()
+        tokens = counter(text) + (counter(separator) if blocks else 0)
+        if used_tokens + tokens > token_budget:
+            if blocks:
+                continue
+            header_tokens = counter(record.to_text(max_abstract_chars=0))
+            available_chars = max(0, (token_budget - header_tokens) * CHARS_PER_TOKEN)
+            text = record.to_text(max_abstract_chars=available_chars)
+            tokens = counter(text)
+        blocks.append(text)
+        packed.append(record)
+        used_tokens += tokens
+
+    return separator.join(blocks), packed
@@ -0,0 +1,240 @@
+# pubmed_integration/search_cache.py
+"""
+Lemezre mentett (SQLite) PubMed keresési eredmény cache.
+
+A kulcs a kanonikus alakra hozott lekérdezés: kisbetűs keresőszavak,
+összevont whitespace, és az azonos operátorú (csak AND vagy csak OR)
+csoportokon belül rendezett, duplikátummentes operandusok. Operátor csak
+a nagybetűs AND / OR / NOT (a PubMed a kisbetűs alakot keresőszónak
+tekinti), ezért a kisbetűsítés az operátorok felismerése után történik.
+A hibás kereséseket a kliens kivétellel jelzi, így azok nem kerülnek a
+cache-be. A PubMed balról jobbra
+értékeli a Boole operátorokat, ezért vegyes operátorú szinten a
+sorrend nem változik. TTL lejárat, méretkorlát (LRU kiürítés) és
+találati arány számlálók; a cache több folyamat között is megosztható.
+"""
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from .config import PUBMED_CONFIG
+
+_TOKEN_PATTERN = re.compile(r'"[^"]*"|\[[^\]]*\]|\(|\)|[^\s()\[\]"]+')
+_OPERATORS = {"AND", "OR", "NOT"}
+_COMMUTATIVE = {"AND", "OR"}
+
+
+def _join_term(tokens: List[str]) -> str:
+    term = " ".join(tokens)
+    term = re.sub(r'\s+\[', '[', term)
+    return re.sub(r'\s*:\s*', ':', term)
+
+
+def _parse_group(tokens: List[str], pos: int) -> Tuple[Union[str, Tuple[str, List]], int]:
+    """Egy zárójeles szint: operandusok és operátorok (string vagy (operátor, operandusok))"""
+    items: List[Any] = []
+    operators: List[str] = []
+    term: List[str] = []
+
+    while pos < len(tokens):
+        token = tokens[pos]
+        pos += 1
+        if token == '(':
+            if term:
+                items.append(_join_term(term))
+                term = []
+            node, pos = _parse_group(tokens, pos)
+            items.append(node)
+        elif token == ')':
+            break
+        elif token in _OPERATORS:
+            if term:
+                items.append(_join_term(term))
+                term = []
+            operators.append(token)
+        else:
+            term.append(token.lower())
+    if term:
+        items.append(_join_term(term))
+
+    if len(items) != len(operators) + 1:
+        raise ValueError("Hibás lekérdezés szerkezet")
+    if len(items) == 1:
+        return items[0], pos
+    if len(set(operators)) == 1 and operators[0] in _COMMUTATIVE:
+        return (operators[0], items), pos
+    return ("SEQ", [item for pair in zip(items, operators + [None]) for item in pair if item is not None]), pos
+
+
+def _render(node: Union[str, Tuple[str, List]]) -> str:
+    if isinstance(node, str):
+        return node
+    operator, items = node
+    if operator == "SEQ":
+        return "(" + " ".join(item if isinstance(item, str) and item in _OPERATORS else _render(item)
+                              for item in items) + ")"
+
+    # Azonos operátorú beágyazott csoportok kilapítása, operandusok rendezése
+    operands = set()
+    for item in items:
+        if not isinstance(item, str) and item[0] == operator:
+            operands.update(_render(child) for child in item[1])
+        else:
+            operands.add(_render(item))
+    if len(operands) == 1:
+        return operands.pop()
+    return "(" + f" {operator} ".join(sorted(operands)) + ")"
+
+
+def canonical_query(query: str) -> str:
+    """PubMed lekérdezés kanonikus alakja (cache kulcshoz)"""
+    normalized = " ".join((query or "").split())
+    try:
+        node, _ = _parse_group(_TOKEN_PATTERN.findall(normalized), 0)
+        return _render(node)
+    except (ValueError, IndexError):
+        return normalized
+
+
+class PubMedSearchCache:
+    """
+    SQLite alapú keresési eredmény cache.
+
+    Args:
+        db_path: SQLite fájl
+        ttl_seconds: Bejegyzés élettartama
+        max_entries: Méretkorlát (felette a legrégebben használtak törlődnek)
+        namespace: A tool beállításait leíró előtag (pl. top_k), a kulcs része
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 72 * 3600,
+                 max_entries: int = 2000, namespace: str = ""):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.namespace = namespace
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._initialize()
+
+    def _initialize(self):
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (accessed_at)"
+            )
+            self._connection.commit()
+
+    def key(self, query: str) -> str:
+        payload = f"{self.namespace}\x00{canonical_query(query)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, query: str) -> Optional[str]:
+        """Cache-elt eredmény (None, ha nincs vagy lejárt)"""
+        key = self.key(query)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._connection.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                    self._connection.commit()
+                self.misses += 1
+                return None
+
+            self._connection.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, query: str, result: str):
+        """Eredmény mentése (hibás keresésnél a kliens kivételt dob, ide nem jut el)"""
+        if not result:
+            return
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO search_cache (key, query, result, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.key(query), canonical_query(query), result, now, now)
+            )
+            self._evict(now)
+            self._connection.commit()
+
+    def _evict(self, now: float):
+        expired = self._connection.execute(
+            "DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        count = self._connection.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._connection.execute(
+                "DELETE FROM search_cache WHERE key IN "
+                "(SELECT key FROM search_cache ORDER BY accessed_at ASC LIMIT ?)", (overflow,)
+            )
+        self.evictions += max(0, expired) + max(0, overflow)
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM search_cache")
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(result)), 0) FROM search_cache"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            'entries': entries,
+            'result_bytes': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0
+        }
+
+
+_shared_cache: Optional[PubMedSearchCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_search_cache(namespace: str = "") -> Optional[PubMedSearchCache]:
+    """A folyamat közös keresési cache-e (None, ha ki van kapcsolva)"""
+    global _shared_cache
+    cache_config = PUBMED_CONFIG["cache"]
+    if not cache_config["enabled"]:
+        return None
+    with _shared_lock:
+        if _shared_cache is None or _shared_cache.namespace != namespace:
+            try:
+                _shared_cache = PubMedSearchCache(
+                    cache_config["path"],
+                    ttl_seconds=cache_config["ttl_hours"] * 3600,
+                    max_entries=cache_config["max_entries"],
+                    namespace=namespace
+                )
+            except Exception as e:
+                print(f"⚠️ PubMed keresési cache nem elérhető: {e}")
+                return None
+        return _shared_cache
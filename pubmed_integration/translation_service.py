@@ -0,0 +1,341 @@
+# pubmed_integration/translation_service.py
+"""
+Szótár alapú magyar -> angol fordítás a PubMed kereséshez, LLM tartalékkal.
+
+A beépített orvosi táblák (tünetek, betegségek, diagnózisok) és a korábban
+megtanult fordítások egy ékezetmentesített kulcsú indexben vannak. Egy
+esethez legfeljebb egy LLM hívás történik, csak a szótárban nem szereplő
+kifejezésekkel (a függőségmentes `rag_pdf.batch_translation` fordítóval);
+a rövid kifejezések fordítása visszakerül a szótárba (JSON fájl), így a
+visszatérő esetek fordítási hívás nélkül futnak.
+"""
+import os
+import re
+import json
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from rag_pdf.batch_translation import BatchTranslator, normalize_phrase
+
+from .config import PUBMED_CONFIG
+
+# Tünetek (magyar -> angol)
+SYMPTOM_TRANSLATIONS = {
+    'fejfájás': 'headache',
+    'láz': 'fever',
+    'köhögés': 'cough',
+    'torokfájás': 'sore throat',
+    'hányás': 'vomiting',
+    'hasmenés': 'diarrhea',
+    'fáradtság': 'fatigue',
+    'szédülés': 'dizziness',
+    'hasfájás': 'abdominal pain',
+    'hányinger': 'nausea',
+    'légzési nehézség': 'dyspnea',
+    'nehéz légzés': 'dyspnea',
+    'fulladás': 'dyspnea',
+    'mellkasi fájdalom': 'chest pain',
+    'étvágytalanság': 'anorexia',
+    'fogyás': 'weight loss',
+    'hízás': 'weight gain',
+    'gyengeség': 'weakness',
+    'izomfájdalom': 'muscle pain',
+    'ízületi fájdalom': 'joint pain',
+    'hátfájás': 'back pain',
+    'nyakfájás': 'neck pain',
+    'bőrkiütés': 'rash',
+    'viszketés': 'pruritus',
+    'alvászavar': 'sleep disorder',
+    'álmatlanság': 'insomnia',
+    'nyugtalanság': 'restlessness',
+    'idegesség': 'nervousness',
+    'koncentrációs problémák': 'concentration problems',
+    'memóriaproblémák': 'memory problems',
+    'vizeletürítési problémák': 'urination problems',
+    'gyakori vizelés': 'frequent urination',
+    'szomjúság': 'thirst',
+    'szárazság': 'dryness',
+    'izzadás': 'sweating',
+    'hidegrázás': 'chills',
+    'fázékonyság': 'chills',
+    'hőhullámok': 'hot flashes',
+    'vérzés': 'bleeding',
+    'zúzódás': 'bruising',
+    'duzzanat': 'swelling',
+    'fájdalom': 'pain',
+    'égő érzés': 'burning sensation',
+    'zsibbadás': 'numbness',
+    'bizsergés': 'tingling'
+}
+
+# Meglévő betegségek (magyar -> angol)
+CONDITION_TRANSLATIONS = {
+    'magas vérnyomás': 'hypertension',
+    'cukorbetegség': 'diabetes mellitus',
+    'asztma': 'asthma',
+    'allergia': 'allergy',
+    'szívbetegség': 'heart disease',
+    'szívinfarktus': 'myocardial infarction',
+    'stroke': 'stroke',
+    'rák': 'cancer',
+    'tumor': 'tumor',
+    'epilepszia': 'epilepsy',
+    'migrén': 'migraine',
+    'depresszió': 'depression',
+    'szorongás': 'anxiety',
+    'arthritis': 'arthritis',
+    'osteoporosis': 'osteoporosis',
+    'hypothyroidism': 'hypothyroidism',
+    'hyperthyroidism': 'hyperthyroidism',
+    'veseproblémák': 'kidney disease',
+    'májproblémák': 'liver disease',
+    'tüdőproblémák': 'lung disease',
+    'gastritis': 'gastritis',
+    'reflux': 'gastroesophageal reflux',
+    'colitis': 'colitis',
+    'irritábilis bél': 'irritable bowel syndrome',
+    'krónikus fájdalom': 'chronic pain',
+    'fibromyalgia': 'fibromyalgia',
+    'autoimmun betegség': 'autoimmune disease',
+    'immunhiány': 'immunodeficiency',
+    'obesitas': 'obesity',
+    'anorexia': 'anorexia',
+    'bulimia': 'bulimia',
+    'szkizofrénia': 'schizophrenia',
+    'bipoláris zavar': 'bipolar disorder',
+    'adhd': 'attention deficit hyperactivity disorder',
+    'autizmus': 'autism',
+    'alzheimer': 'alzheimer disease',
+    'parkinson': 'parkinson disease',
+    'multiple sclerosis': 'multiple sclerosis',
+    'lupus': 'systemic lupus erythematosus'
+}
+
+# Diagnózisok (magyar -> angol); a sorrend számít a részszó egyezésnél
+DIAGNOSIS_TRANSLATIONS = {
+    'felső légúti fertőzés': 'upper respiratory infection',
+    'vírusos fertőzés': 'viral infection',
+    'bakteriális fertőzés': 'bacterial infection',
+    'gyomor-bél fertőzés': 'gastroenteritis',
+    'influenza': 'influenza',
+    'megfázás': 'common cold',
+    'tonsillitis': 'tonsillitis',
+    'pharyngitis': 'pharyngitis',
+    'bronchitis': 'bronchitis',
+    'pneumonia': 'pneumonia',
+    'sinusitis': 'sinusitis',
+    'otitis': 'otitis',
+    'conjunctivitis': 'conjunctivitis',
+    'dermatitis': 'dermatitis',
+    'allergiás reakció': 'allergic reaction',
+    'étel allergia': 'food allergy',
+    'asztma': 'asthma',
+    'migrén': 'migraine',
+    'tenziós fejfájás': 'tension headache',
+    'gastritis': 'gastritis',
+    'reflux': 'gastroesophageal reflux',
+    'irritábilis bél szindróma': 'irritable bowel syndrome',
+    'húgyúti fertőzés': 'urinary tract infection',
+    'cystitis': 'cystitis',
+    'veseköves': 'nephrolithiasis kidney stones',
+    'magas vérnyomás': 'hypertension',
+    'diabetes': 'diabetes mellitus',
+    'hypothyroidism': 'hypothyroidism',
+    'hyperthyroidism': 'hyperthyroidism',
+    'anémia': 'anemia',
+    'depresszió': 'depression',
+    'szorongás': 'anxiety disorder',
+    'fibromyalgia': 'fibromyalgia',
+    'arthritis': 'arthritis',
+    'osteoarthritis': 'osteoarthritis',
+    'rheumatoid arthritis': 'rheumatoid arthritis'
+}
+
+# Bizonytalanságot jelző elő- és utótagok (ékezetmentes alakban)
+_UNCERTAINTY_PATTERNS = [
+    re.compile(r'^(lehetseges|valoszinu|esetleg|talan|lehet hogy|feltetheto|gyanu)\s+'),
+    re.compile(r'\s+(gyanuja|gyanu|valoszinu|lehetseges)$'),
+]
+
+
+def fold_phrase(text: str) -> str:
+    """Szótár kulcs: ékezetmentes, kisbetűs, összevont whitespace, záró írásjelek nélkül"""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return " ".join(folded.split()).strip(" .,;:!?")
+
+
+def strip_uncertainty(folded: str) -> str:
+    """Bizonytalansági kifejezések eltávolítása egy ékezetmentes kulcsról"""
+    for pattern in _UNCERTAINTY_PATTERNS:
+        folded = pattern.sub('', folded)
+    return folded
+
+
+class MedicalDictionary:
+    """
+    Ékezetmentes kulcsú magyar -> angol orvosi szótár.
+
+    A `get` / `update` páros révén a batch fordító memóriájaként is szolgál:
+    az LLM-mel lefordított kifejezések a szótár indexébe kerülnek.
+
+    Args:
+        learned_path: A megtanult fordítások JSON fájlja (None: csak memóriában)
+    """
+
+    def __init__(self, learned_path: Optional[str] = None):
+        self.learned_path = Path(learned_path) if learned_path else None
+        self._index: Dict[str, str] = {}
+        self._learned: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        # Ütközésnél az első tábla nyer (tünet > betegség > diagnózis)
+        for table in (SYMPTOM_TRANSLATIONS, CONDITION_TRANSLATIONS, DIAGNOSIS_TRANSLATIONS):
+            for hungarian, english in table.items():
+                self._index.setdefault(fold_phrase(hungarian), english)
+        self.builtin_entries = len(self._index)
+        self._load_learned()
+
+    def _load_learned(self):
+        if self.learned_path is None or not self.learned_path.exists():
+            return
+        try:
+            with open(self.learned_path, 'r', encoding='utf-8') as f:
+                self._learned = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Megtanult fordítások betöltési hiba: {e}")
+            self._learned = {}
+        for key, english in self._learned.items():
+            self._index.setdefault(key, english)
+
+    def lookup(self, phrase: str) -> Optional[str]:
+        """Fordítás a szótárból (None, ha nincs), bizonytalansági tagok nélkül is"""
+        key = fold_phrase(phrase)
+        if not key:
+            return None
+        with self._lock:
+            english = self._index.get(key)
+            if english is None:
+                english = self._index.get(strip_uncertainty(key))
+        return english
+
+    def learn(self, translations: Dict[str, str]):
+        """Új fordítások felvétele és atomikus mentése (a beépített bejegyzések nem íródnak felül)"""
+        if not translations:
+            return
+        with self._lock:
+            for phrase, english in translations.items():
+                key = fold_phrase(phrase)
+                if key and key not in self._index:
+                    self._index[key] = english
+                    self._learned[key] = english
+
+            if self.learned_path is None:
+                return
+            try:
+                self.learned_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.learned_path.with_suffix('.json.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._learned, f, ensure_ascii=False, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.learned_path)
+            except Exception as e:
+                print(f"⚠️ Megtanult fordítások mentési hiba: {e}")
+
+    # Fordítási memória interfész (BatchTranslator)
+    get = lookup
+    update = learn
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'dictionary_entries': len(self._index),
+                'builtin_entries': self.builtin_entries,
+                'learned_entries': len(self._learned)
+            }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+_shared_dictionary: Optional[MedicalDictionary] = None
+_shared_lock = threading.Lock()
+
+
+def get_medical_dictionary() -> MedicalDictionary:
+    """A folyamat közös orvosi szótára (lusta létrehozás)"""
+    global _shared_dictionary
+    with _shared_lock:
+        if _shared_dictionary is None:
+            _shared_dictionary = MedicalDictionary(PUBMED_CONFIG["translation"]["learned_path"])
+        return _shared_dictionary
+
+
+class TranslationService:
+    """
+    Fordítás: szótár először, a hiányzó kifejezések egyetlen LLM hívásban,
+    amelynek eredményét a szótár megtanulja.
+
+    Args:
+        llm: Fordító chat modell (None: csak szótár)
+        dictionary: Orvosi szótár (None: a folyamat közös szótára)
+    """
+
+    def __init__(self, llm: Any = None, dictionary: Optional[MedicalDictionary] = None):
+        self.dictionary = dictionary or get_medical_dictionary()
+        self.translator = BatchTranslator(
+            llm, self.dictionary,
+            max_memorized_words=PUBMED_CONFIG["translation"]["max_learned_words"]
+        )
+        # Számlálók (a szolgáltatást a megosztott analyzer több session között használja)
+        self._stats_lock = threading.Lock()
+        self.dictionary_hits = 0
+        self.dictionary_misses = 0
+
+    def translate_many(self, phrases: List[str]) -> Dict[str, str]:
+        """
+        Kifejezések fordítása.
+
+        Returns:
+            Dict: eredeti kifejezés -> angol fordítás (sikertelen fordításnál az eredeti)
+        """
+        result: Dict[str, str] = {}
+        misses: List[str] = []
+
+        for phrase in phrases:
+            if not phrase or not str(phrase).strip() or phrase in result or phrase in misses:
+                continue
+            english = self.dictionary.lookup(phrase)
+            if english is not None:
+                result[phrase] = english
+            else:
+                misses.append(phrase)
+
+        with self._stats_lock:
+            self.dictionary_hits += len(result)
+            self.dictionary_misses += len(misses)
+
+        if misses:
+            # A hiányzók egyetlen LLM hívásban; a fordítás a szótárba kerül (normalizált kulccsal tér vissza)
+            translated = self.translator.translate_phrases(misses)
+            for phrase in misses:
+                result[phrase] = translated.get(normalize_phrase(phrase), str(phrase).strip())
+        return result
+
+    def translate(self, text: str) -> str:
+        if not text:
+            return ""
+        return self.translate_many([text]).get(text, text)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            hits, misses = self.dictionary_hits, self.dictionary_misses
+        lookups = hits + misses
+        return {
+            **self.dictionary.stats(),
+            'dictionary_hits': hits,
+            'dictionary_misses': misses,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'llm_calls': self.translator.llm_calls
+        }
@@ -6,11 +6,36 @@ RAG (Retrieval Augmented Generation) modul Medline PDF elemzéshez.
 LangChain alapú vector search és AI válaszgenerálás.
 """
 
-from .rag_analyzer import RAGAnalyzer, run_rag_analysis
-from .config import RAG_CONFIG
+import importlib
+
+# Lusta exportok: a csomag importja (pl. spawn workerek, PubMed fordítás) nem húzza be
+# a nehéz rag_analyzer modult (Streamlit, LangChain, Chroma) - csak az első használat
+_LAZY_EXPORTS = {
+    'RAGAnalyzer': '.rag_analyzer',
+    'run_rag_analysis': '.rag_analyzer',
+    'arun_rag_analysis': '.rag_analyzer',
+    'analyze_many': '.rag_analyzer',
+    'get_shared_analyzer': '.rag_analyzer',
+    'reset_shared_analyzer': '.rag_analyzer',
+    'load_index_catalog': '.rag_analyzer',
+    'RAG_CONFIG': '.config',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
+
 
 __all__ = [
     'RAGAnalyzer',
     'run_rag_analysis',
+    'arun_rag_analysis',
+    'analyze_many',
+    'get_shared_analyzer',
+    'reset_shared_analyzer',
+    'load_index_catalog',
     'RAG_CONFIG'
 ]
\ No newline at end of file
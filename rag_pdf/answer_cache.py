@@ -0,0 +1,220 @@
+# =============================================================================
+# rag_pdf/answer_cache.py
+# =============================================================================
+"""
+Szemantikus válasz cache ismétlődő beteg profilokhoz.
+
+A kulcs a normalizált (lefordított) beteg profil - korcsoport, nem,
+rendezett tünetek, időtartam, súlyosság, diagnózis, alapbetegségek,
+gyógyszerek - és az index verziója. Pontos egyezés hiányában opcionálisan
+(alapból kikapcsolva) a profil szöveg embeddingjéhez legközelebbi korábbi
+eset is kiszolgálható, ha a koszinusz hasonlóság eléri a küszöböt - de
+csak azonos gyógyszerek és alapbetegségek mellett, mert ezek eltérése a
+szöveg hasonlóságában alig látszik, a válaszban viszont lényeges. TTL és
+LRU kiürítés, a korpusz (index verzió) változásakor a régi bejegyzések
+érvénytelenek.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from .translation import normalize_phrase
+
+# Hasonlósági találatnál is pontosan egyező profil mezők
+EXACT_MATCH_FIELDS = ('medications', 'existing_conditions')
+
+
+def age_bucket(age: Any) -> str:
+    """Életkor -> korcsoport"""
+    try:
+        age = int(age)
+    except (TypeError, ValueError):
+        return "unknown"
+    if age < 18:
+        return "child"
+    if age < 40:
+        return "adult_18_39"
+    if age < 65:
+        return "adult_40_64"
+    return "elderly"
+
+
+def _normalize_list(values: Any) -> List[str]:
+    if not values:
+        return []
+    if not isinstance(values, list):
+        values = [values]
+    return sorted({normalize_phrase(v) for v in values if v and str(v).strip()})
+
+
+def normalize_profile(patient_data: Dict[str, Any]) -> Dict[str, Any]:
+    """A válasz szempontjából lényeges, normalizált beteg profil"""
+    return {
+        'age': age_bucket(patient_data.get('age')),
+        'gender': normalize_phrase(patient_data.get('gender') or ""),
+        'symptoms': _normalize_list(patient_data.get('symptoms')),
+        'duration': normalize_phrase(patient_data.get('duration') or ""),
+        'severity': normalize_phrase(patient_data.get('severity') or ""),
+        'diagnosis': normalize_phrase(patient_data.get('diagnosis') or ""),
+        'existing_conditions': _normalize_list(patient_data.get('existing_conditions')),
+        'medications': _normalize_list(patient_data.get('medications'))
+    }
+
+
+def profile_text(profile: Dict[str, Any]) -> str:
+    """Profil szöveges alakja a hasonlósági kereséshez"""
+    return "; ".join(
+        f"{key}: {', '.join(value) if isinstance(value, list) else value}"
+        for key, value in profile.items()
+    )
+
+
+def profile_key(profile: Dict[str, Any], index_version: str) -> str:
+    payload = json.dumps({'profile': profile, 'index_version': index_version},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AnswerCache:
+    """Profil kulcsú, TTL + LRU válasz cache JSON perzisztenciával"""
+
+    def __init__(self, cache_path: str, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 500, similarity_threshold: float = 0.97):
+        self.cache_path = Path(cache_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Perzisztencia
+    # ------------------------------------------------------------------
+    def _load(self):
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', [])
+            # A fájlban LRU sorrendben (legrégebbi elöl) tároljuk
+            self._entries = OrderedDict((entry['key'], entry) for entry in entries)
+        except Exception as e:
+            print(f"⚠️ Válasz cache betöltési hiba: {e}")
+            self._entries = OrderedDict()
+
+    def _save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': list(self._entries.values())}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    # ------------------------------------------------------------------
+    # Lekérdezés / mentés
+    # ------------------------------------------------------------------
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry['created_at'] > self.ttl_seconds
+
+    def get(self, key: str, index_version: str, vector: Optional[List[float]] = None,
+            profile: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Cache-elt eredmény keresése. Hasonlósági keresés csak vektorral és
+        profillal történik, az EXACT_MATCH_FIELDS mezőkben egyező bejegyzések közt.
+
+        Returns:
+            Tuple: (eredmény vagy None, találat típusa: "exact" / "similar" / "miss")
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and not self._expired(entry, now) and entry['index_version'] == index_version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['result'], "exact"
+
+            if vector is not None and profile is not None and self.similarity_threshold < 1.0:
+                best_key, best_score = None, self.similarity_threshold
+                query = _unit(np.asarray(vector, dtype=np.float32))
+                for candidate_key, candidate in self._entries.items():
+                    if (candidate.get('vector') is None or self._expired(candidate, now)
+                            or candidate['index_version'] != index_version
+                            or not _same_fields(candidate.get('profile') or {}, profile)):
+                        continue
+                    score = float(_unit(np.asarray(candidate['vector'], dtype=np.float32)) @ query)
+                    if score >= best_score:
+                        best_key, best_score = candidate_key, score
+                if best_key is not None:
+                    self._entries.move_to_end(best_key)
+                    self.similar_hits += 1
+                    return self._entries[best_key]['result'], "similar"
+
+            self.misses += 1
+            return None, "miss"
+
+    def put(self, key: str, index_version: str, result: Dict[str, Any],
+            profile: Dict[str, Any], vector: Optional[List[float]] = None):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {
+                'key': key,
+                'index_version': index_version,
+                'profile': profile,
+                'vector': [float(x) for x in vector] if vector is not None else None,
+                'result': result,
+                'created_at': now
+            }
+            self._entries.move_to_end(key)
+            self._evict(now)
+            self._save()
+
+    def _evict(self, now: float):
+        for key in [k for k, e in self._entries.items() if self._expired(e, now)]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, index_version: str) -> int:
+        """Más index verzióhoz tartozó bejegyzések törlése (korpusz változás)"""
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if e['index_version'] != index_version]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._save()
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.similar_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'similar_hits': self.similar_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.similar_hits) / total, 3) if total else 0.0
+        }
+
+
+def _same_fields(candidate: Dict[str, Any], profile: Dict[str, Any]) -> bool:
+    return all(candidate.get(field) == profile.get(field) for field in EXACT_MATCH_FIELDS)
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
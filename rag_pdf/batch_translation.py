@@ -0,0 +1,188 @@
+# =============================================================================
+# rag_pdf/batch_translation.py
+# =============================================================================
+"""
+Memória-először, batch-elt magyar -> angol fordítás (függőségmentes mag).
+
+Csak a standard könyvtárat használja: a chat modellt (invoke / ainvoke) és a
+fordítási memóriát (get / update) a hívó adja, így a RAG fordító és a PubMed
+szótár alapú fordítás is a nehéz RAG modulok importja nélkül építhet rá.
+"""
+import os
+import re
+import json
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+
+def normalize_phrase(text: str) -> str:
+    """Fordítási memória kulcs: NFC, kisbetű, whitespace összevonás, záró írásjelek nélkül"""
+    text = unicodedata.normalize("NFC", str(text)).lower()
+    text = " ".join(text.split())
+    return text.strip(" .,;:!?")
+
+
+class TranslationMemory:
+    """JSON fájlban tárolt fordítási memória (normalizált magyar -> angol)"""
+
+    def __init__(self, memory_path: str):
+        self.memory_path = Path(memory_path)
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.memory_path.exists():
+            return
+        try:
+            with open(self.memory_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Fordítási memória betöltési hiba: {e}")
+            self._entries = {}
+
+    def get(self, phrase: str) -> Optional[str]:
+        with self._lock:
+            return self._entries.get(normalize_phrase(phrase))
+
+    def update(self, translations: Dict[str, str]):
+        """Új fordítások felvétele és atomikus mentése"""
+        if not translations:
+            return
+        with self._lock:
+            for phrase, english in translations.items():
+                self._entries[normalize_phrase(phrase)] = english
+
+            self.memory_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.memory_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.memory_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BatchTranslator:
+    """
+    Kifejezések fordítása: memória először, a hiányzók egyetlen LLM hívásban.
+
+    Args:
+        llm: Chat modell (invoke / ainvoke); None esetén csak a memória
+        memory: Fordítási memória (get(phrase) / update(dict) / len)
+        max_memorized_words: Ennél hosszabb szöveg (pl. összefoglaló) nem kerül a memóriába
+    """
+
+    def __init__(self, llm: Any, memory: Any, max_memorized_words: Optional[int] = None):
+        self.llm = llm
+        self.memory = memory
+        self.max_memorized_words = max_memorized_words
+        self._stats_lock = threading.Lock()
+        self.llm_calls = 0
+
+    def _count_llm_call(self):
+        with self._stats_lock:
+            self.llm_calls += 1
+
+    def _split_cached(self, phrases: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Memóriában lévő fordítások és hiányzó kifejezések (normalizált -> eredeti) szétválasztása"""
+        result: Dict[str, str] = {}
+        misses: Dict[str, str] = {}
+
+        for phrase in phrases:
+            if not phrase or not str(phrase).strip():
+                continue
+            key = normalize_phrase(phrase)
+            cached = self.memory.get(phrase)
+            if cached is not None:
+                result[key] = cached
+            elif key not in misses:
+                misses[key] = str(phrase).strip()
+
+        return result, misses
+
+    def _merge_translated(self, result: Dict[str, str], misses: Dict[str, str],
+                          translated: Optional[List[str]]) -> Dict[str, str]:
+        if translated:
+            self.memory.update({
+                phrase: english for phrase, english in zip(misses.values(), translated)
+                if self.max_memorized_words is None or len(phrase.split()) <= self.max_memorized_words
+            })
+            result.update(zip(misses.keys(), translated))
+        else:
+            # Sikertelen fordítás: az eredeti szöveggel megyünk tovább, nem memorizáljuk
+            result.update(misses)
+        return result
+
+    def translate_phrases(self, phrases: List[str]) -> Dict[str, str]:
+        """
+        Kifejezések fordítása.
+
+        Returns:
+            Dict: normalizált magyar kifejezés -> angol fordítás
+        """
+        result, misses = self._split_cached(phrases)
+        if not misses:
+            return result
+        return self._merge_translated(result, misses, self._translate_batch(list(misses.values())))
+
+    async def atranslate_phrases(self, phrases: List[str]) -> Dict[str, str]:
+        """translate_phrases async változata (ainvoke)"""
+        result, misses = self._split_cached(phrases)
+        if not misses:
+            return result
+        return self._merge_translated(result, misses, await self._atranslate_batch(list(misses.values())))
+
+    @staticmethod
+    def _batch_prompt(phrases: List[str]) -> str:
+        return (
+            "Translate each Hungarian medical phrase in the following JSON array to English. "
+            "Return ONLY a JSON array of strings with exactly the same length and order, "
+            "without any explanation.\n"
+            f"{json.dumps(phrases, ensure_ascii=False)}"
+        )
+
+    def _translate_batch(self, phrases: List[str]) -> Optional[List[str]]:
+        """Egyetlen strukturált (JSON tömb) fordítási hívás"""
+        if self.llm is None:
+            return None
+        try:
+            self._count_llm_call()
+            response = self.llm.invoke(self._batch_prompt(phrases)).content
+            return self._parse_batch_response(response, len(phrases))
+        except Exception as e:
+            print(f"⚠️ Batch fordítási hiba: {e}")
+            return None
+
+    async def _atranslate_batch(self, phrases: List[str]) -> Optional[List[str]]:
+        """_translate_batch async változata (a megszakítás továbbterjed)"""
+        if self.llm is None:
+            return None
+        try:
+            self._count_llm_call()
+            response = (await self.llm.ainvoke(self._batch_prompt(phrases))).content
+            return self._parse_batch_response(response, len(phrases))
+        except Exception as e:
+            print(f"⚠️ Batch fordítási hiba: {e}")
+            return None
+
+    @staticmethod
+    def _parse_batch_response(response: str, expected_length: int) -> Optional[List[str]]:
+        match = re.search(r"\[.*\]", response or "", flags=re.DOTALL)
+        if not match:
+            print("⚠️ Fordítási válasz nem tartalmaz JSON tömböt")
+            return None
+
+        try:
+            translated = json.loads(match.group(0))
+        except ValueError:
+            print("⚠️ Fordítási válasz JSON hiba")
+            return None
+
+        if not isinstance(translated, list) or len(translated) != expected_length:
+            print("⚠️ Fordítási válasz hossza eltér a kérttől")
+            return None
+
+        return [str(t).strip() for t in translated]
@@ -0,0 +1,370 @@
+# =============================================================================
+# rag_pdf/benchmark.py
+# =============================================================================
+"""
+Offline RAG retrieval benchmark és regresszió ellenőrzés.
+
+Determinisztikus lokális (hashing) embeddinggel és rögzített, szintetikus
+Medline-szerű korpusszal (a MedlinePDFGenerator PDF formátumában) méri
+több korpusz méreten:
+    - ingest áteresztőképesség (oldal/s, chunk/s)
+    - lekérdezési késleltetés (p50 / p95) dense, hibrid és kontextus módban
+    - memória (csúcs RSS, keresésenként pásztázott mátrix) és index méret a lemezen
+    - recall@k címkézett kérdés -> topic párokon
+
+Hálózati hívás nélkül fut, így bevezetés előtt elkaphatók a lassulások.
+
+Használat:
+    python -m rag_pdf.benchmark
+    python -m rag_pdf.benchmark --sizes 12,48 --output bench.json
+    python -m rag_pdf.benchmark --quantization int8
+    python -m rag_pdf.benchmark --save-baseline rag_bench_baseline.json
+    python -m rag_pdf.benchmark --baseline rag_bench_baseline.json --tolerance 0.25
+"""
+import io
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from .config import RAG_CONFIG
+from .compaction import directory_bytes
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CORPUS_SEED = 20250101
+CORPUS_DATE = "20250101_000000"
+
+# Rögzített szintetikus korpusz: topiconként jellemző szókincs
+TOPIC_TERMS = {
+    "asthma": ["wheezing", "inhaler", "bronchi", "airway", "shortness", "breath", "allergen", "spirometry", "corticosteroid", "chest", "tightness", "attack"],
+    "diabetes": ["glucose", "insulin", "thirst", "urination", "pancreas", "hyperglycemia", "metformin", "carbohydrate", "ketones", "neuropathy", "retinopathy", "a1c"],
+    "migraine": ["headache", "aura", "throbbing", "photophobia", "nausea", "triptan", "trigger", "unilateral", "visual", "dizziness", "prodrome", "sumatriptan"],
+    "influenza": ["fever", "chills", "flu", "vaccine", "virus", "muscle", "aches", "oseltamivir", "respiratory", "fatigue", "seasonal", "cough"],
+    "eczema": ["itchy", "rash", "dermatitis", "dry", "skin", "moisturizer", "flare", "redness", "scratching", "emollient", "patches", "topical"],
+    "hypertension": ["blood", "pressure", "systolic", "diastolic", "sodium", "stroke", "arteries", "ace", "inhibitor", "diuretic", "cuff", "readings"],
+    "gastritis": ["stomach", "lining", "burning", "indigestion", "helicobacter", "pylori", "antacid", "bloating", "ulcer", "epigastric", "proton", "pump"],
+    "insomnia": ["sleep", "awake", "night", "melatonin", "bedtime", "hygiene", "caffeine", "drowsiness", "circadian", "restless", "nap", "cbt"],
+    "arthritis": ["joint", "stiffness", "swelling", "cartilage", "rheumatoid", "osteoarthritis", "knee", "inflammation", "mobility", "nsaid", "morning", "hands"],
+    "anemia": ["iron", "hemoglobin", "pale", "weakness", "ferritin", "red", "cells", "b12", "folate", "transfusion", "bleeding", "tiredness"],
+    "bronchitis": ["mucus", "phlegm", "productive", "bronchial", "tubes", "smoking", "sputum", "wheeze", "chronic", "acute", "soreness", "humidifier"],
+    "conjunctivitis": ["eye", "pink", "discharge", "tearing", "eyelid", "crusting", "drops", "contagious", "allergic", "gritty", "contact", "lenses"],
+}
+
+COMMON_TERMS = [
+    "patients", "symptoms", "doctor", "treatment", "may", "include", "common", "health", "care",
+    "provider", "condition", "people", "risk", "help", "medicines", "often", "severe", "mild",
+    "days", "weeks", "test", "diagnosis", "signs", "daily", "life", "prevent", "cause", "body",
+    "children", "adults", "older", "family", "history", "lifestyle", "changes", "exercise",
+    "diet", "water", "rest", "emergency"
+]
+
+# Címkézett kérdések (kérdés, várt topic) - a topic neve nem szerepel a kérdésben
+LABELED_QUERIES = [
+    ("wheezing and chest tightness at night, uses an inhaler", "asthma"),
+    ("shortness of breath after allergen exposure, spirometry test", "asthma"),
+    ("excessive thirst and frequent urination, high glucose", "diabetes"),
+    ("insulin dose and carbohydrate counting, neuropathy in feet", "diabetes"),
+    ("throbbing one-sided headache with aura and photophobia", "migraine"),
+    ("triptan medicine for headache with nausea", "migraine"),
+    ("fever with chills and muscle aches, seasonal flu vaccine", "influenza"),
+    ("virus with fatigue and cough, oseltamivir", "influenza"),
+    ("itchy dry skin rash with red patches, moisturizer", "eczema"),
+    ("dermatitis flare and scratching, topical emollient", "eczema"),
+    ("high blood pressure readings, systolic and diastolic", "hypertension"),
+    ("reduce sodium to lower pressure, diuretic medicine", "hypertension"),
+    ("burning stomach pain and indigestion, antacid", "gastritis"),
+    ("helicobacter pylori and ulcer, proton pump inhibitor", "gastritis"),
+    ("cannot sleep at night, awake for hours, melatonin", "insomnia"),
+    ("sleep hygiene and caffeine before bedtime", "insomnia"),
+    ("joint stiffness in the morning and swelling of hands", "arthritis"),
+    ("knee cartilage pain and limited mobility, nsaid", "arthritis"),
+    ("low iron and hemoglobin, pale skin and weakness", "anemia"),
+    ("ferritin test and b12 folate deficiency, tiredness", "anemia"),
+    ("productive cough with mucus and phlegm, smoking", "bronchitis"),
+    ("bronchial tubes inflammation with sputum", "bronchitis"),
+    ("pink eye with discharge and crusting eyelid", "conjunctivitis"),
+    ("gritty eye and tearing, contact lenses, eye drops", "conjunctivitis"),
+]
+
+DEFAULT_SIZES = [12, 48, 120]
+
+
+# ----------------------------------------------------------------------
+# Szintetikus korpusz
+# ----------------------------------------------------------------------
+def _sentence(rnd: random.Random, topic_terms: List[str], words: int = 14) -> str:
+    tokens = [rnd.choice(topic_terms) if rnd.random() < 0.2 else rnd.choice(COMMON_TERMS)
+              for _ in range(words)]
+    return " ".join(tokens).capitalize() + "."
+
+
+def synthetic_topic(index: int) -> Tuple[str, Any]:
+    """Az index-edik (determinisztikus) szintetikus Medline topic"""
+    from medline_download.xml_parser import MedlineTopicContent
+
+    topics = sorted(TOPIC_TERMS)
+    topic = topics[index % len(topics)]
+    terms = TOPIC_TERMS[topic]
+    rnd = random.Random(CORPUS_SEED + index)
+
+    paragraphs = [
+        " ".join(_sentence(rnd, terms) for _ in range(rnd.randint(5, 8)))
+        for _ in range(rnd.randint(12, 20))
+    ]
+    content = MedlineTopicContent(
+        title=f"{topic.capitalize()} ({index // len(topics) + 1})",
+        organization="National Library of Medicine",
+        url=f"https://medlineplus.gov/{topic}.html",
+        full_summary="".join(f"<p>{p}</p>" for p in paragraphs),
+        also_called=rnd.sample(terms, 2),
+        related_topics=rnd.sample([t for t in topics if t != topic], 2),
+        mesh_terms=rnd.sample(terms, 4),
+        groups=["Synthetic benchmark"]
+    )
+    return topic, content
+
+
+def generate_corpus(pdf_dir: Path, size: int) -> List[Path]:
+    """`size` darab PDF generálása a Medline letöltő fájlnév mintájával"""
+    from medline_download.pdf_generator import MedlinePDFGenerator
+
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+    generator = MedlinePDFGenerator()
+    paths = []
+    for index in range(size):
+        topic, content = synthetic_topic(index)
+        path = pdf_dir / f"medline_{index:02d}_{topic}_{CORPUS_DATE}.pdf"
+        if not generator.generate_pdf(content, str(path)):
+            raise RuntimeError(f"PDF generálás sikertelen: {path.name}")
+        paths.append(path)
+    return paths
+
+
+# ----------------------------------------------------------------------
+# Mérés
+# ----------------------------------------------------------------------
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def peak_rss_mb() -> float:
+    """Csúcs RSS (saját folyamat + befejezett worker folyamatok), MB"""
+    if resource is None:
+        return 0.0
+    kilobytes = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                 + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # macOS bájtban, Linux KB-ban adja vissza
+    return kilobytes / (1024 * 1024) if sys.platform == "darwin" else kilobytes / 1024
+
+
+def _configure(work_dir: Path, backend: str, quantization: str, workers: int):
+    RAG_CONFIG["paths"]["pdf_dir"] = str(work_dir / "pdfs")
+    RAG_CONFIG["chroma"]["backend"] = backend
+    RAG_CONFIG["chroma"]["quantization"] = quantization
+    RAG_CONFIG["embedding"]["provider"] = "hashing"
+    RAG_CONFIG["embedding"]["cache"]["dir"] = str(work_dir / "embedding_cache")
+    RAG_CONFIG["text_cache"]["dir"] = str(work_dir / "text_cache")
+    RAG_CONFIG["answer_cache"]["enabled"] = False
+    if workers:
+        RAG_CONFIG["ingest"]["workers"] = workers
+
+
+def _timed_queries(search, repeats: int) -> Tuple[List[float], List[List[Any]]]:
+    latencies, results = [], []
+    search(LABELED_QUERIES[0][0])  # bemelegítés
+    for query, _ in LABELED_QUERIES:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            docs = search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        results.append(docs)
+    return latencies, results
+
+
+def recall_at_k(results: List[List[Any]], k: int) -> float:
+    """Azon kérdések aránya, amelyeknél a top-k között van a várt topic chunkja"""
+    hits = 0
+    for docs, (_, topic) in zip(results, LABELED_QUERIES):
+        if any(doc.metadata.get('topic') == topic for doc in docs[:k]):
+            hits += 1
+    return round(hits / len(LABELED_QUERIES), 3)
+
+
+def run_size(size: int, backend: str = "numpy", k: int = 5, repeats: int = 3,
+             workers: int = 0, verbose: bool = False, quantization: str = "none") -> Dict[str, Any]:
+    """Egy korpusz méret teljes mérése (friss ideiglenes könyvtárban)"""
+    original_config = copy.deepcopy(RAG_CONFIG)
+    try:
+        with tempfile.TemporaryDirectory(prefix="rag_bench_") as tmp:
+            work_dir = Path(tmp)
+            generate_corpus(work_dir / "pdfs", size)
+            _configure(work_dir, backend, quantization, workers)
+
+            from .rag_analyzer import RAGAnalyzer
+
+            log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+            with log:
+                start = time.perf_counter()
+                analyzer = RAGAnalyzer(str(work_dir / "vectorstore"))
+                ingest_seconds = time.perf_counter() - start
+
+                summary = analyzer.catalog.summary()
+                footprint = getattr(analyzer.vectorstore, 'memory_footprint', lambda: {})()
+                manifest_stats = analyzer.manifest.stats()
+                modes = {
+                    'dense': lambda q: analyzer.dense_search(q, k=k),
+                    'hybrid': lambda q: analyzer.hybrid_search(q, k=k),
+                    'context': analyzer.retrieve_context_documents
+                }
+                latency, recall = {}, {}
+                for mode, search in modes.items():
+                    latencies, results = _timed_queries(search, repeats)
+                    latency[mode] = {
+                        'p50_ms': round(percentile(latencies, 50), 3),
+                        'p95_ms': round(percentile(latencies, 95), 3)
+                    }
+                    if mode != 'context':
+                        recall[mode] = recall_at_k(results, k)
+
+            pages = summary['total_pages']
+            chunks = manifest_stats['chunks'] + manifest_stats['deduplicated_chunks']  # dedup előtt
+            return {
+                'size': size,
+                'backend': backend,
+                'quantization': quantization if backend == "numpy" else "none",
+                'pages': pages,
+                'chunks': chunks,
+                'indexed_chunks': summary['total_chunks'],
+                'ingest_seconds': round(ingest_seconds, 3),
+                'pages_per_s': round(pages / ingest_seconds, 2) if ingest_seconds else 0.0,
+                'chunks_per_s': round(chunks / ingest_seconds, 2) if ingest_seconds else 0.0,
+                'latency': latency,
+                f'recall@{k}': recall,
+                'peak_rss_mb': round(peak_rss_mb(), 1),
+                'scan_mb': round(footprint.get('scan_bytes', 0) / (1024 * 1024), 3),
+                'index_mb': round(directory_bytes(work_dir / "vectorstore") / (1024 * 1024), 3)
+            }
+    finally:
+        RAG_CONFIG.clear()
+        RAG_CONFIG.update(original_config)
+
+
+# ----------------------------------------------------------------------
+# Regresszió ellenőrzés
+# ----------------------------------------------------------------------
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                        tolerance: float = 0.25, recall_tolerance: float = 0.05) -> List[str]:
+    """
+    Eltérések a baseline-hoz képest (azonos méret, backend és kvantálás).
+
+    Regresszió: az áteresztőképesség `tolerance` aránynál jobban csökken, a p95
+    késleltetés `tolerance` aránynál jobban nő, vagy a recall `recall_tolerance`
+    értéknél jobban esik.
+    """
+    regressions = []
+    by_key = {(b['size'], b['backend'], b.get('quantization', 'none')): b for b in baseline}
+    for result in results:
+        base = by_key.get((result['size'], result['backend'], result.get('quantization', 'none')))
+        if not base:
+            continue
+        label = f"{result['backend']}/{result.get('quantization', 'none')}/{result['size']}"
+
+        for metric in ('pages_per_s', 'chunks_per_s'):
+            if base[metric] and result[metric] < base[metric] * (1 - tolerance):
+                regressions.append(f"{label}: {metric} {base[metric]} -> {result[metric]}")
+
+        for mode, current in result['latency'].items():
+            base_p95 = base['latency'].get(mode, {}).get('p95_ms')
+            if base_p95 and current['p95_ms'] > base_p95 * (1 + tolerance):
+                regressions.append(f"{label}: {mode} p95 {base_p95} ms -> {current['p95_ms']} ms")
+
+        recall_key = next((key for key in result if key.startswith('recall@')), None)
+        for mode, value in result.get(recall_key, {}).items():
+            base_value = base.get(recall_key, {}).get(mode)
+            if base_value is not None and value < base_value - recall_tolerance:
+                regressions.append(f"{label}: {mode} {recall_key} {base_value} -> {value}")
+    return regressions
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print(f"{'méret':>6} {'oldal':>6} {'chunk':>6} {'oldal/s':>9} {'chunk/s':>9} "
+          f"{'dense p50/p95 ms':>18} {'hybrid p50/p95 ms':>18} {'ctx p50/p95 ms':>16} "
+          f"{'recall d/h':>11} {'RSS MB':>8} {'scan MB':>8} {'index MB':>9}")
+    for r in results:
+        recall = next(v for key, v in r.items() if key.startswith('recall@'))
+        lat = r['latency']
+        print(f"{r['size']:>6} {r['pages']:>6} {r['chunks']:>6} {r['pages_per_s']:>9} {r['chunks_per_s']:>9} "
+              f"{lat['dense']['p50_ms']:>8}/{lat['dense']['p95_ms']:<9} "
+              f"{lat['hybrid']['p50_ms']:>8}/{lat['hybrid']['p95_ms']:<9} "
+              f"{lat['context']['p50_ms']:>7}/{lat['context']['p95_ms']:<8} "
+              f"{recall.get('dense', 0):>5}/{recall.get('hybrid', 0):<5} "
+              f"{r['peak_rss_mb']:>8} {r.get('scan_mb', 0):>8} {r['index_mb']:>9}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline RAG retrieval benchmark")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Korpusz méretek (PDF darabszám), vesszővel elválasztva")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default="numpy",
+                        help="Vector store backend (alapértelmezés: numpy)")
+    parser.add_argument("--quantization", choices=["none", "int8"], default="none",
+                        help="NumPy index vektor tárolás (alapértelmezés: none)")
+    parser.add_argument("-k", type=int, default=5, help="Top-k a recall@k-hoz és a kereséshez")
+    parser.add_argument("--repeats", type=int, default=3, help="Ismétlés kérdésenként")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Ingest worker folyamatok (0 = RAG_CONFIG szerint)")
+    parser.add_argument("--output", help="Eredmények mentése JSON fájlba")
+    parser.add_argument("--baseline", help="Összehasonlítás egy korábbi eredmény fájllal")
+    parser.add_argument("--save-baseline", help="Eredmények mentése új baseline-ként")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Megengedett relatív romlás (áteresztőképesség, p95)")
+    parser.add_argument("--verbose", action="store_true", help="Az indexelés naplójának kiírása")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    for size in sorted(sizes):
+        print(f"⏱️ Benchmark: {size} PDF ({args.backend}, {args.quantization})...")
+        results.append(run_size(size, backend=args.backend, k=args.k, repeats=args.repeats,
+                                workers=args.workers, verbose=args.verbose,
+                                quantization=args.quantization))
+
+    print_report(results)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"💾 Eredmények mentve: {path}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, tolerance=args.tolerance)
+        if regressions:
+            print("❌ Regresszió a baseline-hoz képest:")
+            for line in regressions:
+                print(f"   - {line}")
+            return 1
+        print("✅ Nincs regresszió a baseline-hoz képest")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
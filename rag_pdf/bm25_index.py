@@ -0,0 +1,193 @@
+# =============================================================================
+# rag_pdf/bm25_index.py
+# =============================================================================
+"""
+Lokális BM25 inverted index a vector store mellé.
+
+Ingest közben épül (ugyanazokkal a chunk ID-kkal), így pontos
+gyógyszernevek és MeSH-szerű kifejezések hálózati hívás nélkül is
+megtalálhatók. A dense és lexikális találati listákat reciprocal rank
+fusion (RRF) egyesíti.
+"""
+import os
+import re
+import json
+import math
+import hashlib
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
+
+from langchain_core.documents import Document
+
+BM25_FILENAME = "bm25_index.json"
+
+TOKEN_PATTERN = re.compile(r"[0-9a-záéíóöőúüű]+(?:[-'][0-9a-záéíóöőúüű]+)*")
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'can', 'do', 'for', 'from',
+    'has', 'have', 'if', 'in', 'into', 'is', 'it', 'its', 'may', 'not', 'of', 'on', 'or',
+    'such', 'that', 'the', 'their', 'then', 'there', 'these', 'they', 'this', 'to', 'was',
+    'were', 'will', 'with', 'you', 'your'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Kisbetűs tokenizálás stopword szűréssel"""
+    return [
+        token for token in TOKEN_PATTERN.findall((text or "").lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def document_key(doc: Document) -> str:
+    """Dokumentum azonosító a fúzióhoz: chunk ID, ennek hiányában tartalom hash"""
+    chunk_id = doc.metadata.get('chunk_id') if doc.metadata else None
+    if chunk_id:
+        return chunk_id
+    return hashlib.sha1(doc.page_content.encode('utf-8')).hexdigest()
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Document]], k: int = 60,
+                           key_fn: Callable[[Document], str] = document_key) -> List[Document]:
+    """
+    Reciprocal rank fusion: score(d) = sum(1 / (k + rank)) a listákon át.
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = key_fn(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(key, doc)
+
+    ranked = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [documents[key] for key in ranked]
+
+
+class BM25Index:
+    """Okapi BM25 index JSON perzisztenciával"""
+
+    def __init__(self, index_path: str, k1: float = 1.5, b: float = 0.75):
+        self.index_path = Path(index_path)
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, Dict[str, Any]] = {}  # id -> {tf, len, text, metadata}
+        self._postings: Dict[str, set] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+        self.load()
+
+    # ------------------------------------------------------------------
+    # Perzisztencia
+    # ------------------------------------------------------------------
+    def load(self):
+        with self._lock:
+            self._docs, self._postings, self._total_length = {}, {}, 0
+            if not self.index_path.exists():
+                return
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for doc_id, doc in data.get('docs', {}).items():
+                    self._insert(doc_id, doc)
+            except Exception as e:
+                print(f"⚠️ BM25 index betöltési hiba, újraépítés szükséges: {e}")
+                self._docs, self._postings, self._total_length = {}, {}, 0
+
+    def save(self):
+        with self._lock:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'k1': self.k1, 'b': self.b, 'docs': self._docs}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+
+    # ------------------------------------------------------------------
+    # Módosítás
+    # ------------------------------------------------------------------
+    def _insert(self, doc_id: str, doc: Dict[str, Any]):
+        self._docs[doc_id] = doc
+        self._total_length += doc['len']
+        for term in doc['tf']:
+            self._postings.setdefault(term, set()).add(doc_id)
+
+    def add(self, ids: List[str], texts: List[str], metadatas: Optional[List[dict]] = None):
+        metadatas = metadatas or [{} for _ in texts]
+        with self._lock:
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                if doc_id in self._docs:
+                    self._remove(doc_id)
+                tokens = tokenize(text)
+                self._insert(doc_id, {
+                    'tf': dict(Counter(tokens)),
+                    'len': len(tokens),
+                    'text': text,
+                    'metadata': metadata
+                })
+
+    def _remove(self, doc_id: str):
+        doc = self._docs.pop(doc_id, None)
+        if not doc:
+            return
+        self._total_length -= doc['len']
+        for term in doc['tf']:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[term]
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def clear(self):
+        with self._lock:
+            self._docs, self._postings, self._total_length = {}, {}, 0
+
+    # ------------------------------------------------------------------
+    # Keresés
+    # ------------------------------------------------------------------
+    @property
+    def doc_ids(self) -> set:
+        with self._lock:
+            return set(self._docs)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def search_with_scores(self, query: str, k: int = 10) -> List[Tuple[Document, float]]:
+        """BM25 top-k keresés (hálózati hívás nélkül)"""
+        query_terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not query_terms:
+                return []
+
+            avg_length = self._total_length / n_docs if n_docs else 0.0
+            scores: Dict[str, float] = {}
+
+            for term in query_terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id in posting:
+                    doc = self._docs[doc_id]
+                    tf = doc['tf'][term]
+                    norm = self.k1 * (1 - self.b + self.b * doc['len'] / (avg_length or 1.0))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [
+                (Document(page_content=self._docs[doc_id]['text'],
+                          metadata=dict(self._docs[doc_id]['metadata'])), score)
+                for doc_id, score in ranked
+            ]
+
+    def search(self, query: str, k: int = 10) -> List[Document]:
+        return [doc for doc, _ in self.search_with_scores(query, k)]
@@ -0,0 +1,116 @@
+# =============================================================================
+# rag_pdf/catalog.py
+# =============================================================================
+"""
+Index metaadat katalógus (forrás fájlok, topicok, chunk számok, méretek).
+
+Az ingest közben, a manifesttel együtt frissül, az összesítéseket mentéskor
+számoljuk ki, így a statisztika és az admin nézet egyetlen kis JSON
+olvasásával - embedding hívás és vector store keresés nélkül - kiszolgálható.
+"""
+import os
+import json
+import threading
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+CATALOG_FILENAME = "catalog.json"
+CATALOG_VERSION = 1
+
+
+@dataclass
+class CatalogSource:
+    """Egy beindexelt forrás fájl katalógus bejegyzése"""
+    file_name: str
+    topic: str
+    chunks: int
+    pages: int = 0
+    file_bytes: int = 0
+    text_bytes: int = 0  # a beindexelt chunkok szövegének mérete (UTF-8)
+    ingested_at: str = ""
+
+
+class IndexCatalog:
+    """Gyűjteményenkénti katalógus atomikus JSON mentéssel"""
+
+    def __init__(self, catalog_path: Path, collection: str = "medline_pdfs", backend: str = "chroma"):
+        self.catalog_path = Path(catalog_path)
+        self.collection = collection
+        self.backend = backend
+        self.sources: Dict[str, CatalogSource] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        self.sources = {}
+        data = read_catalog(self.catalog_path)
+        for name, source in (data or {}).get('sources', {}).items():
+            try:
+                self.sources[name] = CatalogSource(**source)
+            except TypeError:
+                continue
+
+    def exists(self) -> bool:
+        return self.catalog_path.exists()
+
+    def record(self, source: CatalogSource):
+        with self._lock:
+            self.sources[source.file_name] = source
+
+    def remove(self, file_name: str):
+        with self._lock:
+            self.sources.pop(file_name, None)
+
+    def clear(self):
+        with self._lock:
+            self.sources = {}
+
+    def summary(self) -> Dict[str, Any]:
+        """Összesítések (topiconként is)"""
+        topics: Dict[str, Dict[str, int]] = {}
+        for source in self.sources.values():
+            topic = topics.setdefault(source.topic, {'sources': 0, 'chunks': 0})
+            topic['sources'] += 1
+            topic['chunks'] += source.chunks
+
+        return {
+            'collection': self.collection,
+            'backend': self.backend,
+            'total_sources': len(self.sources),
+            'total_chunks': sum(s.chunks for s in self.sources.values()),
+            'total_pages': sum(s.pages for s in self.sources.values()),
+            'file_bytes': sum(s.file_bytes for s in self.sources.values()),
+            'text_bytes': sum(s.text_bytes for s in self.sources.values()),
+            'topics': dict(sorted(topics.items())),
+            'last_ingest': max((s.ingested_at for s in self.sources.values()), default=None)
+        }
+
+    def save(self):
+        """Katalógus atomikus mentése az előre kiszámolt összesítésekkel"""
+        with self._lock:
+            data = {
+                'version': CATALOG_VERSION,
+                'updated_at': datetime.now().isoformat(),
+                'summary': self.summary(),
+                'sources': {name: asdict(s) for name, s in sorted(self.sources.items())}
+            }
+            self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.catalog_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.catalog_path)
+
+
+def read_catalog(catalog_path: Path) -> Optional[Dict[str, Any]]:
+    """Katalógus fájl olvasása (None, ha nem létezik vagy sérült)"""
+    catalog_path = Path(catalog_path)
+    if not catalog_path.exists():
+        return None
+    try:
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Katalógus olvasási hiba: {e}")
+        return None
@@ -0,0 +1,72 @@
+# =============================================================================
+# rag_pdf/compact_index.py
+# =============================================================================
+"""
+RAG index szemétgyűjtés és tömörítés parancssorból.
+
+Törli a PDF könyvtárból eltűnt, illetve újabb időbélyegű letöltéssel
+felváltott fájlok chunkjait és az árva chunkokat, majd felszabadítja a
+tároló helyét (numpy: élő sorok újraírása, Chroma: SQLite VACUUM).
+
+Használat:
+    python -m rag_pdf.compact_index --dry-run
+    python -m rag_pdf.compact_index
+    python -m rag_pdf.compact_index --backend numpy --json
+"""
+import argparse
+import json
+
+from .config import RAG_CONFIG
+from .rag_analyzer import RAGAnalyzer
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="RAG index szemétgyűjtés és tömörítés")
+    parser.add_argument("--vector-store", default="rag_pdf/vectorstore",
+                        help="Vector store könyvtár (alapértelmezés: rag_pdf/vectorstore)")
+    parser.add_argument("--backend", choices=["chroma", "numpy"],
+                        help="Vector store backend (alapértelmezés: RAG_CONFIG)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Csak a törlendő fájlok / chunkok listázása")
+    parser.add_argument("--json", action="store_true", help="Jelentés JSON formátumban")
+    return parser.parse_args(argv)
+
+
+def print_report(report: dict):
+    title = "Tömörítési terv (dry run)" if report['dry_run'] else "Tömörítési jelentés"
+    print(f"\n🧹 {title}")
+    print(f"   Hiányzó fájlok:   {len(report['missing_files'])}")
+    for name in report['missing_files']:
+        print(f"      - {name}")
+    print(f"   Elavult fájlok:   {len(report['superseded_files'])}")
+    for name, newer in report['superseded_files'].items():
+        print(f"      - {name} -> {newer}")
+    print(f"   Elavult chunkok:  {report['stale_chunks']}")
+    print(f"   Árva chunkok:     {report['orphan_chunks']}")
+    if not report['dry_run']:
+        print(f"   Törölt chunkok:   {report['deleted_chunks']}")
+        print(f"   Újraindexelve:    {report['reindexed_chunks']} chunk")
+        print(f"   Index méret:      {report['bytes_before'] / 1024:.1f} KB -> {report['bytes_after'] / 1024:.1f} KB")
+        print(f"   Felszabadítva:    {report['reclaimed_bytes'] / 1024:.1f} KB")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.backend:
+        RAG_CONFIG["chroma"]["backend"] = args.backend
+
+    # Szinkron nélkül nyitjuk meg: a jelentés a manifest szerinti állapotból készül
+    # (a dry run semmit nem módosít, éles futásnál a szinkront a tömörítés végzi,
+    # így a hiányzó fájlok és a felszabadított hely is a jelentésbe kerül)
+    analyzer = RAGAnalyzer(args.vector_store, sync=False)
+    report = analyzer.compact_index(dry_run=args.dry_run)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
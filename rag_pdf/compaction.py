@@ -0,0 +1,76 @@
+# =============================================================================
+# rag_pdf/compaction.py
+# =============================================================================
+"""
+Index szemétgyűjtés (GC) és tömörítés segédfüggvényei.
+
+A MedlineDownloadManager minden letöltéskor új időbélyeges fájlnevet ad
+(`medline_{sorszám}_{cím}_{ÉÉÉÉHHNN_óóppmm}.pdf`), így ugyanannak a
+topicnak több változata is a PDF könyvtárban maradhat. Egy fájl elavult,
+ha ugyanazzal a címmel létezik újabb időbélyegű változata. A törlés
+után a tárolók fizikai helyét külön kell felszabadítani: a NumPy index
+újraírja az élő sorokat, a Chroma SQLite adatbázisa VACUUM-ot kap.
+"""
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Iterable
+
+PDF_NAME_PATTERN = re.compile(r"^medline_\d+_(?P<title>.+)_(?P<stamp>\d{8}_\d{6})\.pdf$", re.IGNORECASE)
+CHROMA_SQLITE_FILENAME = "chroma.sqlite3"
+
+
+def parse_pdf_name(file_name: str) -> Optional[Tuple[str, str]]:
+    """Letöltött PDF név -> (normalizált cím, időbélyeg); None, ha nem ilyen formátumú"""
+    match = PDF_NAME_PATTERN.match(file_name)
+    if not match:
+        return None
+    return match.group('title').lower(), match.group('stamp')
+
+
+def find_superseded(file_names: Iterable[str]) -> Dict[str, str]:
+    """
+    Elavult fájlok keresése.
+
+    Returns:
+        Dict: elavult fájlnév -> ugyanannak a címnek a legújabb változata
+    """
+    latest: Dict[str, Tuple[str, str]] = {}
+    versions: Dict[str, List[str]] = {}
+    for name in file_names:
+        parsed = parse_pdf_name(name)
+        if not parsed:
+            continue
+        title, stamp = parsed
+        versions.setdefault(title, []).append(name)
+        if title not in latest or (stamp, name) > latest[title]:
+            latest[title] = (stamp, name)
+
+    return {
+        name: latest[title][1]
+        for title, names in versions.items()
+        for name in names
+        if name != latest[title][1]
+    }
+
+
+def directory_bytes(path: Path) -> int:
+    """Könyvtár teljes mérete bájtban (rekurzívan)"""
+    path = Path(path)
+    if not path.exists():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def vacuum_sqlite(database_path: Path) -> int:
+    """SQLite VACUUM (a törölt lapok felszabadítása), visszaadja a felszabadított bájtokat"""
+    database_path = Path(database_path)
+    if not database_path.exists():
+        return 0
+    before = database_path.stat().st_size
+    connection = sqlite3.connect(str(database_path), timeout=30)
+    try:
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    return max(0, before - database_path.stat().st_size)
@@ -20,15 +20,77 @@ CHROMA_PERSIST_DIR.mkdir(exist_ok=True)
 RAG_CONFIG = {
     # Embedding beállítások
     "embedding": {
+        "provider": "openai",  # "openai" vagy "hashing" (lokális offline mód, külön indexszel); "auto": API kulcs nélkül hashing
         "model": "text-embedding-3-small",
-        "chunk_size": 500,
-        "chunk_overlap": 150,
+        "hashing": {
+            "dim": 512,  # Lokális hashing embedding dimenzió
+            "ngram_range": [1, 2],  # Szó unigram + bigram featurek
+        },
+        "cache": {
+            "enabled": True,  # Lemezre mentett embedding cache
+            "dir": str(RAG_DATA_DIR / "embedding_cache"),
+            "max_entries": 200000,  # LRU kiürítés e felett (megnyitáskor)
+            "flush_rows": 64,  # Pufferelt lekérdezés vektorok kötegmérete
+            "min_block_rows": 512,  # Ennél kisebb blokkok megnyitáskor összeolvadnak
+            "max_open_blocks": 32,  # Egyszerre nyitott memmap blokkok (fájlleírók)
+        },
+    },
+    
+    # Chunkolás (egyetlen forrás az indexhez és a PDFProcessorhoz)
+    "chunking": {
+        "chunk_size": 1000,  # Kisebb chunk-ok a pontosabb retrievalért
+        "chunk_overlap": 200,  # Átfedés a kontextus megőrzésére
+        "separators": ["\n\n", "\n", ". ", " ", ""],
+        "strip_empty_lines": True,  # Üres sorok eltávolítása a chunkokból (a PDFProcessor mindig így tett)
+    },
+    
+    # Kinyert PDF szöveg cache (újrachunkolás PyPDF parse nélkül)
+    "text_cache": {
+        "enabled": True,
+        "dir": str(RAG_DATA_DIR / "text_cache"),
     },
     
     # Chroma beállítások
     "chroma": {
         "persist_directory": str(CHROMA_PERSIST_DIR),
-        "collection_name": "medline_pdfs"
+        "collection_name": "medline_pdfs",
+        "backend": "chroma",  # "chroma" vagy "numpy" (memory-mapped lokális index)
+        "quantization": "none",  # numpy backend: "none" vagy "int8" (4x kisebb pásztázott mátrix)
+        "rescore_factor": 4,  # int8: k * rescore_factor jelölt float32 újrapontozása
+    },
+    
+    # Topic szerinti shardolás (párhuzamos fan-out keresés)
+    "sharding": {
+        "enabled": False,  # Bekapcsolva külön index könyvtárba épül a shardolt index
+        "mode": "hash",  # "hash": topic hash bucketek, "topic": topiconként egy shard
+        "buckets": 16,  # Hash bucketek száma
+        "max_workers": 8,  # Fan-out keresési szálak
+        "route_by_topic": True,  # Csak a kérdésben szereplő topicok shardjai (egyébként mind)
+    },
+    
+    # Ingest (indexelés) beállítások
+    "ingest": {
+        "batch_size": 256,  # Egy add/delete hívásban kezelt chunkok száma
+        "workers": 1,  # PDF parse/chunk worker folyamatok (1 = soros; párhuzamos ingest: pl. min(4, os.cpu_count()))
+        "max_inflight_per_worker": 2,  # Egyszerre úton lévő fájlok workerenként (memória korlát)
+        "start_method": "spawn",  # Process pool indítási mód (Streamlit szálak mellett spawn)
+        "refresh_interval": 30,  # PDF könyvtár változás-ellenőrzés gyakorisága (mp) a megosztott analyzerben
+    },
+    
+    # Közel-duplikált chunkok szűrése (MinHash + LSH)
+    "dedup": {
+        "enabled": True,  # Közel-duplikált chunkok eldobása beágyazás előtt
+        "num_perm": 64,  # MinHash permutációk száma
+        "bands": 16,  # LSH sávok (num_perm osztója)
+        "shingle_size": 5,  # Szó shingle hossz
+        "threshold": 0.85,  # Becsült Jaccard küszöb
+    },
+    
+    # Fordítás (magyar -> angol) beállítások
+    "translation": {
+        "model": "gpt-3.5-turbo",
+        "temperature": 0.0,
+        "memory_path": str(RAG_DATA_DIR / "translation_memory.json"),
     },
     
     # LLM beállítások
@@ -38,10 +100,46 @@ RAG_CONFIG = {
         "max_tokens": 3000
     },
     
+    # Async elemzés időkorlátok (másodperc)
+    "async": {
+        "translation_timeout": 20,  # Betegadat fordítás
+        "answer_timeout": 90,  # Retrieval + LLM válasz
+    },
+    
     # RAG beállítások
     "rag": {
         "top_k": 10,  # Hány releváns chunk-ot használjon
-        "score_threshold": 0.6  # Relevancia küszöb
+        "score_threshold": 0.6,  # Relevancia küszöb
+        "hybrid": {
+            "enabled": True,  # BM25 + dense keresés reciprocal rank fusion-nel
+            "dense_k": 10,  # Dense jelöltek száma
+            "lexical_k": 10,  # BM25 jelöltek száma
+            "rrf_k": 60,  # RRF konstans
+            "final_k": 5,  # Visszaadott chunkok száma (kontextus packer nélkül)
+        },
+        "context": {
+            "enabled": True,  # Token-keretes MMR kontextus összeállítás
+            "candidate_k": 20,  # Hibrid retriever jelölt halmaza
+            "token_budget": 2000,  # Kontextus token keret a promptban
+            "lambda_mult": 0.5,  # MMR: 1 = csak relevancia, 0 = csak diverzitás
+        },
+    },
+    
+    # Batch (több eset) elemzés
+    "batch": {
+        "max_concurrency": 4,  # Egyidejű LLM hívások
+        "translation_batch_size": 100,  # Kifejezések száma egy fordítási hívásban
+        "output_dir": str(RAG_DATA_DIR / "exports"),  # Összesített JSONL kimenet
+    },
+    
+    # Válasz cache ismétlődő beteg profilokhoz
+    "answer_cache": {
+        "enabled": True,
+        "path": str(RAG_DATA_DIR / "answer_cache.json"),
+        "ttl_hours": 168,  # Bejegyzés élettartama
+        "max_entries": 500,  # LRU kiürítés e felett
+        "semantic": False,  # Opt-in: embedding hasonlóság alapú keresés pontos egyezés hiányában
+        "similarity_threshold": 0.97,  # Koszinusz hasonlóság küszöb
     },
     
     # Könyvtárak
@@ -0,0 +1,159 @@
+# =============================================================================
+# rag_pdf/context_packer.py
+# =============================================================================
+"""
+Token-keretes kontextus összeállítás a RAG prompthoz.
+
+A hibrid retriever nagyobb jelölt halmazából maximal marginal relevance
+(MMR) szerint választunk, így az átfedő chunkok nem foglalják a prompt
+helyét. A kiválasztás addig tart, amíg a konfigurált token keret engedi,
+végül a chunkok forrás és oldalszám szerint rendezve kerülnek a promptba.
+A jelöltek vektorait (ha adott a `vector_lookup`) a vector store-ból
+olvassuk vissza chunk ID szerint; csak a nem tárolt jelöltek embeddelődnek.
+"""
+import threading
+from typing import Dict, List, Any, Callable, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+# Becslés, ha a tiktoken kódolás nem érhető el (offline környezet)
+CHARS_PER_TOKEN = 4
+
+_ENCODERS: Dict[str, Any] = {}
+_ENCODERS_LOCK = threading.Lock()
+
+
+def get_token_counter(model: str) -> Callable[[str], int]:
+    """tiktoken alapú token számláló, hiányában karakter alapú becslés"""
+    with _ENCODERS_LOCK:
+        if model not in _ENCODERS:
+            try:
+                import tiktoken
+                try:
+                    _ENCODERS[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _ENCODERS[model] = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"⚠️ tiktoken nem elérhető, token becslés karakterszám alapján: {e}")
+                _ENCODERS[model] = None
+        encoder = _ENCODERS[model]
+
+    if encoder is None:
+        return lambda text: max(1, len(text or "") // CHARS_PER_TOKEN)
+    return lambda text: len(encoder.encode(text or "", disallowed_special=()))
+
+
+def mmr_select(query_vector: np.ndarray, doc_vectors: np.ndarray, k: int,
+               lambda_mult: float = 0.5) -> List[int]:
+    """
+    Maximal marginal relevance sorrend.
+
+    Returns:
+        List: a kiválasztott dokumentumok indexei (választási sorrendben)
+    """
+    if doc_vectors.size == 0 or k <= 0:
+        return []
+
+    doc_vectors = doc_vectors / np.maximum(np.linalg.norm(doc_vectors, axis=1, keepdims=True), 1e-12)
+    query_vector = query_vector / max(float(np.linalg.norm(query_vector)), 1e-12)
+
+    relevance = doc_vectors @ query_vector
+    similarity = doc_vectors @ doc_vectors.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+
+    while len(selected) < min(k, len(doc_vectors)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        max_similarity = np.maximum(max_similarity, similarity[best])
+
+    return selected
+
+
+def source_order_key(doc: Document):
+    """Forrás fájl, oldal, chunk ID szerinti rendezés"""
+    metadata = doc.metadata or {}
+    return (
+        str(metadata.get('source_file', metadata.get('source', ''))),
+        int(metadata.get('page', 0) or 0),
+        str(metadata.get('chunk_id', ''))
+    )
+
+
+class ContextPacker:
+    """MMR kiválasztás token kerettel, forrás szerinti sorrendben"""
+
+    def __init__(self, embeddings: Embeddings, token_budget: int = 2000,
+                 lambda_mult: float = 0.5, model: str = "gpt-4",
+                 vector_lookup: Optional[Callable[[List[str]], Dict[str, Any]]] = None):
+        self.embeddings = embeddings
+        self.vector_lookup = vector_lookup
+        self.token_budget = token_budget
+        self.lambda_mult = lambda_mult
+        self.count_tokens = get_token_counter(model)
+
+    def select(self, query: str, candidates: List[Document]) -> List[Document]:
+        """Jelöltek kiválasztása MMR szerint, amíg a token keret engedi"""
+        if not candidates:
+            return []
+
+        try:
+            query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            doc_vectors = np.asarray(self._candidate_vectors(candidates), dtype=np.float32)
+            order = mmr_select(query_vector, doc_vectors, len(candidates), self.lambda_mult)
+        except Exception as e:
+            # Embedding nélkül a retriever sorrendjét használjuk
+            print(f"⚠️ MMR nem elérhető, retriever sorrend: {e}")
+            order = list(range(len(candidates)))
+
+        packed, used_tokens = [], 0
+        for index in order:
+            tokens = self.count_tokens(self._format_doc(candidates[index]))
+            if used_tokens + tokens > self.token_budget:
+                continue
+            packed.append(candidates[index])
+            used_tokens += tokens
+
+        return sorted(packed, key=source_order_key)
+
+    def _candidate_vectors(self, candidates: List[Document]) -> List[Any]:
+        """Tárolt vektorok chunk ID szerint, csak a hiányzó jelöltek embeddelése"""
+        chunk_ids = [(doc.metadata or {}).get('chunk_id') for doc in candidates]
+        stored = {}
+        if self.vector_lookup:
+            stored = self.vector_lookup([chunk_id for chunk_id in chunk_ids if chunk_id])
+        vectors = [stored.get(chunk_id) for chunk_id in chunk_ids]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = self.embeddings.embed_documents([candidates[i].page_content for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+        return vectors
+
+    @staticmethod
+    def _format_doc(doc: Document) -> str:
+        metadata = doc.metadata or {}
+        source = metadata.get('topic') or metadata.get('source_file', 'medline')
+        page = metadata.get('page')
+        header = f"[{source}, {int(page) + 1}. oldal]" if page is not None else f"[{source}]"
+        return f"{header}\n{doc.page_content}"
+
+    def format(self, docs: List[Document]) -> str:
+        """Chunkok összefűzése forrás jelöléssel"""
+        return "\n\n".join(self._format_doc(doc) for doc in docs)
+
+    def pack(self, query: str, candidates: List[Document]) -> str:
+        return self.format(self.select(query, candidates))
+
+    def stats(self, docs: List[Document]) -> Dict[str, Any]:
+        return {
+            'chunks': len(docs),
+            'tokens': sum(self.count_tokens(self._format_doc(doc)) for doc in docs),
+            'token_budget': self.token_budget
+        }
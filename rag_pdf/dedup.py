@@ -0,0 +1,176 @@
+# =============================================================================
+# rag_pdf/dedup.py
+# =============================================================================
+"""
+Közel-duplikált chunkok kiszűrése beágyazás előtt (MinHash + LSH).
+
+A Medline PDF-ek nagy, ismétlődő blokkokat tartalmaznak (jogi nyilatkozat,
+borítólap, "mikor forduljon orvoshoz" szakaszok), az átfedő chunkolás
+miatt ezek sokszor kerülnének beágyazásra. Minden chunkhoz szó-shingle
+alapú MinHash szignatúrát számolunk; ha egy már megtartott chunk becsült
+Jaccard hasonlósága eléri a küszöböt, az új chunkot eldobjuk, és
+feljegyezzük, melyik megtartott chunkra hivatkozik.
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable, Set
+
+import numpy as np
+
+DEDUP_FILENAME = "dedup_index.json"
+
+# 2^32 feletti prím az univerzális hash családhoz (a*x+b mod P nem csordul túl uint64-ben)
+_MERSENNE_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+_WORD_PATTERN = re.compile(r"\w+", flags=re.UNICODE)
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """Szó alapú shingle-ök (rövid szövegnél maga a teljes szöveg)"""
+    words = _WORD_PATTERN.findall((text or "").lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """MinHash szignatúra számítás vektorizált univerzális hash függvényekkel"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+             for s in shingle_set),
+            dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    A megtartott chunkok MinHash szignatúrái LSH bucketekben, JSON perzisztenciával.
+    """
+
+    def __init__(self, index_path: str, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 5, threshold: float = 0.85):
+        if num_perm % bands:
+            raise ValueError("num_perm osztható kell legyen a bands értékkel")
+        self.index_path = Path(index_path)
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self.load()
+
+    # ------------------------------------------------------------------
+    # Perzisztencia
+    # ------------------------------------------------------------------
+    def load(self):
+        with self._lock:
+            self._signatures, self._buckets = {}, {}
+            if not self.index_path.exists():
+                return
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('num_perm') != self.hasher.num_perm or data.get('bands') != self.bands:
+                    print("⚠️ Dedup index paraméterei változtak, újraépítés szükséges")
+                    return
+                for chunk_id, signature in data.get('signatures', {}).items():
+                    self._insert(chunk_id, np.asarray(signature, dtype=np.uint32))
+            except Exception as e:
+                print(f"⚠️ Dedup index betöltési hiba, újraépítés szükséges: {e}")
+                self._signatures, self._buckets = {}, {}
+
+    def save(self):
+        with self._lock:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                'num_perm': self.hasher.num_perm,
+                'bands': self.bands,
+                'signatures': {cid: sig.tolist() for cid, sig in self._signatures.items()}
+            }
+            tmp_path = self.index_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+
+    # ------------------------------------------------------------------
+    # LSH
+    # ------------------------------------------------------------------
+    def _band_keys(self, signature: np.ndarray) -> List[str]:
+        r = self.rows_per_band
+        return [f"{band}:{signature[band * r:(band + 1) * r].tobytes().hex()}"
+                for band in range(self.bands)]
+
+    def _insert(self, chunk_id: str, signature: np.ndarray):
+        self._signatures[chunk_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(chunk_id)
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.hasher.signature(shingles(text, self.shingle_size))
+
+    def find_duplicate(self, signature: np.ndarray) -> Optional[str]:
+        """A legjobban egyező megtartott chunk ID-ja, ha eléri a küszöböt"""
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+
+            best_id, best_score = None, self.threshold
+            for chunk_id in candidates:
+                score = float(np.mean(self._signatures[chunk_id] == signature))
+                if score >= best_score:
+                    best_id, best_score = chunk_id, score
+            return best_id
+
+    def add(self, chunk_id: str, signature: np.ndarray):
+        with self._lock:
+            if chunk_id in self._signatures:
+                self.remove([chunk_id])
+            self._insert(chunk_id, signature)
+
+    def remove(self, chunk_ids: Iterable[str]):
+        with self._lock:
+            for chunk_id in chunk_ids:
+                signature = self._signatures.pop(chunk_id, None)
+                if signature is None:
+                    continue
+                for key in self._band_keys(signature):
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(chunk_id)
+                        if not bucket:
+                            del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._signatures, self._buckets = {}, {}
+
+    @property
+    def chunk_ids(self) -> set:
+        with self._lock:
+            return set(self._signatures)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
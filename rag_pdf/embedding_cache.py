@@ -0,0 +1,375 @@
+# =============================================================================
+# rag_pdf/embedding_cache.py
+# =============================================================================
+"""
+Lemezre mentett, tartalom-címzett embedding cache.
+
+A kulcs a (modell név, normalizált szöveg hash) pár, a vektorok float32
+blokkokban (.npy) tárolódnak, a kulcs -> (blokk, sor) leképezés egy
+append-only JSONL indexben. Újraindexeléskor és ismételt lekérdezéseknél
+így egyszer sem kell ugyanazt a szöveget kétszer beágyaztatni.
+
+Az egyenként érkező lekérdezés vektorok memóriában gyűlnek és kötegben
+íródnak ki. Megnyitáskor a kis (illetve többségében kiürített) blokkok
+egyetlen blokkba olvadnak, a `max_entries` feletti, legrégebben használt
+bejegyzések törlődnek, a nyitott memmap blokkok száma pedig korlátos.
+"""
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+import unicodedata
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+INDEX_FILENAME = "index.jsonl"
+CONSOLIDATE_LOCK_FILENAME = "consolidate.lock"
+STALE_LOCK_SECONDS = 600
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC + whitespace összevonás a stabil kulcsokért"""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+class EmbeddingCache:
+    """
+    Float32 blokkokban tárolt embedding vektorok indexszel.
+
+    Args:
+        cache_dir: Cache könyvtár
+        model_name: Embedding modell (a kulcs része)
+        max_entries: Bejegyzések felső korlátja (None: korlátlan), LRU kiürítés megnyitáskor
+        flush_rows: Ennyi pufferelt lekérdezés vektor után kiírás
+        min_block_rows: Ennél kisebb blokkok megnyitáskor összeolvadnak
+        max_open_blocks: Egyszerre nyitva tartott memmap blokkok
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, max_entries: Optional[int] = None,
+                 flush_rows: int = 64, min_block_rows: int = 512, max_open_blocks: int = 32):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.index_path = self.cache_dir / INDEX_FILENAME
+        self.max_entries = max_entries
+        self.flush_rows = max(1, flush_rows)
+        self.min_block_rows = min_block_rows
+        self.max_open_blocks = max(1, max_open_blocks)
+
+        # Beszúrási sorrend = használati sorrend (a legutóbb használt a végén)
+        self._index: Dict[str, Tuple[str, int]] = {}
+        self._blocks: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._pending: Dict[str, np.ndarray] = {}
+        self._touched: Dict[str, Tuple[str, int]] = {}
+        self._index_offset = 0
+        self._index_inode = None
+        self._index_lines = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._refresh_index()
+            self._consolidate()
+        atexit.register(self.flush)
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _refresh_index(self):
+        """Az index fájl új sorainak beolvasása (más folyamatok írásait is látjuk)"""
+        if not self.index_path.exists():
+            return
+
+        # Másik folyamat újraírta (összeolvasztotta) az indexet: teljes újraolvasás
+        inode = os.stat(self.index_path).st_ino
+        if inode != self._index_inode:
+            self._index_inode = inode
+            self._index_offset = 0
+            self._index_lines = 0
+            self._index = {}
+            self._blocks.clear()
+
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            f.seek(self._index_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # félig kiírt sor - következő frissítéskor olvassuk
+                self._index_offset += len(line.encode('utf-8'))
+                try:
+                    record = json.loads(line)
+                    # Ismételt sor (használat) a sorrend végére kerül
+                    self._index.pop(record['key'], None)
+                    self._index[record['key']] = (record['block'], record['row'])
+                    self._index_lines += 1
+                except (ValueError, KeyError):
+                    continue
+
+    def _load_block(self, block_name: str) -> np.ndarray:
+        block = self._blocks.get(block_name)
+        if block is None:
+            block = np.load(self.cache_dir / block_name, mmap_mode='r')
+            self._blocks[block_name] = block
+            while len(self._blocks) > self.max_open_blocks:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(block_name)
+        return block
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Vektorok lekérése kulcsok alapján (hiány esetén None)"""
+        with self._lock:
+            if any(k not in self._index and k not in self._pending for k in keys):
+                self._refresh_index()
+
+            results = []
+            for k in keys:
+                pending = self._pending.get(k)
+                if pending is not None:
+                    results.append(pending)
+                    continue
+                location = self._index.get(k)
+                if location is None:
+                    results.append(None)
+                    continue
+                try:
+                    block_name, row = location
+                    results.append(np.asarray(self._load_block(block_name)[row], dtype=np.float32))
+                    # Használat rögzítése az LRU sorrendhez (a következő kiírással együtt)
+                    self._index[k] = self._index.pop(k)
+                    self._touched[k] = location
+                except Exception as e:
+                    print(f"⚠️ Embedding cache olvasási hiba: {e}")
+                    results.append(None)
+            return results
+
+    def put_many(self, keys: List[str], vectors: List[List[float]], buffered: bool = False):
+        """
+        Új vektorok mentése.
+
+        Args:
+            buffered: Memóriában gyűjtés, kiírás `flush_rows` vektoronként (egyenkénti lekérdezésekhez)
+        """
+        if not keys:
+            return
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if buffered:
+                for k, vector in zip(keys, matrix):
+                    self._pending[k] = vector
+                if len(self._pending) >= self.flush_rows:
+                    self._flush_locked()
+                return
+            self._write_block(keys, matrix)
+
+    def flush(self):
+        """Pufferelt vektorok és használati sorrend kiírása"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            keys = list(self._pending.keys())
+            self._write_block(keys, np.stack([self._pending[k] for k in keys]))
+            self._pending.clear()
+        if self._touched:
+            self._append_index([(k, block, row) for k, (block, row) in self._touched.items()])
+            self._touched.clear()
+
+    def _write_block(self, keys: List[str], matrix: np.ndarray):
+        block_name = f"block_{os.getpid()}_{uuid.uuid4().hex[:12]}.npy"
+        np.save(self.cache_dir / block_name, matrix)
+        self._append_index([(k, block_name, row) for row, k in enumerate(keys)])
+        for row, k in enumerate(keys):
+            self._index.pop(k, None)
+            self._index[k] = (block_name, row)
+            self._touched.pop(k, None)
+
+    def _append_index(self, entries: List[Tuple[str, str, int]]):
+        lines = [json.dumps({'key': k, 'block': block, 'row': row}) for k, block, row in entries]
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    # ------------------------------------------------------------------
+    # Összeolvasztás és kiürítés
+    # ------------------------------------------------------------------
+    def _acquire_consolidate_lock(self) -> bool:
+        lock_path = self.cache_dir / CONSOLIDATE_LOCK_FILENAME
+        try:
+            if lock_path.exists() and time.time() - lock_path.stat().st_mtime > STALE_LOCK_SECONDS:
+                lock_path.unlink()
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except OSError:
+            return False
+
+    def _consolidate(self):
+        """
+        Kis / többségében halott blokkok összeolvasztása, LRU kiürítés és az
+        index tömör újraírása. Párhuzamos folyamatok közül csak egy dolgozik;
+        egy közben elveszett bejegyzés legrosszabb esetben újra beágyazódik.
+        """
+        block_rows: Dict[str, int] = {}
+        for path in self.cache_dir.glob("block_*.npy"):
+            try:
+                block_rows[path.name] = int(np.load(path, mmap_mode='r').shape[0])
+            except Exception:
+                block_rows[path.name] = 0
+
+        overflow = len(self._index) - self.max_entries if self.max_entries else 0
+        live_rows: Dict[str, int] = {}
+        for block_name, _ in self._index.values():
+            live_rows[block_name] = live_rows.get(block_name, 0) + 1
+
+        rewrite = {
+            name for name, rows in block_rows.items()
+            if rows < self.min_block_rows or live_rows.get(name, 0) < rows / 2
+        }
+        needs_work = (overflow > 0 or len(rewrite) > 1
+                      or any(name not in live_rows for name in block_rows)
+                      or self._index_lines > 2 * len(self._index) + 1000)
+        if not needs_work or not self._acquire_consolidate_lock():
+            return
+
+        try:
+            entries = list(self._index.items())
+            if overflow > 0:
+                entries = entries[overflow:]
+                self.evictions += overflow
+
+            moved_keys, moved_vectors, new_index = [], [], []
+            for k, (block_name, row) in entries:
+                if block_name in rewrite:
+                    try:
+                        moved_vectors.append(np.asarray(self._load_block(block_name)[row], dtype=np.float32))
+                        moved_keys.append(k)
+                    except Exception:
+                        continue
+                else:
+                    new_index.append((k, block_name, row))
+
+            merged_name = None
+            if moved_keys:
+                merged_name = f"block_{os.getpid()}_{uuid.uuid4().hex[:12]}.npy"
+                np.save(self.cache_dir / merged_name, np.stack(moved_vectors))
+            positions = {k: row for row, k in enumerate(moved_keys)}
+
+            # Sorrend megtartása: a régi index sorrendjében írjuk vissza
+            ordered = []
+            kept = {k: (b, r) for k, b, r in new_index}
+            for k, _ in entries:
+                if k in kept:
+                    ordered.append((k, *kept[k]))
+                elif k in positions:
+                    ordered.append((k, merged_name, positions[k]))
+
+            tmp_path = self.index_path.with_suffix('.jsonl.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for k, block_name, row in ordered:
+                    f.write(json.dumps({'key': k, 'block': block_name, 'row': row}) + "\n")
+            os.replace(tmp_path, self.index_path)
+
+            self._blocks.clear()
+            referenced = {block_name for _, block_name, _ in ordered}
+            for name in block_rows:
+                if name not in referenced:
+                    try:
+                        (self.cache_dir / name).unlink()
+                    except OSError:
+                        pass  # Windows: másik folyamat még nyitva tartja, következő alkalommal törlődik
+
+            self._index = {k: (b, r) for k, b, r in ordered}
+            self._index_inode = os.stat(self.index_path).st_ino
+            self._index_offset = os.path.getsize(self.index_path)
+            self._index_lines = len(ordered)
+            print(f"🧮 Embedding cache összeolvasztva: {len(block_rows)} -> {len(referenced)} blokk, "
+                  f"{overflow if overflow > 0 else 0} bejegyzés kiürítve")
+        except Exception as e:
+            print(f"⚠️ Embedding cache összeolvasztási hiba: {e}")
+        finally:
+            try:
+                (self.cache_dir / CONSOLIDATE_LOCK_FILENAME).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._index) + len(self._pending),
+                'pending': len(self._pending),
+                'blocks': len({block for block, _ in self._index.values()}),
+                'open_blocks': len(self._blocks),
+                'evictions': self.evictions
+            }
+
+    def __len__(self) -> int:
+        return len(self._index) + len(self._pending)
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper, amely a cache-ből szolgál ki és csak a hiányzó szövegeket küldi tovább"""
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache):
+        self.underlying = underlying
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.cache.key(t) for t in texts]
+        cached = self.cache.get_many(keys)
+
+        # Hiányzó (és egyedi) szövegek összegyűjtése
+        missing: Dict[str, str] = {}
+        for k, text, vector in zip(keys, texts, cached):
+            if vector is None and k not in missing:
+                missing[k] = text
+
+        if missing:
+            new_vectors = self.underlying.embed_documents(list(missing.values()))
+            self.cache.put_many(list(missing.keys()), new_vectors)
+            fresh = dict(zip(missing.keys(), new_vectors))
+        else:
+            fresh = {}
+
+        with self._counter_lock:
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+
+        return [
+            list(map(float, vector)) if vector is not None else list(fresh[k])
+            for k, vector in zip(keys, cached)
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self.cache.key(text)
+        vector = self.cache.get_many([key])[0]
+
+        if vector is not None:
+            with self._counter_lock:
+                self.hits += 1
+            return list(map(float, vector))
+
+        new_vector = self.underlying.embed_query(text)
+        self.cache.put_many([key], [new_vector], buffered=True)
+        with self._counter_lock:
+            self.misses += 1
+        return list(new_vector)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            **self.cache.stats()
+        }
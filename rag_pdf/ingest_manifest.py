@@ -0,0 +1,252 @@
+# =============================================================================
+# rag_pdf/ingest_manifest.py
+# =============================================================================
+"""
+Ingest manifest a vector store inkrementális frissítéséhez.
+
+Minden beindexelt PDF-hez eltároljuk az útvonalat, méretet, mtime-ot,
+tartalom hash-t és a hozzá tartozó chunk ID-kat, így csak az új vagy
+módosult fájlokat kell újra beágyazni, a törölt fájlok chunkjai pedig
+eltávolíthatók.
+"""
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+MANIFEST_FILENAME = "ingest_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def compute_file_hash(file_path: Path, block_size: int = 1024 * 1024) -> str:
+    """Fájl tartalmának SHA-256 hash-e (blokkonként olvasva)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_chunk_id(file_name: str, content_hash: str, index: int) -> str:
+    """Determinisztikus chunk ID: fájlnév + tartalom hash + sorszám"""
+    name_hash = hashlib.sha1(file_name.encode('utf-8')).hexdigest()[:10]
+    return f"{name_hash}-{content_hash[:12]}-{index:05d}"
+
+
+def chunking_signature(splitter_options: Dict[str, Any]) -> str:
+    """A chunkolást meghatározó beállítások hash-e (a cache könyvtár nem része)"""
+    relevant = {k: v for k, v in splitter_options.items() if k != "text_cache_dir"}
+    payload = json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def manifest_signature(manifest_path: Path) -> Optional[Tuple[int, int]]:
+    """Olcsó manifest verzió azonosító (mtime_ns, méret) - None, ha nem létezik"""
+    try:
+        stat = Path(manifest_path).stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+@dataclass
+class ManifestEntry:
+    """Egy beindexelt PDF fájl adatai"""
+    file_name: str
+    path: str
+    size: int
+    mtime: float
+    content_hash: str
+    chunk_ids: List[str] = field(default_factory=list)
+    ingested_at: str = ""
+    total_chunks: int = 0  # dedup előtti chunk szám
+    duplicate_of: List[str] = field(default_factory=list)  # más fájlok megtartott chunkjai, amelyekre hivatkozunk
+
+
+@dataclass
+class ManifestDiff:
+    """A PDF könyvtár és a manifest közötti eltérések"""
+    added: List[Path] = field(default_factory=list)
+    modified: List[Path] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    hashes: Dict[str, str] = field(default_factory=dict)  # fájlnév -> tartalom hash
+    touched: int = 0  # csak metaadatban változott bejegyzések száma
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+    def summary(self) -> str:
+        return (f"+{len(self.added)} új, ~{len(self.modified)} módosult, "
+                f"-{len(self.deleted)} törölt, ={len(self.unchanged)} változatlan")
+
+
+class IngestManifest:
+    """JSON alapú ingest manifest kezelése"""
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.settings: Dict[str, Any] = {}  # pl. chunkolási szignatúra
+        self.excluded: Dict[str, str] = {}  # kizárt (elavult) fájl -> az újabb változat neve
+        self.load()
+
+    def load(self):
+        """Manifest betöltése lemezről (hibás fájl esetén üres manifest)"""
+        self.entries = {}
+        self.settings = {}
+        self.excluded = {}
+        if not self.manifest_path.exists():
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            self.settings = data.get('settings', {})
+            self.excluded = data.get('excluded', {})
+
+            for name, entry in data.get('files', {}).items():
+                self.entries[name] = ManifestEntry(**entry)
+        except Exception as e:
+            print(f"⚠️ Manifest betöltési hiba, újraindexelés szükséges: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Manifest atomikus mentése (ideiglenes fájl + csere)"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'updated_at': datetime.now().isoformat(),
+            'settings': self.settings,
+            'excluded': dict(sorted(self.excluded.items())),
+            'files': {name: asdict(entry) for name, entry in sorted(self.entries.items())}
+        }
+
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def invalidate_settings(self):
+        """A tárolt index beállítások érvénytelenítése - a következő szinkron mindent újrachunkol"""
+        self.settings = {key: "" for key in self.settings} or {'index_signature': ""}
+
+    def is_empty(self) -> bool:
+        return not self.entries
+
+    def has_pending_changes(self, pdf_files: List[Path]) -> bool:
+        """
+        Olcsó, csak stat alapú és a manifestet nem módosító ellenőrzés.
+
+        Igazat ad, ha bármely fájl új, törölt vagy a mérete / mtime-ja eltér;
+        ilyenkor a pontos (hash alapú) diff-et a szinkron számolja ki.
+        """
+        entries = dict(self.entries)
+        seen = set()
+
+        for pdf_file in pdf_files:
+            name = pdf_file.name
+            if name in self.excluded:
+                continue
+            seen.add(name)
+            entry = entries.get(name)
+            if entry is None:
+                return True
+            stat = pdf_file.stat()
+            if entry.size != stat.st_size or entry.mtime != stat.st_mtime:
+                return True
+
+        return any(name not in seen for name in entries)
+
+    def diff(self, pdf_files: List[Path]) -> ManifestDiff:
+        """
+        PDF fájlok összevetése a manifesttel.
+
+        Változatlan méret és mtime esetén nem számolunk hash-t; ha csak az
+        mtime változott, de a tartalom nem, a bejegyzést frissítjük és
+        változatlannak tekintjük. A kizárt (újabb változattal felváltott)
+        fájlok nem kerülnek az indexbe.
+        """
+        diff = ManifestDiff()
+        seen = set()
+
+        for pdf_file in pdf_files:
+            name = pdf_file.name
+            if name in self.excluded:
+                continue  # elavult változat: a bejegyzése (ha van) törlendő
+            seen.add(name)
+            stat = pdf_file.stat()
+            entry = self.entries.get(name)
+
+            if entry and entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+                diff.unchanged.append(name)
+                continue
+
+            content_hash = compute_file_hash(pdf_file)
+
+            if entry is None:
+                diff.added.append(pdf_file)
+                diff.hashes[name] = content_hash
+            elif entry.content_hash == content_hash:
+                # Csak a metaadat változott (pl. touch) - nincs újrabeágyazás
+                entry.size = stat.st_size
+                entry.mtime = stat.st_mtime
+                entry.path = str(pdf_file)
+                diff.touched += 1
+                diff.unchanged.append(name)
+            else:
+                diff.modified.append(pdf_file)
+                diff.hashes[name] = content_hash
+
+        diff.deleted = [name for name in self.entries if name not in seen]
+        return diff
+
+    def record(self, pdf_file: Path, content_hash: str, chunk_ids: List[str],
+               total_chunks: Optional[int] = None, duplicate_of: Optional[List[str]] = None):
+        """Sikeresen beindexelt fájl rögzítése"""
+        stat = pdf_file.stat()
+        self.entries[pdf_file.name] = ManifestEntry(
+            file_name=pdf_file.name,
+            path=str(pdf_file),
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            content_hash=content_hash,
+            chunk_ids=list(chunk_ids),
+            ingested_at=datetime.now().isoformat(),
+            total_chunks=total_chunks if total_chunks is not None else len(chunk_ids),
+            duplicate_of=sorted(set(duplicate_of or []))
+        )
+
+    def exclude(self, file_name: str, superseded_by: str):
+        """Fájl kizárása az indexből (a következő szinkron törli a chunkjait)"""
+        self.excluded[file_name] = superseded_by
+
+    def remove(self, file_name: str) -> Optional[ManifestEntry]:
+        """Fájl eltávolítása a manifestből, visszaadja a régi bejegyzést"""
+        return self.entries.pop(file_name, None)
+
+    def chunk_ids_for(self, file_name: str) -> List[str]:
+        entry = self.entries.get(file_name)
+        return list(entry.chunk_ids) if entry else []
+
+    def dependents_of(self, chunk_ids: Iterable[str]) -> List[str]:
+        """Azok a fájlok, amelyek eldobott chunkjai a megadott chunkokra hivatkoznak"""
+        chunk_ids = set(chunk_ids)
+        return [name for name, entry in self.entries.items()
+                if chunk_ids.intersection(entry.duplicate_of)]
+
+    def stats(self) -> Dict[str, Any]:
+        chunks = sum(len(e.chunk_ids) for e in self.entries.values())
+        total = sum(max(e.total_chunks, len(e.chunk_ids)) for e in self.entries.values())
+        return {
+            'files': len(self.entries),
+            'chunks': chunks,
+            'bytes': sum(e.size for e in self.entries.values()),
+            'deduplicated_chunks': total - chunks,
+            'dedup_ratio': round((total - chunks) / total, 3) if total else 0.0
+        }
@@ -0,0 +1,68 @@
+# =============================================================================
+# rag_pdf/local_embeddings.py
+# =============================================================================
+"""
+Lokális (hálózat nélküli) embedding provider.
+
+Hashing vectorizer: a tokenek és szó-bigramok előjeles hash-e egy fix
+dimenziójú vektorba kerül, szublineáris tf súlyozással és L2
+normalizálással. Nincs illesztendő modell és nincs állapot, így
+ugyanaz a szöveg mindig ugyanazt a vektort adja, a lekérdezés
+beágyazása pedig szub-milliszekundumos. Air-gapped vagy degradált
+(OpenAI nélküli) üzemmódhoz.
+"""
+import math
+import hashlib
+from collections import Counter
+from typing import List, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .bm25_index import tokenize
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Előjeles feature hashing embedding.
+
+    Args:
+        dim: Vektor dimenzió
+        ngram_range: (min, max) szó n-gram hossz
+        sublinear_tf: 1 + log(tf) súlyozás
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Sequence[int] = (1, 2), sublinear_tf: bool = True):
+        self.dim = dim
+        self.ngram_range = (int(ngram_range[0]), int(ngram_range[1]))
+        self.sublinear_tf = sublinear_tf
+
+    @property
+    def model_name(self) -> str:
+        """Modell azonosító (index szignatúrához): a paraméterek változása új indexet jelent"""
+        low, high = self.ngram_range
+        return f"hashing-{self.dim}-ng{low}{high}{'-sub' if self.sublinear_tf else ''}"
+
+    def _features(self, text: str) -> Counter:
+        tokens = tokenize(text)
+        low, high = self.ngram_range
+        features = Counter()
+        for n in range(low, high + 1):
+            for i in range(len(tokens) - n + 1):
+                features[" ".join(tokens[i:i + n])] += 1
+        return features
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in self._features(text).items():
+            value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+            weight = 1.0 + math.log(count) if self.sublinear_tf else float(count)
+            vector[value % self.dim] += weight if (value >> 63) & 1 else -weight
+        norm = float(np.linalg.norm(vector))
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
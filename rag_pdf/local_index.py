@@ -0,0 +1,552 @@
+# =============================================================================
+# rag_pdf/local_index.py
+# =============================================================================
+"""
+NumPy memory-mapped lokális vector index (Chroma alternatíva).
+
+Fájlok az index könyvtárban:
+    vectors.f32     - normalizált float32 mátrix (sorfolytonos, append-only)
+    records.jsonl   - sidecar metaadat tábla (id, szöveg, metadata) soronként
+    offsets.i64     - sor -> records.jsonl bájt offszet
+    index_meta.json - dimenzió, sorok száma, törölt sorok (atomikusan írva)
+    vectors.i8      - (opcionális) int8 kvantált mátrix
+    scales.f32      - (opcionális) soronkénti kvantálási skála
+
+Az olvasók a mátrixot read-only memmap-ként nyitják meg, így több
+folyamat ugyanazokat az OS page cache lapokat használja, a betöltés pedig
+csak a meta fájl olvasásából áll. A keresés pontos top-k: vektorizált
+skaláris szorzat + argpartition.
+
+int8 kvantálás esetén (soronkénti szimmetrikus skála) a teljes mátrix
+pásztázása az int8 másolaton történik (negyed akkora rezidens memória),
+a jelöltek (k * rescore_factor) végső sorrendje pedig a float32 sorokból
+újraszámolt pontos pontszám szerint alakul.
+
+A törlés logikai (tombstone); a `compact()` írja újra az élő sorokat és
+szabadítja fel a törölt sorok helyét.
+
+Minden keresés egy zár alatt átvett, változatlan pillanatképen fut
+(memmapek, offszetek, törölt sorok, nyitott rekord fájl), így egy közben
+futó írás vagy tömörítés nem látszik félkészen. A meta fájl változását
+(más folyamat írása) a keresések észreveszik és újratöltenek; a
+`generation` számláló tömörítéskor (sorszámok átírásakor) nő.
+"""
+import os
+import json
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Callable, FrozenSet
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+VECTORS_FILENAME = "vectors.f32"
+RECORDS_FILENAME = "records.jsonl"
+OFFSETS_FILENAME = "offsets.i64"
+META_FILENAME = "index_meta.json"
+QUANTIZED_FILENAME = "vectors.i8"
+SCALES_FILENAME = "scales.f32"
+
+# Kvantált pásztázás blokkmérete (sor) - ennyi sor kerül egyszerre float32-be
+SCAN_BLOCK_ROWS = 4096
+
+
+class _RecordReader:
+    """Egy rekord fájl verzió nyitott olvasója (tömörítés utáni csere után is a régi tartalom)"""
+
+    def __init__(self, path: Path):
+        self._file = open(path, 'rb') if path.exists() else None
+        self._lock = threading.Lock()
+
+    def read(self, offset: int) -> Dict[str, Any]:
+        with self._lock:
+            self._file.seek(offset)
+            return json.loads(self._file.readline().decode('utf-8'))
+
+    def __del__(self):
+        if getattr(self, '_file', None) is not None:
+            self._file.close()
+
+
+@dataclass(frozen=True)
+class _IndexSnapshot:
+    """Egy keresés által használt, változatlan index állapot"""
+    rows: int
+    dim: Optional[int]
+    vectors: Optional[np.ndarray]
+    offsets: Optional[np.ndarray]
+    codes: Optional[np.ndarray]
+    scales: Optional[np.ndarray]
+    deleted_rows: FrozenSet[int]
+    records: _RecordReader
+
+    def count(self) -> int:
+        return self.rows - len(self.deleted_rows)
+
+    def read_record(self, row: int) -> Dict[str, Any]:
+        return self.records.read(int(self.offsets[row]))
+
+
+class NumpyVectorStore(VectorStore):
+    """Memory-mapped float32 mátrix alapú, pontos (exact) top-k vector store"""
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings,
+                 quantization: str = "none", rescore_factor: int = 4):
+        self.persist_directory = Path(persist_directory)
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        self._embedding = embedding_function
+        self._write_lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._meta_seen = None
+        self.generation = 0
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor)
+        self.quantized_rows = 0
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+
+        self.dim: Optional[int] = None
+        self.rows = 0
+        self.deleted_rows: set = set()
+        self._vectors: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._id_to_row: Optional[Dict[str, int]] = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Betöltés / mentés
+    # ------------------------------------------------------------------
+    def _path(self, filename: str) -> Path:
+        return self.persist_directory / filename
+
+    def _load(self):
+        """Meta betöltése és memmap megnyitása (a fájlok nem kerülnek a memóriába)"""
+        meta_path = self._path(META_FILENAME)
+        self._meta_seen = self._meta_signature()
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self.dim = meta.get('dim')
+            self.rows = meta.get('rows', 0)
+            self.deleted_rows = set(meta.get('deleted_rows', []))
+            self.quantized_rows = meta.get('quantized_rows', 0)
+            self.generation = meta.get('generation', 0)
+        if self.quantization == "int8" and self.quantized_rows != self.rows:
+            self._build_quantized()
+        self._open_arrays()
+
+    def _open_arrays(self):
+        if self.rows and self.dim:
+            self._vectors = np.memmap(self._path(VECTORS_FILENAME), dtype=np.float32,
+                                      mode='r', shape=(self.rows, self.dim))
+            self._offsets = np.memmap(self._path(OFFSETS_FILENAME), dtype=np.int64,
+                                      mode='r', shape=(self.rows,))
+        else:
+            self._vectors = None
+            self._offsets = None
+
+        if self.quantization == "int8" and self.rows and self.dim:
+            self._codes = np.memmap(self._path(QUANTIZED_FILENAME), dtype=np.int8,
+                                    mode='r', shape=(self.rows, self.dim))
+            self._scales = np.memmap(self._path(SCALES_FILENAME), dtype=np.float32,
+                                     mode='r', shape=(self.rows,))
+        else:
+            self._codes = None
+            self._scales = None
+        self._publish()
+
+    def _publish(self):
+        """Új pillanatkép közzététele (a futó keresések a régit használják tovább)"""
+        snapshot = _IndexSnapshot(
+            rows=self.rows, dim=self.dim, vectors=self._vectors, offsets=self._offsets,
+            codes=self._codes, scales=self._scales, deleted_rows=frozenset(self.deleted_rows),
+            records=_RecordReader(self._path(RECORDS_FILENAME))
+        )
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+
+    def _meta_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self._path(META_FILENAME))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _reload_if_changed(self):
+        """Más folyamat által írt meta (hozzáadás, törlés, tömörítés) esetén újratöltés"""
+        if self._meta_signature() == self._meta_seen:
+            return
+        with self._write_lock:
+            if self._meta_signature() != self._meta_seen:
+                self._id_to_row = None
+                self._load()
+
+    def snapshot(self) -> _IndexSnapshot:
+        """Aktuális (szükség esetén újratöltött) pillanatkép a kereséshez"""
+        self._reload_if_changed()
+        with self._snapshot_lock:
+            return self._snapshot
+
+    def _build_quantized(self):
+        """int8 másolat (újra)építése a float32 mátrixból (pl. meglévő index átállításakor)"""
+        with open(self._path(QUANTIZED_FILENAME), 'wb') as codes_file, \
+                open(self._path(SCALES_FILENAME), 'wb') as scales_file:
+            if self.rows and self.dim:
+                vectors = np.memmap(self._path(VECTORS_FILENAME), dtype=np.float32,
+                                    mode='r', shape=(self.rows, self.dim))
+                for start in range(0, self.rows, SCAN_BLOCK_ROWS):
+                    codes, scales = quantize_rows(np.asarray(vectors[start:start + SCAN_BLOCK_ROWS]))
+                    codes_file.write(codes.tobytes())
+                    scales_file.write(scales.tobytes())
+        self.quantized_rows = self.rows
+        self._save_meta()
+
+    def _save_meta(self):
+        meta = {
+            'dim': self.dim,
+            'rows': self.rows,
+            'deleted_rows': sorted(self.deleted_rows),
+            'quantized_rows': self.quantized_rows if self.quantization == "int8" else 0,
+            'generation': self.generation
+        }
+        tmp_path = self._path(META_FILENAME + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path(META_FILENAME))
+        self._meta_seen = self._meta_signature()
+
+    def reload(self):
+        """Más folyamat által írt változások betöltése"""
+        with self._write_lock:
+            self._id_to_row = None
+            self._load()
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self._embedding
+
+    # ------------------------------------------------------------------
+    # Írás
+    # ------------------------------------------------------------------
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [uuid.uuid4().hex for _ in texts]
+        vectors = np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        return self.add_vectors(vectors, texts, metadatas, ids)
+
+    def add_vectors(self, vectors: np.ndarray, texts: List[str],
+                    metadatas: List[dict], ids: List[str]) -> List[str]:
+        """Előre kiszámolt vektorok hozzáadása (normalizálva, append-only)"""
+        vectors = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+        with self._write_lock:
+            self._reload_if_changed()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimenzió eltér: {vectors.shape[1]} != {self.dim}")
+
+            # Félbeszakadt korábbi írás maradékának levágása
+            _truncate_file(self._path(VECTORS_FILENAME), self.rows * self.dim * 4)
+            _truncate_file(self._path(OFFSETS_FILENAME), self.rows * 8)
+            _truncate_file(self._path(RECORDS_FILENAME), self._records_end())
+            if self.quantization == "int8":
+                _truncate_file(self._path(QUANTIZED_FILENAME), self.rows * self.dim)
+                _truncate_file(self._path(SCALES_FILENAME), self.rows * 4)
+
+            # Azonos ID újraírása: a régi sor törlése
+            id_to_row = self._get_id_to_row()
+            for chunk_id in ids:
+                if chunk_id in id_to_row:
+                    self.deleted_rows.add(id_to_row[chunk_id])
+
+            offsets = []
+            records_path = self._path(RECORDS_FILENAME)
+            with open(records_path, 'ab') as f:
+                position = f.tell()
+                for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                    line = (json.dumps({'id': chunk_id, 'text': text, 'metadata': metadata},
+                                       ensure_ascii=False) + "\n").encode('utf-8')
+                    offsets.append(position)
+                    f.write(line)
+                    position += len(line)
+
+            with open(self._path(VECTORS_FILENAME), 'ab') as f:
+                f.write(np.ascontiguousarray(vectors).tobytes())
+            with open(self._path(OFFSETS_FILENAME), 'ab') as f:
+                f.write(np.asarray(offsets, dtype=np.int64).tobytes())
+            if self.quantization == "int8":
+                codes, scales = quantize_rows(vectors)
+                with open(self._path(QUANTIZED_FILENAME), 'ab') as f:
+                    f.write(codes.tobytes())
+                with open(self._path(SCALES_FILENAME), 'ab') as f:
+                    f.write(scales.tobytes())
+
+            for i, chunk_id in enumerate(ids):
+                id_to_row[chunk_id] = self.rows + i
+            self.rows += len(ids)
+            if self.quantization == "int8":
+                self.quantized_rows = self.rows
+            self._save_meta()
+            self._open_arrays()
+
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Sorok logikai törlése (tombstone) - a fizikai helyet a tömörítés szabadítja fel"""
+        if not ids:
+            return False
+        with self._write_lock:
+            self._reload_if_changed()
+            id_to_row = self._get_id_to_row()
+            for chunk_id in ids:
+                row = id_to_row.pop(chunk_id, None)
+                if row is not None:
+                    self.deleted_rows.add(row)
+            self._save_meta()
+            self._publish()
+        return True
+
+    def _data_filenames(self) -> List[str]:
+        filenames = [VECTORS_FILENAME, OFFSETS_FILENAME, RECORDS_FILENAME]
+        if self.quantization == "int8":
+            filenames += [QUANTIZED_FILENAME, SCALES_FILENAME]
+        return filenames
+
+    def disk_bytes(self) -> int:
+        """Az index fájlok mérete bájtban"""
+        paths = [self._path(name) for name in self._data_filenames() + [META_FILENAME]]
+        return sum(path.stat().st_size for path in paths if path.exists())
+
+    def compact(self) -> int:
+        """
+        Törölt (tombstone) sorok fizikai eltávolítása: az élő sorok új fájlokba
+        íródnak, majd atomikus cserével felváltják a régieket.
+
+        Returns:
+            int: Felszabadított bájtok
+        """
+        with self._write_lock:
+            self._reload_if_changed()
+            if not self.deleted_rows:
+                return 0
+            before = self.disk_bytes()
+            live = np.asarray([row for row in range(self.rows) if row not in self.deleted_rows],
+                              dtype=np.int64)
+            tmp_paths = {name: self._path(name + '.compact') for name in self._data_filenames()}
+
+            offsets = []
+            with open(self._path(RECORDS_FILENAME), 'rb') as source, \
+                    open(tmp_paths[RECORDS_FILENAME], 'wb') as target:
+                position = 0
+                for row, line in enumerate(source):
+                    if row >= self.rows:
+                        break
+                    if row in self.deleted_rows:
+                        continue
+                    offsets.append(position)
+                    target.write(line)
+                    position += len(line)
+            with open(tmp_paths[OFFSETS_FILENAME], 'wb') as f:
+                f.write(np.asarray(offsets, dtype=np.int64).tobytes())
+
+            arrays = [(VECTORS_FILENAME, self._vectors)]
+            if self.quantization == "int8":
+                arrays += [(QUANTIZED_FILENAME, self._codes), (SCALES_FILENAME, self._scales)]
+            for name, array in arrays:
+                with open(tmp_paths[name], 'wb') as f:
+                    for start in range(0, len(live), SCAN_BLOCK_ROWS):
+                        f.write(np.ascontiguousarray(array[live[start:start + SCAN_BLOCK_ROWS]]).tobytes())
+
+            for name, tmp_path in tmp_paths.items():
+                os.replace(tmp_path, self._path(name))
+            self.rows = len(live)
+            self.deleted_rows = set()
+            if self.quantization == "int8":
+                self.quantized_rows = self.rows
+            # A sorszámok megváltoztak: a többi folyamat újratölt
+            self.generation += 1
+            self._id_to_row = None
+            self._save_meta()
+            self._open_arrays()
+            return max(0, before - self.disk_bytes())
+
+    # ------------------------------------------------------------------
+    # Olvasás
+    # ------------------------------------------------------------------
+    def _records_end(self) -> int:
+        """Az utolsó érvényes rekord végének bájt pozíciója"""
+        if not self.rows or self._offsets is None:
+            return 0
+        with open(self._path(RECORDS_FILENAME), 'rb') as f:
+            f.seek(int(self._offsets[self.rows - 1]))
+            return f.tell() + len(f.readline())
+
+    def _get_id_to_row(self) -> Dict[str, int]:
+        """ID -> sor leképezés (lusta, csak írásnál / törlésnél kell)"""
+        if self._id_to_row is None:
+            self._id_to_row = {}
+            records_path = self._path(RECORDS_FILENAME)
+            if records_path.exists() and self.rows:
+                with open(records_path, 'r', encoding='utf-8') as f:
+                    for row, line in enumerate(f):
+                        if row >= self.rows:
+                            break
+                        if row not in self.deleted_rows:
+                            self._id_to_row[json.loads(line)['id']] = row
+        return self._id_to_row
+
+    def get_vectors(self, ids: List[str]) -> Dict[str, np.ndarray]:
+        """Tárolt (float32) vektorok ID szerint - újra embeddelés nélkül"""
+        self._reload_if_changed()
+        with self._write_lock:
+            # Az ID leképezés és a pillanatkép ugyanabból az állapotból
+            id_to_row = self._get_id_to_row()
+            snapshot = self._snapshot
+        if snapshot.vectors is None:
+            return {}
+        found = [(chunk_id, id_to_row[chunk_id]) for chunk_id in ids
+                 if id_to_row.get(chunk_id, snapshot.rows) < snapshot.rows]
+        if not found:
+            return {}
+        vectors = np.asarray(snapshot.vectors[[row for _, row in found]])
+        return {chunk_id: vector for (chunk_id, _), vector in zip(found, vectors)}
+
+    def count(self) -> int:
+        return self.snapshot().count()
+
+    def iter_records(self) -> Iterable[Tuple[int, Dict[str, Any]]]:
+        """Élő rekordok bejárása (sor, rekord) egy pillanatképen"""
+        snapshot = self.snapshot()
+        if snapshot.offsets is None:
+            return
+        for row in range(snapshot.rows):
+            if row not in snapshot.deleted_rows:
+                yield row, snapshot.read_record(row)
+
+    def _scan_scores(self, snapshot: _IndexSnapshot, queries: np.ndarray) -> np.ndarray:
+        """(lekérdezés x sor) pontszám mátrix - int8 módban közelítő, blokkonként számolva"""
+        if snapshot.codes is None:
+            return queries @ snapshot.vectors.T
+        scores = np.empty((len(queries), snapshot.rows), dtype=np.float32)
+        for start in range(0, snapshot.rows, SCAN_BLOCK_ROWS):
+            block = np.asarray(snapshot.codes[start:start + SCAN_BLOCK_ROWS], dtype=np.float32)
+            scores[:, start:start + len(block)] = (queries @ block.T) * snapshot.scales[start:start + len(block)]
+        return scores
+
+    @staticmethod
+    def _rescore(snapshot: _IndexSnapshot, query: np.ndarray, rows: np.ndarray,
+                 k: int) -> List[Tuple[int, float]]:
+        """Jelölt sorok pontos (float32) pontszáma és végső top-k"""
+        rows = np.sort(rows)  # szekvenciális memmap olvasás
+        exact = np.asarray(snapshot.vectors[rows]) @ query
+        order = np.argsort(-exact)[:k]
+        return [(int(rows[i]), float(exact[i])) for i in order]
+
+    def _top_k_rows_many(self, snapshot: _IndexSnapshot, query_vectors: np.ndarray,
+                         k: int) -> List[List[Tuple[int, float]]]:
+        """Több lekérdezés top-k sorai egyetlen mátrix szorzással"""
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        if snapshot.vectors is None or k <= 0 or not len(queries):
+            return [[] for _ in range(len(queries))]
+
+        queries = _normalize_rows(queries)
+        scores = self._scan_scores(snapshot, queries)
+        if snapshot.deleted_rows:
+            scores[:, list(snapshot.deleted_rows)] = -np.inf
+
+        k = min(k, snapshot.count())
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        # Kvantált módban bővebb jelölt halmaz, amit float32-vel pontozunk újra
+        quantized = snapshot.codes is not None
+        candidate_k = min(k * self.rescore_factor, snapshot.count()) if quantized else k
+        top = np.argpartition(-scores, candidate_k - 1, axis=1)[:, :candidate_k]
+        results = []
+        for query, query_scores, rows in zip(queries, scores, top):
+            if quantized:
+                results.append(self._rescore(snapshot, query, rows, k))
+                continue
+            rows = rows[np.argsort(-query_scores[rows])]
+            results.append([(int(row), float(query_scores[row])) for row in rows])
+        return results
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """A kereséskor teljes egészében pásztázott (rezidens) mátrix mérete bájtban"""
+        snapshot = self.snapshot()
+        float_bytes = snapshot.rows * (snapshot.dim or 0) * 4
+        if snapshot.codes is None:
+            return {'scan_bytes': float_bytes, 'float_bytes': float_bytes}
+        return {'scan_bytes': snapshot.rows * (snapshot.dim or 0) + snapshot.rows * 4,
+                'float_bytes': float_bytes}
+
+    def similarity_search_by_vectors_with_score(self, embeddings: List[List[float]],
+                                                k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """Batch keresés: lekérdezésenként (Document, pontszám) lista"""
+        snapshot = self.snapshot()
+        results = []
+        for rows in self._top_k_rows_many(snapshot, np.asarray(embeddings), k):
+            hits = []
+            for row, score in rows:
+                record = snapshot.read_record(row)
+                hits.append((Document(page_content=record['text'], metadata=record.get('metadata', {})), score))
+            results.append(hits)
+        return results
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float],
+                                               k: int = 4) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vectors_with_score([embedding], k)[0]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4,
+                                    **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4,
+                                     **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Koszinusz hasonlóság [-1, 1] -> [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings,
+                   metadatas: Optional[List[dict]] = None,
+                   persist_directory: str = "rag_data/numpy_index",
+                   ids: Optional[List[str]] = None, **kwargs: Any) -> "NumpyVectorStore":
+        store = cls(persist_directory=persist_directory, embedding_function=embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+
+def _truncate_file(path: Path, size: int):
+    if path.exists() and path.stat().st_size > size:
+        with open(path, 'r+b') as f:
+            f.truncate(size)
+
+
+def quantize_rows(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Soronkénti szimmetrikus int8 kvantálás: (kódok, skálák), x ~ kód * skála"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return np.ascontiguousarray(codes), scales.astype(np.float32)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
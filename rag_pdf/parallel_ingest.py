@@ -0,0 +1,149 @@
+# =============================================================================
+# rag_pdf/parallel_ingest.py
+# =============================================================================
+"""
+Párhuzamos PDF feldolgozás és chunkolás process pool segítségével.
+
+A PyPDF parse és a RecursiveCharacterTextSplitter CPU-igényes, ezért a
+fájlokat worker folyamatokra osztjuk. Egyszerre csak korlátozott számú
+feladat van úton (bounded memory), az elkészült fájlok chunkjai pedig
+azonnal továbbadhatók a beágyazásnak.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Tuple, Optional
+
+from .config import RAG_CONFIG
+
+
+def default_splitter_options() -> Dict[str, Any]:
+    """Chunkolási beállítások a RAG_CONFIG["chunking"] és ["text_cache"] alapján"""
+    text_cache_config = RAG_CONFIG["text_cache"]
+    return {
+        **RAG_CONFIG["chunking"],
+        "text_cache_dir": text_cache_config["dir"] if text_cache_config["enabled"] else None
+    }
+
+
+@dataclass
+class ParsedPDF:
+    """Egy feldolgozott PDF eredménye (worker folyamatból visszaküldve)"""
+    path: str
+    page_count: int = 0
+    chunks: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)  # (szöveg, metadata)
+    error: Optional[str] = None
+    from_text_cache: bool = False  # a szöveg a kinyert szöveg cache-ből jött (nem volt PyPDF parse)
+
+    @property
+    def file_name(self) -> str:
+        return Path(self.path).name
+
+
+def parse_and_chunk_pdf(pdf_path: str, metadata: Dict[str, Any],
+                        splitter_options: Dict[str, Any],
+                        content_hash: Optional[str] = None) -> ParsedPDF:
+    """
+    Egy PDF betöltése és chunkolása (worker folyamatban fut).
+
+    Args:
+        pdf_path: PDF fájl útvonala
+        metadata: Minden oldalhoz hozzáadandó metadata
+        splitter_options: chunk_size, chunk_overlap, separators, strip_empty_lines,
+            text_cache_dir (opcionális)
+        content_hash: PDF tartalom hash - a kinyert szöveg cache kulcsa
+    """
+    try:
+        from langchain.schema import Document
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        from .text_cache import ExtractedTextCache
+
+        text_cache = None
+        if splitter_options.get("text_cache_dir") and content_hash:
+            text_cache = ExtractedTextCache(splitter_options["text_cache_dir"])
+
+        pages = text_cache.get(content_hash) if text_cache else None
+        from_text_cache = pages is not None
+        if pages is None:
+            from langchain_community.document_loaders import PyPDFLoader
+
+            pages = [
+                (doc.page_content, doc.metadata.get('page', i))
+                for i, doc in enumerate(PyPDFLoader(pdf_path).load())
+            ]
+            if text_cache:
+                text_cache.put(content_hash, pages)
+
+        documents = [
+            Document(page_content=text, metadata={'source': pdf_path, 'page': page, **metadata})
+            for text, page in pages
+        ]
+
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=splitter_options["chunk_size"],
+            chunk_overlap=splitter_options["chunk_overlap"],
+            length_function=len,
+            separators=splitter_options["separators"]
+        )
+        split_documents = text_splitter.split_documents(documents)
+
+        chunks = []
+        for doc in split_documents:
+            text = doc.page_content
+            if splitter_options.get("strip_empty_lines"):
+                text = "\n".join(line for line in text.split("\n") if line.strip())
+            chunks.append((text, doc.metadata))
+
+        return ParsedPDF(path=pdf_path, page_count=len(documents), chunks=chunks,
+                         from_text_cache=from_text_cache)
+
+    except Exception as e:
+        return ParsedPDF(path=pdf_path, error=str(e))
+
+
+def iter_parsed_pdfs(tasks: List[Tuple[Path, Dict[str, Any]]],
+                     splitter_options: Dict[str, Any],
+                     workers: Optional[int] = None) -> Iterator[ParsedPDF]:
+    """
+    PDF-ek feldolgozása, az eredmények befejezési sorrendben érkeznek.
+
+    Args:
+        tasks: (PDF útvonal, metadata) vagy (PDF útvonal, metadata, tartalom hash) elemek
+        splitter_options: parse_and_chunk_pdf beállításai
+        workers: worker folyamatok száma (alapértelmezés: RAG_CONFIG["ingest"]["workers"])
+    """
+    ingest_config = RAG_CONFIG["ingest"]
+    workers = workers if workers is not None else ingest_config["workers"]
+
+    # Kevés fájlnál / 1 workernél nem éri meg a process pool indítása
+    if workers <= 1 or len(tasks) <= 1:
+        for pdf_path, metadata, *content_hash in tasks:
+            yield parse_and_chunk_pdf(str(pdf_path), metadata, splitter_options, *content_hash)
+        return
+
+    max_inflight = max(1, workers * ingest_config["max_inflight_per_worker"])
+    # Streamlit alatt több szál fut, ezért fork helyett spawn a biztonságos
+    mp_context = multiprocessing.get_context(ingest_config["start_method"])
+    pending_tasks = iter(tasks)
+    inflight = set()
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        def submit_next() -> bool:
+            task = next(pending_tasks, None)
+            if task is None:
+                return False
+            pdf_path, metadata, *content_hash = task
+            inflight.add(executor.submit(parse_and_chunk_pdf, str(pdf_path), metadata,
+                                         splitter_options, *content_hash))
+            return True
+
+        while len(inflight) < max_inflight and submit_next():
+            pass
+
+        while inflight:
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                inflight.discard(future)
+                submit_next()
+                yield future.result()
@@ -5,28 +5,31 @@
 PDF feldolgozás és text chunking LangChain segítségével
 """
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from pathlib import Path
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 import streamlit as st
 from .config import RAG_CONFIG
+from .parallel_ingest import iter_parsed_pdfs, default_splitter_options
+from .ingest_manifest import compute_file_hash
 
 class PDFProcessor:
     """PDF fájlok feldolgozása és chunkolása"""
     
     def __init__(self):
         self.pdf_dir = Path(RAG_CONFIG["paths"]["pdf_dir"])
-        self.chunk_size = RAG_CONFIG["embedding"]["chunk_size"]
-        self.chunk_overlap = RAG_CONFIG["embedding"]["chunk_overlap"]
+        self.chunking = RAG_CONFIG["chunking"]
+        self.chunk_size = self.chunking["chunk_size"]
+        self.chunk_overlap = self.chunking["chunk_overlap"]
         
         # Text splitter inicializálása
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=self.chunk_size,
             chunk_overlap=self.chunk_overlap,
             length_function=len,
-            separators=["\n\n", "\n", " ", ""]
+            separators=self.chunking["separators"]
         )
     
     def load_all_pdfs(self) -> List[Document]:
@@ -74,17 +77,63 @@ class PDFProcessor:
         st.info(f"Összesen {len(chunks)} chunk létrehozva")
         
         # Chunk-ok tisztítása
-        for chunk in chunks:
-            # Üres sorok eltávolítása
-            chunk.page_content = "\n".join(
-                line for line in chunk.page_content.split("\n") 
-                if line.strip()
-            )
+        if self.chunking["strip_empty_lines"]:
+            for chunk in chunks:
+                # Üres sorok eltávolítása
+                chunk.page_content = "\n".join(
+                    line for line in chunk.page_content.split("\n") 
+                    if line.strip()
+                )
         
         return chunks
     
+    def iter_chunk_batches(self, batch_size: int = None) -> Iterator[List[Document]]:
+        """
+        Párhuzamos feldolgozás: a PDF-ek parse-olása és chunkolása process poolban fut,
+        a chunkok batch-enként érkeznek, amint az adott fájl elkészült.
+        """
+        batch_size = batch_size or RAG_CONFIG["ingest"]["batch_size"]
+        
+        if not self.pdf_dir.exists():
+            st.warning(f"PDF mappa nem található: {self.pdf_dir}")
+            return
+        
+        pdf_files = list(self.pdf_dir.glob("*.pdf"))
+        if not pdf_files:
+            st.warning("Nincsenek PDF fájlok a mappában")
+            return
+        
+        tasks = [
+            (pdf_file, {"source": pdf_file.name, "file_path": str(pdf_file)}, compute_file_hash(pdf_file))
+            for pdf_file in pdf_files
+        ]
+        splitter_options = default_splitter_options()
+        
+        batch = []
+        for parsed in iter_parsed_pdfs(tasks, splitter_options):
+            if parsed.error:
+                st.error(f"Hiba a PDF feldolgozásnál ({parsed.file_name}): {parsed.error}")
+                continue
+            
+            batch.extend(
+                Document(page_content=text, metadata=metadata)
+                for text, metadata in parsed.chunks
+            )
+            while len(batch) >= batch_size:
+                yield batch[:batch_size]
+                batch = batch[batch_size:]
+        
+        if batch:
+            yield batch
+    
     def process_pdfs(self) -> List[Document]:
         """Teljes PDF feldolgozási folyamat"""
+        # Párhuzamos ingest mód (RAG_CONFIG["ingest"]["workers"] > 1)
+        if RAG_CONFIG["ingest"]["workers"] > 1:
+            chunks = [chunk for batch in self.iter_chunk_batches() for chunk in batch]
+            st.info(f"Összesen {len(chunks)} chunk létrehozva")
+            return chunks
+        
         # PDF-ek betöltése
         documents = self.load_all_pdfs()
         
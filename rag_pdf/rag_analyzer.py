@@ -5,22 +5,52 @@
 RAG alapú PDF elemzés 
 """
 import os
+import re
+import time
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain.prompts import PromptTemplate
-from langchain.schema.runnable import RunnablePassthrough
+from langchain.schema.runnable import RunnablePassthrough, RunnableLambda
+from langchain.schema import Document
 from langchain.schema.output_parser import StrOutputParser
 from langchain_community.vectorstores import Chroma
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
 #from langchain_chroma import Chroma
 import json
 from pathlib import Path
 
+from .config import RAG_CONFIG
+from .translation import (
+    translate_patient_data, get_translator, collect_phrases, apply_translations
+)
+from .local_index import NumpyVectorStore
+from .sharded_store import ShardedVectorStore
+from .bm25_index import BM25Index, BM25_FILENAME, reciprocal_rank_fusion
+from .dedup import NearDuplicateIndex, DEDUP_FILENAME
+from .context_packer import ContextPacker
+from .parallel_ingest import iter_parsed_pdfs, default_splitter_options
+from .catalog import IndexCatalog, CatalogSource, CATALOG_FILENAME, read_catalog
+from .answer_cache import AnswerCache, normalize_profile, profile_text, profile_key
+from .embedding_cache import EmbeddingCache, CachedEmbeddings
+from .rw_lock import ReadWriteLock
+from .compaction import find_superseded, directory_bytes, vacuum_sqlite, CHROMA_SQLITE_FILENAME
+from .local_embeddings import HashingEmbeddings
+from .ingest_manifest import (
+    IngestManifest, ManifestEntry, MANIFEST_FILENAME, compute_file_hash, make_chunk_id,
+    manifest_signature, chunking_signature
+)
 
 
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
 # Streamlitre kell
 try:
     import pysqlite3
@@ -31,68 +61,181 @@ except ImportError:
 
 
 
-# Fordítási segédfüggvények
-def translate_text(text: str, openai_api_key: str) -> str:
-    if not text:
-        return ""
-    llm = ChatOpenAI(openai_api_key=openai_api_key, temperature=0.3)
-    return llm.predict(f"Translate this Hungarian medical phrase to English: {text}").strip()
+def get_openai_api_key() -> Optional[str]:
+    """OpenAI API kulcs környezeti változóból vagy Streamlit secrets-ből (None, ha nincs)"""
+    try:
+        return os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY")
+    except Exception:
+        return None
+
+def embedding_provider() -> str:
+    """Az aktív embedding provider: "openai" vagy "hashing" (csak explicit beállításra vagy "auto" módban)"""
+    provider = RAG_CONFIG["embedding"]["provider"]
+    if provider == "auto":
+        return "openai" if get_openai_api_key() else "hashing"
+    return provider
+
+def create_local_embeddings() -> HashingEmbeddings:
+    hashing_config = RAG_CONFIG["embedding"]["hashing"]
+    return HashingEmbeddings(dim=hashing_config["dim"], ngram_range=hashing_config["ngram_range"])
 
-def translate_list(items: List[str], openai_api_key: str) -> List[str]:
-    return [translate_text(item, openai_api_key) for item in items if item]
+def embedding_model_name(provider: Optional[str] = None) -> str:
+    """Az embedding modell azonosítója (index szignatúra, embedding cache kulcs)"""
+    if (provider or embedding_provider()) == "hashing":
+        return create_local_embeddings().model_name
+    return RAG_CONFIG["embedding"]["model"]
+
+def index_directory(vector_store_path: str) -> Path:
+    """Az aktív backend index könyvtára (itt van a manifest is)"""
+    sharded = RAG_CONFIG["sharding"]["enabled"]
+    if RAG_CONFIG["chroma"]["backend"] == "numpy":
+        directory = Path(vector_store_path) / ("numpy_index_sharded" if sharded else "numpy_index")
+    else:
+        directory = Path(vector_store_path) / "sharded" if sharded else Path(vector_store_path)
+    # A lokális embeddinggel épített index külön él, így nem írja felül az OpenAI indexet
+    return directory / "local_embeddings" if embedding_provider() == "hashing" else directory
+
+# A válasz 4 szekciója a prompt sorszámozása szerint
+RAG_SECTION_KEYS = ["patient_condition", "symptom_management", "recommended_specialist", "additional_info"]
+SECTION_HEADER_PATTERN = re.compile(r"(?m)^\s*([1-4])\.\s*\*\*")
+
+
+def parse_sections_progressive(text: str, finished: bool = False) -> Dict[str, Any]:
+    """
+    Részleges (streamelt) válasz szekciókra bontása.
+    
+    Egy szekció akkor kész, ha a következő szekció fejléce már megérkezett
+    (vagy a stream véget ért).
+    
+    Returns:
+        Dict: {'sections': kulcs -> eddigi szöveg, 'completed': kész kulcsok, 'current': aktuális kulcs}
+    """
+    headers = []
+    for match in SECTION_HEADER_PATTERN.finditer(text or ""):
+        index = int(match.group(1)) - 1
+        if not headers or index > headers[-1][0]:
+            headers.append((index, match.start()))
+    
+    sections, completed = {}, []
+    for position, (index, start) in enumerate(headers):
+        end = headers[position + 1][1] if position + 1 < len(headers) else len(text)
+        key = RAG_SECTION_KEYS[index]
+        sections[key] = text[start:end].strip()
+        if position + 1 < len(headers) or finished:
+            completed.append(key)
+    
+    current = RAG_SECTION_KEYS[headers[-1][0]] if headers and not finished else None
+    return {'sections': sections, 'completed': completed, 'current': current}
 
-def translate_patient_data(patient_data: Dict[str, Any], openai_api_key: str) -> Dict[str, Any]:
-    translated = patient_data.copy()
-    translated['symptoms'] = translate_list(patient_data.get('symptoms', []), openai_api_key)
-    translated['diagnosis'] = translate_text(patient_data.get('diagnosis', ''), openai_api_key)
-    translated['existing_conditions'] = translate_list(patient_data.get('existing_conditions', []), openai_api_key)
-    translated['medications'] = translate_list(patient_data.get('medications', []), openai_api_key)
-    translated['gender'] = translate_list(patient_data.get('gender', []), openai_api_key)
-    translated['duration'] = translate_list(patient_data.get('duration', []), openai_api_key)
-    translated['severity'] = translate_list(patient_data.get('severity', []), openai_api_key)
-    return translated
+def load_index_catalog(vector_store_path: str = "rag_pdf/vectorstore") -> Optional[Dict[str, Any]]:
+    """Index katalógus olvasása analyzer (és OpenAI kulcs) nélkül - pl. az admin oldalhoz"""
+    return read_catalog(index_directory(vector_store_path) / CATALOG_FILENAME)
 
 ###
 
+async def _run_in_thread(func, *args):
+    """
+    Blokkoló függvény futtatása külön szálon, a Streamlit script kontextus átadásával.
+    
+    Az async elemzés szinkron klienseket használ szálakon: a megosztott
+    analyzer kliensei így nem kötődnek egy (rerunonként új) event loophoz.
+    """
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    
+    def runner():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+    
+    return await asyncio.get_running_loop().run_in_executor(None, runner)
+
+
 class RAGAnalyzer:
     """
     RAG alapú PDF elemzés JAVÍTOTT VERZIÓ
     """
     
-    def __init__(self, vector_store_path: str = "rag_pdf/vectorstore"):
+    def __init__(self, vector_store_path: str = "rag_pdf/vectorstore", sync: bool = True):
         self.vector_store_path = vector_store_path
+        # sync=False: a store megnyitása a PDF könyvtárral való szinkron nélkül (pl. tömörítési dry run)
+        self.sync_on_open = sync
+        self.pdf_directory = Path(RAG_CONFIG["paths"]["pdf_dir"])
+        self.backend = RAG_CONFIG["chroma"]["backend"]
+        self.embedding_provider = embedding_provider()
+        self.index_directory = index_directory(vector_store_path)
+        self.manifest = IngestManifest(self.index_directory / MANIFEST_FILENAME)
+        self.bm25_index = BM25Index(str(self.index_directory / BM25_FILENAME))
+        self.dedup_index = self._create_dedup_index()
+        self.catalog = IndexCatalog(
+            self.index_directory / CATALOG_FILENAME,
+            collection=RAG_CONFIG["chroma"]["collection_name"],
+            backend=self.backend
+        )
         self.embeddings = None
         self.vectorstore = None
         self.llm = None
         self.retrieval_chain = None
+        self.answer_chain = None
+        self.context_packer = None
+        self.answer_cache = self._create_answer_cache()
+        self._answer_cache_version = None
+        # Retrieval: olvasó oldal; szinkron / tömörítés: író oldal (megosztott analyzer)
+        self._rw_lock = ReadWriteLock()
+        self._last_refresh_check = time.monotonic()
         self._initialize_components()
     
     def _initialize_components(self):
         """Komponensek inicializálása JAVÍTOTT verzió"""
         try:
             # ✅ JAVÍTVA: OpenAI API key kezelés
-            api_key = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY")
-            if not api_key:
+            api_key = get_openai_api_key()
+            if not api_key and self.embedding_provider == "openai":
                 raise ValueError("OpenAI API key not found")
             
             # ✅ JAVÍTVA: Modern LangChain komponensek
-            self.embeddings = OpenAIEmbeddings(
-                openai_api_key=api_key,
-                model="text-embedding-3-small"  # Legújabb embedding model
-            )
+            self.embeddings = self._create_embeddings(api_key)
             
-            self.llm = ChatOpenAI(
-                openai_api_key=api_key,
-                model="gpt-4",
-                temperature=0.1,
-                max_tokens=3000
-            )
+            # Tartalom-címzett embedding cache: azonos szöveget csak egyszer ágyazunk be
+            cache_config = RAG_CONFIG["embedding"]["cache"]
+            if cache_config["enabled"]:
+                self.embeddings = CachedEmbeddings(
+                    self.embeddings,
+                    EmbeddingCache(
+                        cache_config["dir"], embedding_model_name(self.embedding_provider),
+                        max_entries=cache_config["max_entries"],
+                        flush_rows=cache_config["flush_rows"],
+                        min_block_rows=cache_config["min_block_rows"],
+                        max_open_blocks=cache_config["max_open_blocks"]
+                    )
+                )
+            
+            # API kulcs nélkül csak retrieval (offline mód), LLM válasz nélkül
+            if api_key:
+                self.llm = ChatOpenAI(
+                    openai_api_key=api_key,
+                    model="gpt-4",
+                    temperature=0.1,
+                    max_tokens=3000
+                )
+            else:
+                print("⚠️ Nincs OpenAI API kulcs: offline mód (lokális embedding, LLM válasz nélkül)")
+            
+            context_config = RAG_CONFIG["rag"]["context"]
+            if context_config["enabled"]:
+                self.context_packer = ContextPacker(
+                    self.embeddings,
+                    token_budget=context_config["token_budget"],
+                    lambda_mult=context_config["lambda_mult"],
+                    model="gpt-4",
+                    vector_lookup=self.stored_vectors
+                )
             
             # Vector store betöltése vagy létrehozása
             self._load_or_create_vectorstore()
             
             # ✅ JAVÍTVA: Modern LCEL (LangChain Expression Language) chain
-            self._create_retrieval_chain()
+            if self.llm:
+                self._create_retrieval_chain()
             
             print("✅ RAG Analyzer sikeresen inicializálva")
             
@@ -100,100 +243,541 @@ class RAGAnalyzer:
             print(f"❌ RAG Analyzer inicializálási hiba: {e}")
             raise
     
-    def _load_or_create_vectorstore(self):
-        """Vector store betöltése vagy létrehozása"""
-        try:
-            if os.path.exists(self.vector_store_path):
-                # ✅ JAVÍTVA: Betöltés ellenőrzése
-                self.vectorstore = Chroma(
-                    persist_directory=self.vector_store_path,
-                    embedding_function=self.embeddings
-                )
-                
-                # Ellenőrizzük, hogy van-e tartalom
-                collection_count = self.vectorstore._collection.count()
-                if collection_count > 0:
-                    print(f"✅ Vector store betöltve: {collection_count} dokumentum")
-                else:
-                    print("⚠️ Vector store üres, PDF-ek betöltése szükséges")
-                    self._load_pdfs_to_vectorstore()
-            else:
-                print("📁 Vector store nem létezik, létrehozás...")
-                self._load_pdfs_to_vectorstore()
-                
-        except Exception as e:
-            print(f"❌ Vector store hiba: {e}")
-            # Fallback: új vector store létrehozása
-            self._load_pdfs_to_vectorstore()
+    def _create_embeddings(self, api_key: Optional[str]):
+        """Alap embedding modell a RAG_CONFIG["embedding"]["provider"] szerint"""
+        if self.embedding_provider == "hashing":
+            return create_local_embeddings()
+        return OpenAIEmbeddings(
+            openai_api_key=api_key,
+            model=RAG_CONFIG["embedding"]["model"]  # text-embedding-3-small
+        )
     
-    def _load_pdfs_to_vectorstore(self):
-        """PDF-ek betöltése a vector store-ba JAVÍTOTT verzió"""
+    def _create_answer_cache(self) -> Optional[AnswerCache]:
+        cache_config = RAG_CONFIG["answer_cache"]
+        if not cache_config["enabled"]:
+            return None
+        return AnswerCache(
+            cache_config["path"],
+            ttl_seconds=cache_config["ttl_hours"] * 3600,
+            max_entries=cache_config["max_entries"],
+            similarity_threshold=cache_config["similarity_threshold"]
+        )
+    
+    def _load_or_create_vectorstore(self):
+        """Vector store betöltése és inkrementális szinkronizálása a PDF könyvtárral"""
         try:
-            # ✅ JAVÍTVA: PDF könyvtár ellenőrzése
-            pdf_directory = Path("medline_data/pdfs")
-            if not pdf_directory.exists():
-                print(f"❌ PDF könyvtár nem létezik: {pdf_directory}")
-                return
+            self.vectorstore = self._open_vectorstore()
             
-            pdf_files = list(pdf_directory.glob("*.pdf"))
-            if not pdf_files:
-                print("❌ Nincsenek PDF fájlok a könyvtárban")
-                return
-            
-            print(f"📚 PDF fájlok betöltése: {len(pdf_files)} fájl")
+            collection_count = self._vectorstore_count()
+            print(f"✅ Vector store megnyitva ({self.backend}): {collection_count} dokumentum")
             
-            # ✅ JAVÍTVA: Dokumentumok feldolgozása
-            all_documents = []
+            # Régi (manifest nélküli) Chroma store esetén a meglévő chunkokat átvesszük
+            if self.backend == "chroma" and self.manifest.is_empty() and collection_count > 0:
+                self._bootstrap_manifest_from_store(save=self.sync_on_open)
             
-            for pdf_file in pdf_files:
-                try:
-                    # PDF betöltése
-                    loader = PyPDFLoader(str(pdf_file))
-                    documents = loader.load()
-                    
-                    # Metadata hozzáadása
-                    for doc in documents:
-                        doc.metadata.update({
-                            'source_file': pdf_file.name,
-                            'file_type': 'medline_pdf',
-                            'topic': self._extract_topic_from_filename(pdf_file.name)
-                        })
-                    
-                    all_documents.extend(documents)
-                    print(f"✅ Betöltve: {pdf_file.name} ({len(documents)} oldal)")
-                    
-                except Exception as e:
-                    print(f"❌ Hiba PDF betöltésekor ({pdf_file.name}): {e}")
-            
-            if not all_documents:
-                print("❌ Nincsenek betölthető dokumentumok")
+            if not self.sync_on_open:
+                print("ℹ️ Szinkron kihagyva: az index a manifest szerinti állapotban nyílt meg")
                 return
-            
-            # ✅ JAVÍTVA: Text splitting optimalizálása
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,      # Kisebb chunk-ok a pontosabb retrievalért
-                chunk_overlap=200,    # Átfedés a kontextus megőrzésére
-                length_function=len,
-                separators=["\n\n", "\n", ". ", " ", ""]
+            self._sync_vectorstore()
+            self._ensure_auxiliary_indexes()
+            self._ensure_catalog()
+                
+        except Exception as e:
+            print(f"❌ Vector store hiba: {e}")
+            raise
+    
+    def _open_vectorstore(self):
+        """A RAG_CONFIG["chroma"]["backend"] szerinti vector store megnyitása"""
+        self.index_directory.mkdir(parents=True, exist_ok=True)
+        
+        sharding_config = RAG_CONFIG["sharding"]
+        if sharding_config["enabled"]:
+            return ShardedVectorStore(
+                persist_directory=str(self.index_directory),
+                embedding_function=self.embeddings,
+                shard_factory=self._open_shard,
+                mode=sharding_config["mode"],
+                buckets=sharding_config["buckets"],
+                max_workers=sharding_config["max_workers"]
             )
+        
+        if self.backend == "numpy":
+            return self._open_numpy_store(self.index_directory)
+        
+        return Chroma(
+            persist_directory=str(self.index_directory),
+            embedding_function=self.embeddings
+        )
+    
+    def _open_numpy_store(self, directory: Path) -> NumpyVectorStore:
+        """NumPy index (opcionális int8 kvantált pásztázással)"""
+        return NumpyVectorStore(
+            persist_directory=str(directory),
+            embedding_function=self.embeddings,
+            quantization=RAG_CONFIG["chroma"]["quantization"],
+            rescore_factor=RAG_CONFIG["chroma"]["rescore_factor"]
+        )
+    
+    def _open_shard(self, name: str):
+        """Egy shard megnyitása (numpy: alkönyvtár, Chroma: külön collection)"""
+        if self.backend == "numpy":
+            return self._open_numpy_store(self.index_directory / name)
+        return Chroma(
+            collection_name=f"{RAG_CONFIG['chroma']['collection_name']}_{name}",
+            persist_directory=str(self.index_directory),
+            embedding_function=self.embeddings
+        )
+    
+    def _create_dedup_index(self) -> Optional[NearDuplicateIndex]:
+        """MinHash dedup index (None, ha a dedup ki van kapcsolva)"""
+        dedup_config = RAG_CONFIG["dedup"]
+        if not dedup_config["enabled"]:
+            return None
+        return NearDuplicateIndex(
+            str(self.index_directory / DEDUP_FILENAME),
+            num_perm=dedup_config["num_perm"],
+            bands=dedup_config["bands"],
+            shingle_size=dedup_config["shingle_size"],
+            threshold=dedup_config["threshold"]
+        )
+    
+    def _iter_stored_chunks(self, chunk_ids: List[str]):
+        """Tárolt chunkok (id, szöveg, metadata) visszaolvasása a vector store-ból, beágyazás nélkül"""
+        if isinstance(self.vectorstore, NumpyVectorStore):
+            wanted = set(chunk_ids)
+            for _, record in self.vectorstore.iter_records():
+                if record['id'] in wanted:
+                    yield record['id'], record['text'], record.get('metadata') or {}
+            return
+        
+        batch_size = RAG_CONFIG["ingest"]["batch_size"]
+        for i in range(0, len(chunk_ids), batch_size):
+            stored = self.vectorstore.get(ids=chunk_ids[i:i + batch_size],
+                                          include=["documents", "metadatas"])
+            for chunk_id, text, metadata in zip(stored['ids'], stored['documents'], stored['metadatas']):
+                yield chunk_id, text, metadata or {}
+    
+    def _ensure_auxiliary_indexes(self):
+        """BM25 és dedup index egyeztetése a manifesttel (eltérés esetén újraépítés a tárolt szövegekből)"""
+        expected_ids = [cid for entry in self.manifest.entries.values() for cid in entry.chunk_ids]
+        rebuild_bm25 = self.bm25_index.doc_ids != set(expected_ids)
+        rebuild_dedup = self.dedup_index is not None and self.dedup_index.chunk_ids != set(expected_ids)
+        if not (rebuild_bm25 or rebuild_dedup):
+            return
+        
+        print(f"🔤 Lexikális / dedup index újraépítése ({len(expected_ids)} chunk)")
+        if rebuild_bm25:
+            self.bm25_index.clear()
+        if rebuild_dedup:
+            self.dedup_index.clear()
+        for chunk_id, text, metadata in self._iter_stored_chunks(expected_ids):
+            if rebuild_bm25:
+                self.bm25_index.add([chunk_id], [text], [metadata])
+            if rebuild_dedup:
+                self.dedup_index.add(chunk_id, self.dedup_index.signature(text))
+        if rebuild_bm25:
+            self.bm25_index.save()
+        if rebuild_dedup:
+            self.dedup_index.save()
+    
+    def _ensure_catalog(self):
+        """Katalógus egyeztetése a manifesttel (régi indexnél felépítés a tárolt chunkokból)"""
+        if self.catalog.exists() and set(self.catalog.sources) == set(self.manifest.entries):
+            return
+        
+        print(f"📇 Index katalógus felépítése ({len(self.manifest.entries)} forrás)")
+        self.catalog.clear()
+        for name, entry in self.manifest.entries.items():
+            text_bytes, pages = 0, 0
+            for _, text, metadata in self._iter_stored_chunks(entry.chunk_ids):
+                text_bytes += len((text or "").encode('utf-8'))
+                pages = max(pages, int(metadata.get('page', 0) or 0) + 1)
+            self.catalog.record(CatalogSource(
+                file_name=name,
+                topic=self._extract_topic_from_filename(name),
+                chunks=len(entry.chunk_ids),
+                pages=pages,
+                file_bytes=max(entry.size, 0),
+                text_bytes=text_bytes,
+                ingested_at=entry.ingested_at
+            ))
+        self.catalog.save()
+    
+    def _vectorstore_count(self) -> int:
+        if isinstance(self.vectorstore, (NumpyVectorStore, ShardedVectorStore)):
+            return self.vectorstore.count()
+        return self.vectorstore._collection.count()
+    
+    def _bootstrap_manifest_from_store(self, save: bool = True):
+        """Manifest felépítése egy korábbi, manifest nélkül készült store-ból (save=False: csak memóriában)"""
+        try:
+            stored = self.vectorstore.get(include=["metadatas"])
+            ids_by_source: Dict[str, List[str]] = {}
+            for chunk_id, metadata in zip(stored.get('ids', []), stored.get('metadatas', [])):
+                source_file = (metadata or {}).get('source_file')
+                if source_file:
+                    ids_by_source.setdefault(source_file, []).append(chunk_id)
             
-            split_documents = text_splitter.split_documents(all_documents)
-            print(f"📄 Dokumentumok feldarabolva: {len(split_documents)} chunk")
+            for source_file, chunk_ids in ids_by_source.items():
+                pdf_file = self.pdf_directory / source_file
+                if pdf_file.exists():
+                    self.manifest.record(pdf_file, compute_file_hash(pdf_file), chunk_ids)
+                else:
+                    # Nem létező fájl: a következő szinkron törli a chunkjait
+                    self.manifest.entries[source_file] = ManifestEntry(
+                        file_name=source_file, path=str(pdf_file), size=-1,
+                        mtime=0.0, content_hash="", chunk_ids=chunk_ids
+                    )
             
-            # ✅ JAVÍTVA: Vector store létrehozása
-            os.makedirs(self.vector_store_path, exist_ok=True)
+            if save:
+                self.manifest.save()
+            print(f"📋 Manifest felépítve a meglévő store-ból: {len(ids_by_source)} fájl")
             
-            self.vectorstore = Chroma.from_documents(
-                documents=split_documents,
-                embedding=self.embeddings,
-                persist_directory=self.vector_store_path
-            )
+        except Exception as e:
+            print(f"⚠️ Manifest felépítési hiba: {e}")
+    
+    def _sync_vectorstore(self) -> bool:
+        """
+        Csak az új / módosult PDF-ek beágyazása, a törölt fájlok chunkjainak eltávolítása
+        
+        Returns:
+            bool: Változott-e az index
+        """
+        if not self.pdf_directory.exists():
+            print(f"❌ PDF könyvtár nem létezik: {self.pdf_directory}")
+            return False
+        
+        pdf_files = sorted(self.pdf_directory.glob("*.pdf"))
+        diff = self.manifest.diff(pdf_files)
+        self._apply_index_signature(diff)
+        
+        if not diff.has_changes:
+            if diff.touched:
+                self.manifest.save()  # mtime frissítések mentése
+            return False
+        
+        print(f"🔄 Index szinkronizálás: {diff.summary()}")
+        
+        # Törölt és módosult fájlok régi chunkjainak eltávolítása. Azokat a fájlokat,
+        # amelyek eldobott (duplikált) chunkjai ezekre hivatkoztak, szintén újraindexeljük.
+        reingest = list(diff.modified)
+        hashes = dict(diff.hashes)
+        stale_names = set(diff.deleted) | {pdf_file.name for pdf_file in diff.modified}
+        pending = sorted(stale_names)
+        stale_ids = []
+        
+        while pending:
+            file_name = pending.pop()
+            self.catalog.remove(file_name)
+            entry = self.manifest.remove(file_name)
+            if not entry:
+                continue
+            stale_ids.extend(entry.chunk_ids)
+            for dependent in self.manifest.dependents_of(entry.chunk_ids):
+                if dependent in stale_names:
+                    continue
+                dependent_entry = self.manifest.entries[dependent]
+                stale_names.add(dependent)
+                pending.append(dependent)
+                reingest.append(Path(dependent_entry.path))
+                hashes[dependent] = dependent_entry.content_hash
+        
+        if len(reingest) > len(diff.modified):
+            print(f"🧬 Dedup hivatkozások miatt újraindexelve: {len(reingest) - len(diff.modified)} fájl")
+        
+        if stale_ids:
+            self._delete_chunks(stale_ids)
+            self.bm25_index.save()
+            if self.dedup_index is not None:
+                self.dedup_index.save()
+            print(f"🗑️ Elavult chunkok törölve: {len(stale_ids)}")
+        self.manifest.save()
+        self.catalog.save()
+        
+        # Új és módosult fájlok beágyazása
+        self._load_pdfs_to_vectorstore(diff.added + reingest, hashes)
+        return True
+    
+    def _index_signature(self) -> str:
+        """Chunkolási beállítások + embedding modell szignatúrája"""
+        return chunking_signature({
+            **default_splitter_options(),
+            'embedding_model': embedding_model_name(self.embedding_provider)
+        })
+    
+    def _apply_index_signature(self, diff):
+        """
+        Ha a chunkolási / embedding beállítások változtak, minden fájl módosultnak számít
+        (az újrachunkolás a kinyert szöveg cache-ből, PyPDF nélkül történik).
+        """
+        signature = self._index_signature()
+        stored = self.manifest.settings.get('index_signature')
+        
+        # Szignatúra nélküli (régebbi) manifest az akkori alapértelmezésekkel készült
+        if stored is not None and stored != signature and not self.manifest.is_empty():
+            print("✂️ Chunkolási / embedding beállítások változtak: teljes újrachunkolás")
+            for name in diff.unchanged:
+                entry = self.manifest.entries.get(name)
+                if entry:
+                    diff.modified.append(Path(entry.path))
+                    diff.hashes[name] = entry.content_hash
+            diff.unchanged = []
+        
+        if stored != signature:
+            self.manifest.settings['index_signature'] = signature
+            if not diff.has_changes:
+                self.manifest.save()
+    
+    def _index_is_stale(self) -> bool:
+        """Zár nélküli, csak stat alapú ellenőrzés: kell-e szinkronizálni az indexet"""
+        if not self.pdf_directory.exists():
+            return False
+        if self.manifest.settings.get('index_signature') != self._index_signature():
+            return True
+        return self.manifest.has_pending_changes(sorted(self.pdf_directory.glob("*.pdf")))
+    
+    def refresh_index(self, force: bool = False) -> bool:
+        """
+        Index frissítése, ha a PDF könyvtár változott.
+        
+        Az ellenőrzés legfeljebb `refresh_interval` másodpercenként fut, író zár
+        nélkül; a kizárólagos zárat csak tényleges változás esetén vesszük fel.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_refresh_check < RAG_CONFIG["ingest"]["refresh_interval"]:
+            return False
+        self._last_refresh_check = now
+        
+        try:
+            if not self._index_is_stale():
+                return False
+            # Kizárólagos hozzáférés: a futó retrievalok befejeződnek, újak várnak
+            with self._rw_lock.write():
+                return self._sync_vectorstore()
+        except Exception as e:
+            print(f"⚠️ Index frissítési hiba: {e}")
+            return False
+    
+    def _delete_chunks(self, chunk_ids: List[str]):
+        """Chunkok törlése batch-ekben"""
+        batch_size = RAG_CONFIG["ingest"]["batch_size"]
+        for i in range(0, len(chunk_ids), batch_size):
+            self.vectorstore.delete(ids=chunk_ids[i:i + batch_size])
+        self.bm25_index.remove(chunk_ids)
+        if self.dedup_index is not None:
+            self.dedup_index.remove(chunk_ids)
+    
+    def _stored_chunk_ids(self) -> List[str]:
+        """A vector store-ban ténylegesen tárolt összes chunk ID"""
+        if isinstance(self.vectorstore, NumpyVectorStore):
+            return [record['id'] for _, record in self.vectorstore.iter_records()]
+        return list(self.vectorstore.get(include=[])['ids'])
+    
+    def _vacuum_vectorstore(self) -> int:
+        """Törölt chunkok fizikai helyének felszabadítása (numpy: újraírás, Chroma: SQLite VACUUM)"""
+        reclaimed = 0
+        if hasattr(self.vectorstore, 'compact'):
+            reclaimed += self.vectorstore.compact()
+        if self.backend == "chroma":
+            try:
+                reclaimed += vacuum_sqlite(self.index_directory / CHROMA_SQLITE_FILENAME)
+            except Exception as e:
+                print(f"⚠️ Chroma VACUUM hiba: {e}")
+        return reclaimed
+    
+    def compact_index(self, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Index szemétgyűjtés és tömörítés.
+        
+        Törli a már nem létező, illetve ugyanarra a topicra újabb letöltéssel
+        felváltott PDF-ek chunkjait (az elavult fájlok kizárva maradnak a
+        későbbi szinkronokból), a manifestben nem szereplő árva chunkokat,
+        majd felszabadítja a tároló helyét.
+        
+        Args:
+            dry_run: Csak jelentés, törlés nélkül
             
-            print(f"✅ Vector store létrehozva: {len(split_documents)} dokumentum chunk")
+        Returns:
+            Dict: Érintett fájlok, törölt chunkok, felszabadított bájtok
+        """
+        with self._rw_lock.write():
+            return self._compact_index(dry_run)
+    
+    def _compact_index(self, dry_run: bool) -> Dict[str, Any]:
+        """compact_index megvalósítása (író zár alatt)"""
+        on_disk = {f.name for f in self.pdf_directory.glob("*.pdf")} if self.pdf_directory.exists() else set()
+        superseded = find_superseded(on_disk)
+        # Érvénytelen kizárások: a fájl vagy az újabb változata eltűnt
+        released = [name for name, newer in self.manifest.excluded.items()
+                    if name not in on_disk or newer not in on_disk]
+        
+        missing = sorted(name for name in self.manifest.entries if name not in on_disk)
+        stale = sorted(name for name in superseded if name in self.manifest.entries)
+        expected_ids = {cid for entry in self.manifest.entries.values() for cid in entry.chunk_ids}
+        orphan_ids = [cid for cid in self._stored_chunk_ids() if cid not in expected_ids]
+        
+        bytes_before = directory_bytes(self.index_directory)
+        report = {
+            'dry_run': dry_run,
+            'missing_files': missing,
+            'superseded_files': {name: superseded[name] for name in stale},
+            'stale_chunks': sum(len(self.manifest.entries[name].chunk_ids) for name in missing + stale),
+            'orphan_chunks': len(orphan_ids),
+            'deleted_chunks': 0,
+            'reindexed_chunks': 0,
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_before,
+            'reclaimed_bytes': 0
+        }
+        if dry_run:
+            return report
+        
+        print(f"🧹 Index tömörítés: {len(missing)} hiányzó, {len(stale)} elavult fájl, "
+              f"{len(orphan_ids)} árva chunk")
+        count_before = self._vectorstore_count()
+        for name in released:
+            self.manifest.excluded.pop(name, None)
+        for name, newer in superseded.items():
+            self.manifest.exclude(name, newer)
+        self.manifest.save()
+        
+        # A szinkron törli a kizárt / hiányzó fájlok chunkjait (dedup függőségekkel együtt)
+        self._sync_vectorstore()
+        # Szinkron nélkül megnyitott analyzernél a segédindexek egyeztetése is itt történik
+        self._ensure_auxiliary_indexes()
+        self._ensure_catalog()
+        if orphan_ids:
+            self._delete_chunks(orphan_ids)
+            self.bm25_index.save()
+            if self.dedup_index is not None:
+                self.dedup_index.save()
+        self._vacuum_vectorstore()
+        
+        bytes_after = directory_bytes(self.index_directory)
+        deleted = report['stale_chunks'] + len(orphan_ids)
+        report.update({
+            'deleted_chunks': deleted,
+            # Dedup függőség miatt újraindexelt fájlok (pl. az új változat) chunkjai
+            'reindexed_chunks': max(0, self._vectorstore_count() - (count_before - deleted)),
+            'bytes_after': bytes_after,
+            'reclaimed_bytes': max(0, bytes_before - bytes_after)
+        })
+        print(f"✅ Tömörítés kész: {report['deleted_chunks']} chunk törölve, "
+              f"{report['reclaimed_bytes'] / 1024:.1f} KB felszabadítva")
+        return report
+    
+    def _load_pdfs_to_vectorstore(self, pdf_files: List[Path], hashes: Dict[str, str]):
+        """Megadott PDF-ek betöltése, chunkolása és beágyazása (fájlonként rögzítve a manifestben)"""
+        if not pdf_files:
+            return
+        
+        print(f"📚 PDF fájlok betöltése: {len(pdf_files)} fájl")
+        
+        # Chunkolás: RAG_CONFIG["chunking"], a kinyert szöveg cache-sel
+        splitter_options = default_splitter_options()
+        content_hashes = {
+            pdf_file.name: hashes.get(pdf_file.name) or compute_file_hash(pdf_file)
+            for pdf_file in pdf_files
+        }
+        tasks = [
+            (pdf_file, {
+                'source_file': pdf_file.name,
+                'file_type': 'medline_pdf',
+                'topic': self._extract_topic_from_filename(pdf_file.name)
+            }, content_hashes[pdf_file.name])
+            for pdf_file in pdf_files
+        ]
+        batch_size = RAG_CONFIG["ingest"]["batch_size"]
+        total_chunks = 0
+        dropped_chunks = 0
+        text_cache_hits = 0
+        
+        # Párhuzamos parse + chunkolás, a kész fájlok chunkjai azonnal beágyazásra kerülnek
+        for parsed in iter_parsed_pdfs(tasks, splitter_options):
+            pdf_file = Path(parsed.path)
+            if parsed.error:
+                print(f"❌ Hiba PDF betöltésekor ({pdf_file.name}): {parsed.error}")
+                continue
+            text_cache_hits += parsed.from_text_cache
             
-        except Exception as e:
-            print(f"❌ PDF betöltési hiba: {e}")
-            raise
+            try:
+                content_hash = content_hashes[pdf_file.name]
+                chunk_ids = [
+                    make_chunk_id(pdf_file.name, content_hash, i)
+                    for i in range(len(parsed.chunks))
+                ]
+                for chunk_id, (_, metadata) in zip(chunk_ids, parsed.chunks):
+                    metadata['chunk_id'] = chunk_id
+                
+                kept_ids, kept_chunks, duplicate_of = self._deduplicate_chunks(chunk_ids, parsed.chunks)
+                
+                for i in range(0, len(kept_chunks), batch_size):
+                    batch = kept_chunks[i:i + batch_size]
+                    texts = [text for text, _ in batch]
+                    metadatas = [metadata for _, metadata in batch]
+                    self.vectorstore.add_texts(
+                        texts=texts,
+                        metadatas=metadatas,
+                        ids=kept_ids[i:i + batch_size]
+                    )
+                    self.bm25_index.add(kept_ids[i:i + batch_size], texts, metadatas)
+                
+                self.manifest.record(pdf_file, content_hash, kept_ids,
+                                     total_chunks=len(parsed.chunks), duplicate_of=duplicate_of)
+                self.manifest.save()
+                self.catalog.record(CatalogSource(
+                    file_name=pdf_file.name,
+                    topic=self._extract_topic_from_filename(pdf_file.name),
+                    chunks=len(kept_ids),
+                    pages=parsed.page_count,
+                    file_bytes=self.manifest.entries[pdf_file.name].size,
+                    text_bytes=sum(len(text.encode('utf-8')) for text, _ in kept_chunks),
+                    ingested_at=self.manifest.entries[pdf_file.name].ingested_at
+                ))
+                self.catalog.save()
+                total_chunks += len(kept_chunks)
+                dropped_chunks += len(parsed.chunks) - len(kept_chunks)
+                print(f"✅ Beindexelve: {pdf_file.name} ({parsed.page_count} oldal, "
+                      f"{len(kept_chunks)}/{len(parsed.chunks)} chunk)")
+                
+            except Exception as e:
+                print(f"❌ Hiba PDF indexelésekor ({pdf_file.name}): {e}")
+        
+        self.bm25_index.save()
+        if self.dedup_index is not None:
+            self.dedup_index.save()
+        print(f"✅ Vector store frissítve: {total_chunks} új chunk")
+        if text_cache_hits:
+            print(f"📄 Szöveg cache: {text_cache_hits}/{len(pdf_files)} PDF parse nélkül")
+        if dropped_chunks:
+            ratio = dropped_chunks / (total_chunks + dropped_chunks)
+            print(f"🧬 Dedup: {dropped_chunks} közel-duplikált chunk eldobva ({ratio:.1%})")
+        if isinstance(self.embeddings, CachedEmbeddings):
+            print(f"🧮 Embedding cache: {self.embeddings.stats()}")
+    
+    def _deduplicate_chunks(self, chunk_ids: List[str], chunks: List[Tuple[str, Dict[str, Any]]]
+                            ) -> Tuple[List[str], List[Tuple[str, Dict[str, Any]]], List[str]]:
+        """
+        Közel-duplikált chunkok eldobása MinHash alapján.
+        
+        Returns:
+            Tuple: (megtartott ID-k, megtartott chunkok, hivatkozott más fájlbeli chunk ID-k)
+        """
+        if self.dedup_index is None:
+            return list(chunk_ids), list(chunks), []
+        
+        own_ids = set(chunk_ids)
+        kept_ids, kept_chunks, duplicate_of = [], [], []
+        for chunk_id, chunk in zip(chunk_ids, chunks):
+            signature = self.dedup_index.signature(chunk[0])
+            duplicate_id = self.dedup_index.find_duplicate(signature)
+            if duplicate_id is None:
+                self.dedup_index.add(chunk_id, signature)
+                kept_ids.append(chunk_id)
+                kept_chunks.append(chunk)
+            elif duplicate_id not in own_ids:
+                duplicate_of.append(duplicate_id)
+        return kept_ids, kept_chunks, duplicate_of
     
     def _extract_topic_from_filename(self, filename: str) -> str:
         """Topic kinyerése a fájlnévből"""
@@ -230,59 +814,234 @@ Ha nincs releváns információ, írd: "Nincs megfelelő információ a dokument
 VÁLASZ MAGYARUL:
 """)
 
-        # ✅ JAVÍTVA: Retriever konfigurálása
-        retriever = self.vectorstore.as_retriever(
-            search_type="similarity",
-            search_kwargs={
-                "k": 5,  # Top 5 legrelvánsabb chunk
-                #"score_threshold": 0.3  # Minimum hasonlósági küszöb
-            }
-        )
-        
-        # ✅ JAVÍTVA: Modern LCEL chain (LangChain Expression Language)
-        def format_docs(docs):
-            return "\n\n".join(doc.page_content for doc in docs)
+        # Válaszgenerálás kész kontextusból (a batch elemzés is ezt használja)
+        self.answer_chain = prompt_template | self.llm | StrOutputParser()
         
+        # Hibrid retriever (dense + BM25) + token-keretes MMR kontextus
         self.retrieval_chain = (
             {
-                "context": retriever | format_docs,
+                "context": RunnableLambda(self.build_context),
                 "question": RunnablePassthrough()
             }
-            | prompt_template
-            | self.llm
-            | StrOutputParser()
+            | self.answer_chain
         )
         
         print("✅ Modern LCEL retrieval chain létrehozva")
     
-    def analyze_medical_case(self, case_data: Dict[str, Any]) -> Dict[str, Any]:
+    def dense_search(self, query: str, k: int) -> List[Document]:
+        """Embedding alapú hasonlósági keresés (shardolt indexnél topic szerinti routinggal)"""
+        with self._rw_lock.read():
+            if isinstance(self.vectorstore, ShardedVectorStore):
+                topics = self._query_topics(query) if RAG_CONFIG["sharding"]["route_by_topic"] else None
+                return self.vectorstore.similarity_search(query, k=k, topics=topics)
+            return self.vectorstore.similarity_search(query, k=k)
+    
+    def dense_search_many(self, queries: List[str], k: int) -> List[List[Document]]:
+        """
+        Több kérdés dense keresése: egyetlen embedding kérés és (ha a backend
+        támogatja) egyetlen vektorizált keresés.
+        """
+        if not queries:
+            return []
+        vectors = self.embeddings.embed_documents(queries)
+        
+        with self._rw_lock.read():
+            if isinstance(self.vectorstore, NumpyVectorStore):
+                return [[doc for doc, _ in hits]
+                        for hits in self.vectorstore.similarity_search_by_vectors_with_score(vectors, k)]
+            
+            if isinstance(self.vectorstore, ShardedVectorStore):
+                route = RAG_CONFIG["sharding"]["route_by_topic"]
+                return [
+                    self.vectorstore.similarity_search_by_vector(
+                        vector, k=k, topics=self._query_topics(query) if route else None)
+                    for query, vector in zip(queries, vectors)
+                ]
+            
+            # Chroma: egyetlen query hívás az összes lekérdezés vektorral
+            response = self.vectorstore._collection.query(
+                query_embeddings=vectors, n_results=k, include=["documents", "metadatas"]
+            )
+            return [
+                [Document(page_content=text, metadata=metadata or {}) for text, metadata in zip(texts, metadatas)]
+                for texts, metadatas in zip(response['documents'], response['metadatas'])
+            ]
+    
+    def stored_vectors(self, chunk_ids: List[str]) -> Dict[str, Any]:
+        """Beindexelt chunkok tárolt embedding vektorai (újra embeddelés nélkül)"""
+        if not chunk_ids or self.vectorstore is None:
+            return {}
+        with self._rw_lock.read():
+            if isinstance(self.vectorstore, (NumpyVectorStore, ShardedVectorStore)):
+                return self.vectorstore.get_vectors(chunk_ids)
+            stored = self.vectorstore._collection.get(ids=chunk_ids, include=["embeddings"])
+            return dict(zip(stored['ids'], stored['embeddings']))
+    
+    def _query_topics(self, query: str) -> List[str]:
+        """A katalógus topicjai, amelyek szerepelnek a (lefordított) kérdésben"""
+        words = set(re.findall(r"[a-z0-9]+", query.lower()))
+        return sorted({source.topic for source in self.catalog.sources.values()
+                       if source.topic.lower() in words})
+    
+    def lexical_search(self, query: str, k: int = 5) -> List[Document]:
+        """BM25 keresés - hálózati hívás nélküli gyors út"""
+        with self._rw_lock.read():
+            return self.bm25_index.search(query, k=k)
+    
+    def hybrid_search(self, query: str, k: Optional[int] = None,
+                      dense_docs: Optional[List[Document]] = None) -> List[Document]:
+        """
+        Dense és BM25 találatok egyesítése reciprocal rank fusion-nel.
+        Ha az embedding nem elérhető, csak a lexikális találatokat adjuk vissza.
+        A dense_docs előre (batch-ben) kiszámolt dense találatokat ad át.
+        """
+        with self._rw_lock.read():
+            config = RAG_CONFIG["rag"]["hybrid"]
+            final_k = k or config["final_k"]
+            
+            lexical_docs = self.lexical_search(query, k=config["lexical_k"]) if config["enabled"] else []
+            
+            try:
+                if dense_docs is None:
+                    dense_docs = self.dense_search(query, k=config["dense_k"])
+            except Exception as e:
+                print(f"⚠️ Dense keresés nem elérhető, csak lexikális találatok: {e}")
+                return lexical_docs[:final_k]
+            
+            if not lexical_docs:
+                return dense_docs[:final_k]
+            
+            return reciprocal_rank_fusion([dense_docs, lexical_docs], k=config["rrf_k"])[:final_k]
+    
+    def retrieve_context_documents(self, query: str,
+                                   dense_docs: Optional[List[Document]] = None) -> List[Document]:
+        """A promptba kerülő chunkok: nagyobb jelölt halmazból MMR + token keret"""
+        with self._rw_lock.read():
+            if not self.context_packer:
+                return self.hybrid_search(query, dense_docs=dense_docs)
+            candidates = self.hybrid_search(query, k=RAG_CONFIG["rag"]["context"]["candidate_k"],
+                                            dense_docs=dense_docs)
+            return self.context_packer.select(query, candidates)
+    
+    def format_context(self, docs: List[Document]) -> str:
+        if self.context_packer:
+            return self.context_packer.format(docs)
+        return "\n\n".join(doc.page_content for doc in docs)
+    
+    def build_context(self, query: str) -> str:
+        """Prompt kontextus szöveg összeállítása"""
+        return self.format_context(self.retrieve_context_documents(query))
+    
+    def index_version(self) -> str:
+        """A korpusz verziója: index szignatúra + a beindexelt PDF-ek tartalom hash-ei"""
+        with self._rw_lock.read():
+            payload = json.dumps({
+                'signature': self.manifest.settings.get('index_signature'),
+                'files': sorted((name, entry.content_hash) for name, entry in self.manifest.entries.items())
+            })
+            return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+    
+    def _answer_cache_lookup(self, translated_data: Dict[str, Any]
+                             ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Cache-elt válasz keresése a lefordított beteg profilhoz.
+        
+        Returns:
+            Tuple: (cache-elt eredmény vagy None, a mentéshez szükséges kulcs adatok)
+        """
+        # Offline módban (LLM nélkül) a lokális index verziója más: a cache-t nem használjuk
+        if self.answer_cache is None or not self.retrieval_chain:
+            return None, None
+        try:
+            version = self.index_version()
+            if version != self._answer_cache_version:
+                # Korpusz változás: a régi index verzióhoz tartozó válaszok érvénytelenek
+                removed = self.answer_cache.invalidate(version)
+                if removed:
+                    print(f"🗑️ Válasz cache: {removed} elavult bejegyzés törölve")
+                self._answer_cache_version = version
+            
+            profile = normalize_profile(translated_data)
+            key = profile_key(profile, version)
+            vector = None
+            if RAG_CONFIG["answer_cache"]["semantic"]:
+                vector = self.embeddings.embed_query(profile_text(profile))
+            
+            cached, match = self.answer_cache.get(key, version, vector, profile)
+            if cached is not None:
+                print(f"⚡ Válasz cache találat ({match})")
+                return {**cached, 'cached': True, 'cache_match': match}, None
+            return None, {'key': key, 'version': version, 'profile': profile, 'vector': vector}
+        except Exception as e:
+            print(f"⚠️ Válasz cache hiba: {e}")
+            return None, None
+    
+    def _answer_cache_store(self, cache_entry: Optional[Dict[str, Any]], result: Dict[str, Any]):
+        """Csak a sikeres, strukturált eredményeket tároljuk"""
+        if self.answer_cache is None or not cache_entry or not result.get('success'):
+            return
+        try:
+            self.answer_cache.put(cache_entry['key'], cache_entry['version'], result,
+                                  cache_entry['profile'], cache_entry['vector'])
+        except Exception as e:
+            print(f"⚠️ Válasz cache mentési hiba: {e}")
+    
+    @staticmethod
+    def _replay_cached(result: Dict[str, Any], stream_callback: Optional[Callable[[str, Dict[str, Any]], None]]):
+        """Cache találatnál a stream callback egyszer, a teljes válasszal hívódik"""
+        if not stream_callback:
+            return
+        text = result.get('full_response') or ""
+        try:
+            stream_callback(text, parse_sections_progressive(text, finished=True))
+        except Exception as e:
+            print(f"⚠️ Stream callback hiba: {e}")
+    
+    def analyze_medical_case(self, case_data: Dict[str, Any],
+                             stream_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+                             ) -> Dict[str, Any]:
         """
         Orvosi eset elemzése JAVÍTOTT verzió
         
         Args:
             case_data: Orvosi eset adatok (JSON)
+            stream_callback: Opcionális callback(eddigi szöveg, parse_sections_progressive eredmény),
+                minden beérkező token csomag után meghívva
             
         Returns:
             Dict: Elemzési eredmények
         """
         try:
-            if not self.retrieval_chain:
-                raise ValueError("RAG chain nincs inicializálva")
+            if not self.vectorstore:
+                raise ValueError("Vector store nincs inicializálva")
             
             # ✅ JAVÍTVA: Query összeállítása
-            translated_data = translate_patient_data(case_data, os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY"))
+            translated_data = translate_patient_data(case_data, get_openai_api_key())
+            
+            cached, cache_entry = self._answer_cache_lookup(translated_data)
+            if cached is not None:
+                self._replay_cached(cached, stream_callback)
+                return cached
+            
             query = self._build_medical_query(translated_data)
             #query = self._build_medical_query(case_data)
             print(f"🔍 RAG Query: {query}")
             
+            if not self.retrieval_chain:
+                return self._retrieval_only_result(query)
+            
             # ✅ JAVÍTVA: Modern invoke használata predict helyett
             #with st.spinner("🧠 RAG elemzés folyamatban..."):
-            rag_response = self.retrieval_chain.invoke(query)
+            if stream_callback:
+                rag_response = self._stream_response(query, stream_callback)
+            else:
+                rag_response = self.retrieval_chain.invoke(query)
             
             print(f"📄 RAG Response: {rag_response[:200]}...")
             
             # ✅ JAVÍTVA: Válasz feldolgozása
             analysis_result = self._parse_rag_response(rag_response, case_data)
+            self._answer_cache_store(cache_entry, analysis_result)
             
             return analysis_result
             
@@ -295,6 +1054,310 @@ VÁLASZ MAGYARUL:
                 'medical_insights': []
             }
     
+    def _retrieval_only_result(self, query: str, docs: Optional[List[Document]] = None) -> Dict[str, Any]:
+        """Offline mód: LLM válasz helyett a legrelevánsabb Medline részletek"""
+        if docs is None:
+            docs = self.retrieve_context_documents(query)
+        excerpts = []
+        for doc in docs:
+            content = doc.page_content.strip().replace("\n", " ")
+            excerpts.append(
+                f"• [{doc.metadata.get('topic', 'unknown')}, {doc.metadata.get('page', '?')}. oldal] "
+                f"{content[:400]}{'...' if len(content) > 400 else ''}"
+            )
+        
+        notice = "Offline mód: AI összefoglaló nem érhető el, lásd a releváns Medline részleteket."
+        return {
+            'success': True,
+            'offline': True,
+            'patient_condition': notice,
+            'symptom_management': notice,
+            'recommended_specialist': 'Offline módban nem elérhető',
+            'additional_info': "\n\n".join(excerpts) or 'Nincs releváns találat a dokumentumokban',
+            'timestamp': datetime.now().isoformat(),
+            'sources': sorted({doc.metadata.get('source_file', 'medline_pdf') for doc in docs}),
+            'full_response': None
+        }
+    
+    def _stream_response(self, query: str,
+                         stream_callback: Callable[[str, Dict[str, Any]], None]) -> str:
+        """Válasz streamelése: a callback a részleges szöveget és a már felismert szekciókat kapja"""
+        rag_response = ""
+        for chunk in self.retrieval_chain.stream(query):
+            rag_response += chunk
+            try:
+                stream_callback(rag_response, parse_sections_progressive(rag_response))
+            except Exception as e:
+                print(f"⚠️ Stream callback hiba: {e}")
+        
+        try:
+            stream_callback(rag_response, parse_sections_progressive(rag_response, finished=True))
+        except Exception as e:
+            print(f"⚠️ Stream callback hiba: {e}")
+        return rag_response
+    
+    async def aanalyze_medical_case(self, case_data: Dict[str, Any],
+                                    stream_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                                    timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        analyze_medical_case async változata.
+        
+        A hálózati hívások (fordítás, retrieval, LLM) szinkron kliensekkel,
+        külön szálakon futnak; a stream callback a hívó loop szálán fut.
+        
+        A fordítás és a válaszgenerálás külön időkorlátot kap
+        (RAG_CONFIG["async"]); a fordítás túllépésekor az eredeti adatokkal
+        keresünk tovább. A megszakítás (CancelledError) továbbterjed a hívóhoz.
+        
+        Args:
+            case_data: Orvosi eset adatok (JSON)
+            stream_callback: Opcionális callback, mint az analyze_medical_case-nél
+            timeout: A válaszgenerálás időkorlátja másodpercben (alapértelmezés: konfig)
+        """
+        async_config = RAG_CONFIG["async"]
+        timeout = timeout if timeout is not None else async_config["answer_timeout"]
+        
+        try:
+            if not self.vectorstore:
+                raise ValueError("Vector store nincs inicializálva")
+            
+            api_key = get_openai_api_key()
+            try:
+                translated_data = await asyncio.wait_for(
+                    _run_in_thread(translate_patient_data, case_data, api_key),
+                    timeout=async_config["translation_timeout"]
+                )
+            except asyncio.TimeoutError:
+                print("⚠️ Fordítás időtúllépés, keresés az eredeti adatokkal")
+                translated_data = None
+            
+            # Fordítás nélkül a profil kulcs nem normalizált: cache kihagyása
+            cached, cache_entry = None, None
+            if translated_data is not None:
+                cached, cache_entry = await _run_in_thread(self._answer_cache_lookup, translated_data)
+            else:
+                translated_data = case_data
+            if cached is not None:
+                self._replay_cached(cached, stream_callback)
+                return cached
+            
+            query = self._build_medical_query(translated_data)
+            print(f"🔍 RAG Query: {query}")
+            
+            if not self.retrieval_chain:
+                return await _run_in_thread(self._retrieval_only_result, query)
+            
+            if stream_callback:
+                response_task = self._astream_response(query, stream_callback)
+            else:
+                response_task = _run_in_thread(self.retrieval_chain.invoke, query)
+            rag_response = await asyncio.wait_for(response_task, timeout=timeout)
+            
+            print(f"📄 RAG Response: {rag_response[:200]}...")
+            analysis_result = self._parse_rag_response(rag_response, case_data)
+            self._answer_cache_store(cache_entry, analysis_result)
+            return analysis_result
+            
+        except asyncio.TimeoutError:
+            print(f"⏱️ RAG elemzés időtúllépés ({timeout} s)")
+            return {
+                'success': False,
+                'error': f'Időtúllépés ({timeout} s)',
+                'rag_response': None,
+                'medical_insights': []
+            }
+        except Exception as e:
+            print(f"❌ RAG elemzési hiba: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'rag_response': None,
+                'medical_insights': []
+            }
+    
+    async def _astream_response(self, query: str,
+                                stream_callback: Callable[[str, Dict[str, Any]], None]) -> str:
+        """
+        _stream_response async változata: a szinkron stream külön szálon fut, a
+        chunkok sorban érkeznek vissza, a callback a loop szálán fut.
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+        
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            except RuntimeError:
+                stop.set()  # A loop már leállt
+        
+        def produce():
+            try:
+                for chunk in self.retrieval_chain.stream(query):
+                    if stop.is_set():
+                        break  # Megszakítás / időtúllépés: a stream lezárása
+                    emit(chunk)
+            except Exception as e:
+                emit(e)
+            finally:
+                emit(done)
+        
+        asyncio.ensure_future(_run_in_thread(produce))
+        rag_response = ""
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is done:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                rag_response += chunk
+                try:
+                    stream_callback(rag_response, parse_sections_progressive(rag_response))
+                except Exception as e:
+                    print(f"⚠️ Stream callback hiba: {e}")
+        finally:
+            stop.set()
+        
+        try:
+            stream_callback(rag_response, parse_sections_progressive(rag_response, finished=True))
+        except Exception as e:
+            print(f"⚠️ Stream callback hiba: {e}")
+        return rag_response
+    
+    def analyze_many(self, cases: List[Dict[str, Any]], output_path: Optional[str] = None,
+                     max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Több eset batch elemzése (pl. éjszakai QA visszajátszás).
+        
+        Szakaszok: fordítás az összes eset egyedi kifejezéseire batch-enként egy
+        LLM hívással, egyetlen embedding kérés az összes kérdésre, vektorizált
+        dense keresés, lokális kontextus összeállítás, végül korlátozott
+        párhuzamosságú LLM hívások. Az eredmények a befejezés sorrendjében
+        kerülnek egyetlen JSONL fájlba, az utolsó sor az áteresztőképesség riport.
+        
+        Args:
+            cases: Beteg adat dict-ek (opcionális 'case_id' kulccsal)
+            output_path: Kimeneti JSONL (alapértelmezés: RAG_CONFIG["batch"]["output_dir"])
+            max_concurrency: Egyidejű LLM hívások száma
+            
+        Returns:
+            Dict: Áteresztőképesség riport
+        """
+        batch_config = RAG_CONFIG["batch"]
+        max_concurrency = max_concurrency or batch_config["max_concurrency"]
+        if output_path is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_path = Path(batch_config["output_dir"]) / f"rag_batch_{timestamp}.jsonl"
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        stages = {}
+        start = time.perf_counter()
+        
+        stage_start = time.perf_counter()
+        translated_cases = self._translate_many(cases, batch_config["translation_batch_size"])
+        queries = [self._build_medical_query(case) for case in translated_cases]
+        stages['translation_s'] = round(time.perf_counter() - stage_start, 3)
+        
+        stage_start = time.perf_counter()
+        try:
+            dense_results = self.dense_search_many(queries, k=RAG_CONFIG["rag"]["hybrid"]["dense_k"])
+        except Exception as e:
+            print(f"⚠️ Batch dense keresés nem elérhető, csak lexikális találatok: {e}")
+            dense_results = [[] for _ in queries]
+        stages['dense_search_s'] = round(time.perf_counter() - stage_start, 3)
+        
+        stage_start = time.perf_counter()
+        contexts = []
+        for query, dense_docs in zip(queries, dense_results):
+            try:
+                contexts.append(self.retrieve_context_documents(query, dense_docs=dense_docs))
+            except Exception as e:
+                contexts.append(e)
+        stages['context_s'] = round(time.perf_counter() - stage_start, 3)
+        
+        stage_start = time.perf_counter()
+        succeeded, latencies = 0, []
+        with open(output_path, 'w', encoding='utf-8') as f, \
+                ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="rag-batch") as executor:
+            futures = {
+                executor.submit(self._answer_case, case, query, docs): index
+                for index, (case, query, docs) in enumerate(zip(cases, queries, contexts))
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                result, seconds = future.result()
+                latencies.append(seconds)
+                succeeded += bool(result.get('success'))
+                record = {
+                    'type': 'result',
+                    'index': index,
+                    'case_id': cases[index].get('case_id', f"case_{index:05d}"),
+                    'query': queries[index],
+                    'seconds': round(seconds, 3),
+                    'rag_analysis': result
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+            stages['generation_s'] = round(time.perf_counter() - stage_start, 3)
+            
+            wall_seconds = time.perf_counter() - start
+            latencies.sort()
+            report = {
+                'cases': len(cases),
+                'succeeded': succeeded,
+                'failed': len(cases) - succeeded,
+                'wall_seconds': round(wall_seconds, 3),
+                'cases_per_s': round(len(cases) / wall_seconds, 3) if wall_seconds else 0.0,
+                'case_latency_p50_s': round(latencies[len(latencies) // 2], 3) if latencies else 0.0,
+                'case_latency_p95_s': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3)
+                                      if latencies else 0.0,
+                'max_concurrency': max_concurrency,
+                'stages': stages,
+                'offline': self.answer_chain is None,
+                'output_path': str(output_path)
+            }
+            f.write(json.dumps({'type': 'report', **report}, ensure_ascii=False) + "\n")
+        
+        print(f"📦 Batch RAG elemzés: {succeeded}/{len(cases)} sikeres, "
+              f"{report['cases_per_s']} eset/s, {report['wall_seconds']} s -> {output_path}")
+        return report
+    
+    def _translate_many(self, cases: List[Dict[str, Any]], batch_size: int) -> List[Dict[str, Any]]:
+        """Az összes eset egyedi kifejezéseinek fordítása közös batch-ekben"""
+        translator = get_translator(get_openai_api_key())
+        phrases = list(dict.fromkeys(phrase for case in cases for phrase in collect_phrases(case)))
+        translations: Dict[str, str] = {}
+        for i in range(0, len(phrases), batch_size):
+            translations.update(translator.translate_phrases(phrases[i:i + batch_size]))
+        return [apply_translations(case, translations) for case in cases]
+    
+    def _answer_case(self, case_data: Dict[str, Any], query: str,
+                     docs: Any) -> Tuple[Dict[str, Any], float]:
+        """Egy batch eset válaszgenerálása a kész kontextusból (hibát eredményként ad vissza)"""
+        start = time.perf_counter()
+        try:
+            if isinstance(docs, Exception):
+                raise docs
+            if not self.answer_chain:
+                result = self._retrieval_only_result(query, docs)
+            else:
+                rag_response = self.answer_chain.invoke({
+                    "context": self.format_context(docs),
+                    "question": query
+                })
+                result = self._parse_rag_response(rag_response, case_data)
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': str(e),
+                'rag_response': None,
+                'medical_insights': []
+            }
+        return result, time.perf_counter() - start
+    
     def _build_medical_query(self, case_data: Dict[str, Any]) -> str:
         """✅ JAVÍTVA: Orvosi query összeállítása"""
         # Alapadatok kinyerése
@@ -393,8 +1456,6 @@ Kérlek adj részletes egészségügyi tanácsokat a Medline dokumentumok alapj
             "additional_info": ""
         }
 
-        import re
-
         # Regex a 4 szekció címének megtalálására
         pattern = r"(1\.\s\*\*.*?\*\*.*?)(?=2\.|\Z)|" \
                 r"(2\.\s\*\*.*?\*\*.*?)(?=3\.|\Z)|" \
@@ -424,51 +1485,45 @@ Kérlek adj részletes egészségügyi tanácsokat a Medline dokumentumok alapj
 
     
     def get_vectorstore_stats(self) -> Dict[str, Any]:
-        """Vector store statisztikák"""
+        """Vector store statisztikák a katalógusból (hálózati hívás és keresés nélkül)"""
         try:
             if not self.vectorstore:
                 return {'error': 'Vector store nincs inicializálva'}
             
-            collection_count = self.vectorstore._collection.count()
-            
-            # Metadatok összegyűjtése
-            if collection_count > 0:
-                # Példa dokumentumok lekérése
-                sample_docs = self.vectorstore.similarity_search("medline", k=3)
-                topics = set()
-                sources = set()
-                
-                for doc in sample_docs:
-                    if 'topic' in doc.metadata:
-                        topics.add(doc.metadata['topic'])
-                    if 'source_file' in doc.metadata:
-                        sources.add(doc.metadata['source_file'])
-                
-                return {
-                    'total_documents': collection_count,
-                    'topics_found': list(topics),
-                    'source_files': list(sources),
-                    'sample_content': sample_docs[0].page_content[:200] if sample_docs else None
-                }
-            else:
-                return {
-                    'total_documents': 0,
-                    'topics_found': [],
-                    'source_files': [],
-                    'sample_content': None
-                }
+            with self._rw_lock.read():
+                summary = self.catalog.summary()
+                dedup_ratio = self.manifest.stats()['dedup_ratio']
+            return {
+                'total_documents': summary['total_chunks'],
+                'topics_found': list(summary['topics']),
+                'source_files': sorted(self.catalog.sources),
+                'catalog': summary,
+                'embedding_cache': self.get_embedding_cache_stats(),
+                'answer_cache': self.answer_cache.stats() if self.answer_cache else None,
+                'dedup_ratio': dedup_ratio
+            }
                 
         except Exception as e:
             return {'error': f'Stats lekérési hiba: {e}'}
     
-    def test_retrieval(self, query: str, k: int = 3) -> Dict[str, Any]:
-        """✅ JAVÍTVA: Retrieval tesztelése"""
+    def get_embedding_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Embedding cache találati / hiány számlálók"""
+        if isinstance(self.embeddings, CachedEmbeddings):
+            return self.embeddings.stats()
+        return None
+    
+    def test_retrieval(self, query: str, k: int = 3, mode: str = "dense") -> Dict[str, Any]:
+        """✅ JAVÍTVA: Retrieval tesztelése (mode: dense / lexical / hybrid)"""
         try:
             if not self.vectorstore:
                 return {'error': 'Vector store nincs inicializálva'}
             
-            # Similarity search
-            docs = self.vectorstore.similarity_search(query, k=k)
+            if mode == "lexical":
+                docs = self.lexical_search(query, k=k)
+            elif mode == "hybrid":
+                docs = self.hybrid_search(query)[:k]
+            else:
+                docs = self.dense_search(query, k=k)
             
             results = []
             for i, doc in enumerate(docs):
@@ -488,17 +1543,85 @@ Kérlek adj részletes egészségügyi tanácsokat a Medline dokumentumok alapj
         except Exception as e:
             return {'error': f'Retrieval teszt hiba: {e}'}
 
+# =============================================================================
+# MEGOSZTOTT ANALYZER - folyamatonként egy példány
+# =============================================================================
+
+class RAGAnalyzerRegistry:
+    """
+    Folyamat szintű, szálbiztos RAGAnalyzer registry.
+    
+    Az analyzer (embedding/LLM kliensek, Chroma store, LCEL chain) egyszer
+    jön létre és minden Streamlit session között megosztott. Újratöltés csak
+    akkor történik, ha az ingest manifest kívülről (pl. másik folyamat) megváltozott.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._analyzers: Dict[str, Tuple[RAGAnalyzer, Optional[Tuple[int, int]]]] = {}
+    
+    def get(self, vector_store_path: str = "rag_pdf/vectorstore") -> RAGAnalyzer:
+        """Megosztott analyzer lekérése (szükség esetén létrehozás / újratöltés)"""
+        key = os.path.abspath(vector_store_path)
+        manifest_path = index_directory(vector_store_path) / MANIFEST_FILENAME
+        
+        with self._lock:
+            analyzer, signature = self._analyzers.get(key, (None, None))
+            
+            if analyzer is None or signature != manifest_signature(manifest_path):
+                if analyzer is not None:
+                    print("🔄 Index manifest változott, RAG Analyzer újratöltése")
+                analyzer = RAGAnalyzer(vector_store_path)
+                self._analyzers[key] = (analyzer, manifest_signature(manifest_path))
+                return analyzer
+        
+        # A frissítés a registry záron kívül fut: más analyzerek / gyors lekérések nem várnak
+        if analyzer.refresh_index():
+            print("🔄 Új / módosult PDF-ek beindexelve a megosztott analyzerbe")
+            with self._lock:
+                # A saját írásainkat követő aláírás mentése (ha közben nem cserélték le)
+                if self._analyzers.get(key, (None, None))[0] is analyzer:
+                    self._analyzers[key] = (analyzer, manifest_signature(manifest_path))
+        return analyzer
+    
+    def clear(self):
+        """Összes megosztott analyzer eldobása (következő get újra létrehozza)"""
+        with self._lock:
+            self._analyzers.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'analyzers': len(self._analyzers),
+                'vector_stores': list(self._analyzers.keys())
+            }
+
+
+_ANALYZER_REGISTRY = RAGAnalyzerRegistry()
+
+
+def get_shared_analyzer(vector_store_path: str = "rag_pdf/vectorstore") -> RAGAnalyzer:
+    """Folyamat szinten megosztott RAGAnalyzer példány"""
+    return _ANALYZER_REGISTRY.get(vector_store_path)
+
+
+def reset_shared_analyzer():
+    """Megosztott analyzer(ek) eldobása"""
+    _ANALYZER_REGISTRY.clear()
+
 # =============================================================================
 # HIÁNYZÓ FÜGGVÉNY HOZZÁADÁSA - kompatibilitáshoz
 # =============================================================================
 
-def run_rag_analysis(patient_data: Dict[str, Any], openai_api_key: str = None) -> Dict[str, Any]:
+def run_rag_analysis(patient_data: Dict[str, Any], openai_api_key: str = None,
+                     stream_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
     """
     ✅ JAVÍTVA: RAG elemzés futtatása - kompatibilitás függvény
     
     Args:
         patient_data: Beteg adatok (a session state-ből)
         openai_api_key: OpenAI API kulcs 
+        stream_callback: Opcionális callback a streamelt válasz megjelenítéséhez
         
     Returns:
         Dict: RAG elemzés eredménye
@@ -506,17 +1629,19 @@ def run_rag_analysis(patient_data: Dict[str, Any], openai_api_key: str = None) -
     try:       
         # API kulcs ellenőrzése
         if not openai_api_key:
-            openai_api_key = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY")
+            openai_api_key = get_openai_api_key()
         
-        if not openai_api_key:
+        # Lokális embeddinggel API kulcs nélkül is fut (offline mód, csak retrieval)
+        if not openai_api_key and embedding_provider() == "openai":
             st.error("❌ OpenAI API kulcs nem található!")
             return _create_empty_result()
+        _show_embedding_mode()
         
-        # RAG Analyzer inicializálása
-        analyzer = RAGAnalyzer()
+        # Megosztott RAG Analyzer (nincs hidegindítás minden elemzésnél)
+        analyzer = get_shared_analyzer()
         
         # Elemzés futtatása
-        results = analyzer.analyze_medical_case(patient_data)
+        results = analyzer.analyze_medical_case(patient_data, stream_callback=stream_callback)
         
         # Eredmények ellenőrzése
         if not results.get('success', False):
@@ -536,6 +1661,64 @@ def run_rag_analysis(patient_data: Dict[str, Any], openai_api_key: str = None) -
         print(f"RAG hiba részletei: {e}")
         return _create_empty_result()
 
+def _show_embedding_mode():
+    """A lokális (hashing) embedding mód jelzése a felületen, nem csak a konzolon"""
+    if embedding_provider() == "hashing":
+        st.warning("⚠️ Offline mód: lokális (hashing) embedding, külön indexszel - "
+                   "a találatok pontossága elmarad az OpenAI embeddingétől")
+
+async def arun_rag_analysis(patient_data: Dict[str, Any], openai_api_key: str = None,
+                            stream_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                            timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    run_rag_analysis async változata: más elemzésekkel (pl. PubMed) párhuzamosan futtatható.
+    
+    A megosztott analyzer betöltése (index szinkronizálás) külön szálon fut,
+    így nem blokkolja az event loopot. Megszakításkor a CancelledError továbbterjed.
+    """
+    try:
+        if not openai_api_key:
+            openai_api_key = get_openai_api_key()
+        
+        # Lokális embeddinggel API kulcs nélkül is fut (offline mód, csak retrieval)
+        if not openai_api_key and embedding_provider() == "openai":
+            st.error("❌ OpenAI API kulcs nem található!")
+            return _create_empty_result()
+        _show_embedding_mode()
+        
+        analyzer = await _run_in_thread(get_shared_analyzer)
+        
+        results = await analyzer.aanalyze_medical_case(
+            patient_data, stream_callback=stream_callback, timeout=timeout
+        )
+        
+        if not results.get('success', False):
+            st.warning(f"⚠️ RAG elemzés problémába ütközött: {results.get('error', 'Ismeretlen hiba')}")
+            return _create_empty_result()
+        
+        _save_rag_results(results, patient_data)
+        return results
+        
+    except Exception as e:
+        st.error(f"❌ RAG elemzési hiba: {e}")
+        print(f"RAG hiba részletei: {e}")
+        return _create_empty_result()
+
+def analyze_many(cases: List[Dict[str, Any]], output_path: Optional[str] = None,
+                 max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Batch RAG elemzés a megosztott analyzerrel (pl. éjszakai QA visszajátszás).
+    
+    Returns:
+        Dict: Áteresztőképesség riport (az eredmények a JSONL output fájlban)
+    """
+    if not get_openai_api_key() and embedding_provider() == "openai":
+        print("❌ OpenAI API kulcs nem található!")
+        return {'success': False, 'error': 'OpenAI API kulcs nem található'}
+    
+    analyzer = get_shared_analyzer()
+    return analyzer.analyze_many(cases, output_path=output_path, max_concurrency=max_concurrency)
+
 def _create_empty_result() -> Dict[str, Any]:
     """Üres eredmény struktúra"""
     return {
@@ -0,0 +1,83 @@
+# =============================================================================
+# rag_pdf/rebuild_index.py
+# =============================================================================
+"""
+RAG index újraépítése parancssorból.
+
+A PDF-ek szövege a kinyert szöveg cache-ből jön (PyPDF parse nélkül), a
+változatlan chunk szövegek vektorai az embedding cache-ből, így egy
+chunkolási kísérlet csak az új chunkokat ágyazza be.
+
+A --chunk-size / --chunk-overlap csak erre a futásra érvényes (nem íródik
+vissza a konfigurációba): az alkalmazás következő indulása a
+RAG_CONFIG["chunking"] értékeire chunkol vissza. Tartós váltáshoz a
+config.py-t kell módosítani.
+
+Használat:
+    python -m rag_pdf.rebuild_index
+    python -m rag_pdf.rebuild_index --chunk-size 800 --chunk-overlap 150
+    python -m rag_pdf.rebuild_index --full
+    python -m rag_pdf.rebuild_index --workers 4
+"""
+import argparse
+import time
+
+from .config import RAG_CONFIG
+from .ingest_manifest import IngestManifest, MANIFEST_FILENAME
+from .rag_analyzer import RAGAnalyzer, index_directory
+from .text_cache import ExtractedTextCache
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="RAG index újraépítése a kinyert szöveg cache-ből")
+    parser.add_argument("--vector-store", default="rag_pdf/vectorstore",
+                        help="Vector store könyvtár (alapértelmezés: rag_pdf/vectorstore)")
+    parser.add_argument("--backend", choices=["chroma", "numpy"],
+                        help="Vector store backend (alapértelmezés: RAG_CONFIG)")
+    parser.add_argument("--chunk-size", type=int,
+                        help="Chunk méret (karakter) - csak erre a futásra; az alkalmazás következő "
+                             "indulása a RAG_CONFIG értékére chunkol vissza")
+    parser.add_argument("--chunk-overlap", type=int,
+                        help="Chunk átfedés (karakter) - csak erre a futásra; az alkalmazás következő "
+                             "indulása a RAG_CONFIG értékére chunkol vissza")
+    parser.add_argument("--full", action="store_true",
+                        help="Minden PDF újrachunkolása akkor is, ha a beállítások nem változtak")
+    parser.add_argument("--workers", type=int,
+                        help="PDF parse/chunk worker folyamatok száma (alapértelmezés: RAG_CONFIG, soros)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.backend:
+        RAG_CONFIG["chroma"]["backend"] = args.backend
+    if args.chunk_size:
+        RAG_CONFIG["chunking"]["chunk_size"] = args.chunk_size
+    if args.chunk_overlap is not None:
+        RAG_CONFIG["chunking"]["chunk_overlap"] = args.chunk_overlap
+    if args.workers:
+        RAG_CONFIG["ingest"]["workers"] = args.workers
+
+    if args.full:
+        manifest = IngestManifest(index_directory(args.vector_store) / MANIFEST_FILENAME)
+        if not manifest.is_empty():
+            manifest.invalidate_settings()
+            manifest.save()
+
+    print(f"🔧 Chunkolás: {RAG_CONFIG['chunking']['chunk_size']}/{RAG_CONFIG['chunking']['chunk_overlap']}")
+    start = time.perf_counter()
+    # Az inicializálás szinkronizálja az indexet (változott beállítás esetén teljes újrachunkolás)
+    analyzer = RAGAnalyzer(args.vector_store)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Index kész {elapsed:.1f} s alatt: {analyzer.manifest.stats()}")
+    if RAG_CONFIG["text_cache"]["enabled"]:
+        print(f"📄 Szöveg cache: {ExtractedTextCache(RAG_CONFIG['text_cache']['dir']).stats()}")
+    embedding_stats = analyzer.get_embedding_cache_stats()
+    if embedding_stats:
+        print(f"🧮 Embedding cache: {embedding_stats}")
+
+
+if __name__ == "__main__":
+    main()
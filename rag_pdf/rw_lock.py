@@ -0,0 +1,67 @@
+# =============================================================================
+# rag_pdf/rw_lock.py
+# =============================================================================
+"""
+Olvasó / író zár a megosztott RAG index védelmére.
+
+Tetszőleges számú retrieval (olvasó) futhat egyszerre; az index
+szinkronizálás és tömörítés (író) kizárólagos hozzáférést kap. Író
+preferáló: várakozó író mellett új olvasó nem lép be, így a szinkron nem
+éhezik ki. Az olvasó oldal szálanként újrabelépő (a keresések egymást
+hívják), és az író szál is olvashat a saját zárja alatt.
+"""
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """Író preferáló, olvasó oldalon újrabelépő RW zár"""
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # Az írást tartó szál azonosítója
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self):
+        depth = getattr(self._local, 'depth', 0)
+        # Csak a legkülső olvasás (és nem az író szál) foglal
+        owns = depth == 0 and self._writer != threading.get_ident()
+        if owns:
+            with self._condition:
+                while self._writer is not None or self._writers_waiting:
+                    self._condition.wait()
+                self._readers += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if owns:
+                with self._condition:
+                    self._readers -= 1
+                    if self._readers == 0:
+                        self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            yield
+            return
+        with self._condition:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
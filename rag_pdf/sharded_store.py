@@ -0,0 +1,280 @@
+# =============================================================================
+# rag_pdf/sharded_store.py
+# =============================================================================
+"""
+Topic szerint shardolt vector store párhuzamos (fan-out) kereséssel.
+
+A chunkok a `topic` metadata alapján külön shardokba kerülnek (topiconként
+egy shard, vagy a topic hash-e szerinti bucketekbe). Lekérdezéskor a
+kérdésben szereplő topicok shardjaira irányítunk, ha ilyen nincs, minden
+shardot párhuzamos szálakon kérdezünk le, és a relevancia pontszámok
+alapján egyesítjük a top-k találatot. A lekérdezés embeddingje egyszer
+készül el, a shardok csak vektor keresést végeznek.
+"""
+import os
+import re
+import json
+import zlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Callable
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+SHARD_MAP_FILENAME = "shards.json"
+
+
+def shard_name(topic: str, mode: str = "hash", buckets: int = 16) -> str:
+    """Topic -> shard név ("topic": topiconként, "hash": crc32 bucket)"""
+    topic = (topic or "unknown").lower()
+    if mode == "topic":
+        return "topic_" + (re.sub(r"[^a-z0-9]+", "-", topic).strip("-") or "unknown")
+    return f"bucket_{zlib.crc32(topic.encode('utf-8')) % buckets:03d}"
+
+
+def _file_prefix(chunk_id: str) -> str:
+    # make_chunk_id: "<fájlnév hash>-<tartalom hash>-<sorszám>"
+    return chunk_id.split("-", 1)[0]
+
+
+class ShardedVectorStore(VectorStore):
+    """
+    Shardolt vector store.
+
+    Args:
+        persist_directory: A shard térkép (és numpy shardok) könyvtára
+        embedding_function: Embeddings (a lekérdezés egyszer ágyazódik be)
+        shard_factory: shard név -> VectorStore (lustán hívva)
+        mode: "hash" vagy "topic"
+        buckets: hash bucketek száma
+        max_workers: fan-out szálak száma
+    """
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings,
+                 shard_factory: Callable[[str], VectorStore], mode: str = "hash",
+                 buckets: int = 16, max_workers: int = 8):
+        self.persist_directory = Path(persist_directory)
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        self._embedding = embedding_function
+        self._shard_factory = shard_factory
+        self.mode = mode
+        self.buckets = buckets
+        self.max_workers = max_workers
+
+        self._shards: Dict[str, VectorStore] = {}
+        self._file_shards: Dict[str, str] = {}  # chunk ID fájl prefix -> shard
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rag-shard")
+        self._load_map()
+
+    # ------------------------------------------------------------------
+    # Shard térkép
+    # ------------------------------------------------------------------
+    def _map_path(self) -> Path:
+        return self.persist_directory / SHARD_MAP_FILENAME
+
+    def _load_map(self):
+        if not self._map_path().exists():
+            return
+        try:
+            with open(self._map_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._file_shards = data.get('files', {})
+            for name in data.get('shards', []):
+                self._shard(name)
+        except Exception as e:
+            print(f"⚠️ Shard térkép betöltési hiba: {e}")
+
+    def _save_map(self):
+        data = {
+            'mode': self.mode,
+            'buckets': self.buckets,
+            'shards': sorted(self._shards),
+            'files': self._file_shards
+        }
+        tmp_path = self._map_path().with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self._map_path())
+
+    def _shard(self, name: str) -> VectorStore:
+        with self._lock:
+            shard = self._shards.get(name)
+            if shard is None:
+                shard = self._shard_factory(name)
+                self._shards[name] = shard
+            return shard
+
+    def shard_for(self, topic: str) -> str:
+        return shard_name(topic, self.mode, self.buckets)
+
+    @property
+    def shard_names(self) -> List[str]:
+        return sorted(self._shards)
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self._embedding
+
+    # ------------------------------------------------------------------
+    # Írás
+    # ------------------------------------------------------------------
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        if ids is None:
+            raise ValueError("ShardedVectorStore: a chunk ID-k megadása kötelező")
+
+        groups: Dict[str, Tuple[List[str], List[dict], List[str]]] = {}
+        for text, metadata, chunk_id in zip(texts, metadatas, ids):
+            name = self.shard_for(metadata.get('topic'))
+            group = groups.setdefault(name, ([], [], []))
+            group[0].append(text)
+            group[1].append(metadata)
+            group[2].append(chunk_id)
+
+        with self._lock:
+            for name, (group_texts, group_metadatas, group_ids) in groups.items():
+                self._shard(name).add_texts(group_texts, metadatas=group_metadatas, ids=group_ids)
+                for chunk_id in group_ids:
+                    self._file_shards[_file_prefix(chunk_id)] = name
+            self._save_map()
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+        by_shard: Dict[str, List[str]] = {}
+        with self._lock:
+            for chunk_id in ids:
+                name = self._file_shards.get(_file_prefix(chunk_id))
+                # Ismeretlen fájl: minden shardból törlünk
+                for target in ([name] if name else list(self._shards)):
+                    by_shard.setdefault(target, []).append(chunk_id)
+            for name, shard_ids in by_shard.items():
+                self._shard(name).delete(ids=shard_ids)
+        return True
+
+    def compact(self) -> int:
+        """Shardonkénti tömörítés (csak a compact()-ot támogató, pl. numpy shardok), felszabadított bájtok"""
+        with self._lock:
+            return sum(shard.compact() for shard in list(self._shards.values()) if hasattr(shard, 'compact'))
+
+    # ------------------------------------------------------------------
+    # Olvasás
+    # ------------------------------------------------------------------
+    def count(self) -> int:
+        return sum(_shard_count(shard) for shard in list(self._shards.values()))
+
+    def get(self, ids: Optional[List[str]] = None, include: Optional[List[str]] = None) -> Dict[str, List]:
+        """Chroma kompatibilis get (ids, documents, metadatas) az összes érintett shardból"""
+        result = {'ids': [], 'documents': [], 'metadatas': []}
+        wanted = set(ids) if ids is not None else None
+        for shard in list(self._shards.values()):
+            for chunk_id, text, metadata in _iter_shard_records(shard, ids):
+                if wanted is None or chunk_id in wanted:
+                    result['ids'].append(chunk_id)
+                    result['documents'].append(text)
+                    result['metadatas'].append(metadata)
+        return result
+
+    def get_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        """Tárolt vektorok ID szerint az összes shardból"""
+        vectors: Dict[str, List[float]] = {}
+        for shard in list(self._shards.values()):
+            missing = [chunk_id for chunk_id in ids if chunk_id not in vectors]
+            if not missing:
+                break
+            vectors.update(_get_shard_vectors(shard, missing))
+        return vectors
+
+    def route(self, topics: Optional[Iterable[str]] = None) -> List[str]:
+        """A topicokhoz tartozó létező shardok (üres lista = teljes fan-out)"""
+        if not topics:
+            return []
+        return sorted({self.shard_for(t) for t in topics} & set(self._shards))
+
+    def similarity_search_by_vector_with_relevance(self, embedding: List[float], k: int = 4,
+                                                   topics: Optional[Iterable[str]] = None
+                                                   ) -> List[Tuple[Document, float]]:
+        """Párhuzamos shard keresés, egyesítés [0, 1] relevancia szerint"""
+        names = self.route(topics) or self.shard_names
+        if not names:
+            return []
+
+        futures = [
+            self._executor.submit(_search_shard, self._shard(name), embedding, k)
+            for name in names
+        ]
+        merged = []
+        for future in futures:
+            try:
+                merged.extend(future.result())
+            except Exception as e:
+                print(f"⚠️ Shard keresési hiba: {e}")
+
+        merged.sort(key=lambda item: item[1], reverse=True)
+        return merged[:k]
+
+    def similarity_search_with_relevance_scores(self, query: str, k: int = 4,
+                                                **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_relevance(
+            self._embedding.embed_query(query), k, topics=kwargs.get('topics')
+        )
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4,
+                                    **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_relevance(
+            embedding, k, topics=kwargs.get('topics'))]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_relevance_scores(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # A shardok pontszámai már [0, 1] relevanciára vannak normalizálva
+        return lambda score: score
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings,
+                   metadatas: Optional[List[dict]] = None, **kwargs: Any) -> "ShardedVectorStore":
+        raise NotImplementedError("ShardedVectorStore: használd a konstruktort shard_factory-val")
+
+
+def _shard_count(shard: VectorStore) -> int:
+    if hasattr(shard, 'count'):
+        return shard.count()
+    return shard._collection.count()
+
+
+def _iter_shard_records(shard: VectorStore, ids: Optional[List[str]]):
+    """(id, szöveg, metadata) a shardból - numpy: szekvenciális olvasás, Chroma: get"""
+    if hasattr(shard, 'iter_records'):
+        for _, record in shard.iter_records():
+            yield record['id'], record['text'], record.get('metadata') or {}
+        return
+    stored = shard.get(ids=ids, include=["documents", "metadatas"])
+    for chunk_id, text, metadata in zip(stored['ids'], stored['documents'], stored['metadatas']):
+        yield chunk_id, text, metadata or {}
+
+
+def _get_shard_vectors(shard: VectorStore, ids: List[str]) -> Dict[str, List[float]]:
+    """Tárolt vektorok egy shardból - numpy: memmap sorok, Chroma: get embeddings"""
+    if hasattr(shard, 'get_vectors'):
+        return shard.get_vectors(ids)
+    stored = shard._collection.get(ids=ids, include=["embeddings"])
+    return dict(zip(stored['ids'], stored['embeddings']))
+
+
+def _search_shard(shard: VectorStore, embedding: List[float], k: int) -> List[Tuple[Document, float]]:
+    """Egy shard top-k keresése, a pontszám [0, 1] relevanciára alakítva"""
+    relevance_fn = shard._select_relevance_score_fn()
+    if hasattr(shard, 'similarity_search_by_vector_with_score'):
+        raw = shard.similarity_search_by_vector_with_score(embedding, k)
+    else:
+        # Chroma: távolságot ad vissza
+        raw = shard.similarity_search_by_vector_with_relevance_scores(embedding, k)
+    return [(doc, relevance_fn(score)) for doc, score in raw]
@@ -0,0 +1,68 @@
+# =============================================================================
+# rag_pdf/text_cache.py
+# =============================================================================
+"""
+Kinyert PDF szöveg cache (oldalanként, a PDF tartalom hash-ével kulcsolva).
+
+Fájlonként egy gzip-elt JSONL: soronként {"page": n, "text": "..."}.
+Újrachunkoláskor és újraindexeléskor így nem kell a PyPDF parse-t
+megismételni, elég a sima szöveget beolvasni. Az írás atomikus, így
+párhuzamos worker folyamatok is használhatják.
+"""
+import os
+import gzip
+import json
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict, Any
+
+# (oldal szöveg, oldalszám)
+Page = Tuple[str, int]
+
+
+class ExtractedTextCache:
+    """PDF tartalom hash -> oldalankénti szöveg"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, content_hash: str) -> Path:
+        return self.cache_dir / content_hash[:2] / f"{content_hash}.jsonl.gz"
+
+    def has(self, content_hash: str) -> bool:
+        return self._path(content_hash).exists()
+
+    def get(self, content_hash: str) -> Optional[List[Page]]:
+        """Oldalak betöltése (None, ha nincs a cache-ben vagy sérült)"""
+        path = self._path(content_hash)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return [(record['text'], record['page']) for record in map(json.loads, f)]
+        except Exception as e:
+            print(f"⚠️ Szöveg cache olvasási hiba ({path.name}): {e}")
+            return None
+
+    def put(self, content_hash: str, pages: List[Page]):
+        """Oldalak mentése (ideiglenes fájl + csere)"""
+        path = self._path(content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for text, page in pages:
+                f.write(json.dumps({'page': page, 'text': text}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+
+    def remove(self, content_hash: str):
+        try:
+            self._path(content_hash).unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        files = list(self.cache_dir.glob("*/*.jsonl.gz")) if self.cache_dir.exists() else []
+        return {
+            'files': len(files),
+            'bytes': sum(f.stat().st_size for f in files)
+        }
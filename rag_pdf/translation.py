@@ -0,0 +1,136 @@
+# =============================================================================
+# rag_pdf/translation.py
+# =============================================================================
+"""
+Batch-elt, memorizált magyar -> angol fordítás a RAG lekérdezésekhez.
+
+Egy esethez legfeljebb egy LLM hívás történik (csak a még ismeretlen
+kifejezésekkel), a lefordított kifejezések pedig egy lemezre mentett
+fordítási memóriába kerülnek a normalizált magyar kifejezés kulcsával.
+A memória folyamat szinten közös; a függőségmentes mag (memória + batch
+fordító) a `batch_translation` modulban van.
+"""
+import threading
+from typing import Dict, List, Any, Optional
+
+from langchain_openai import ChatOpenAI
+
+from .config import RAG_CONFIG
+from .batch_translation import BatchTranslator, TranslationMemory, normalize_phrase
+
+# Mezők, amelyeket fordítunk (lista vagy szöveg értékkel)
+TRANSLATED_FIELDS = [
+    'symptoms', 'diagnosis', 'existing_conditions', 'medications',
+    'gender', 'duration', 'severity'
+]
+
+
+_shared_memory: Optional[TranslationMemory] = None
+_shared_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> TranslationMemory:
+    """A folyamat közös fordítási memóriája (egy fájl - egy példány, különben a mentések felülírnák egymást)"""
+    global _shared_memory
+    with _shared_memory_lock:
+        if _shared_memory is None:
+            _shared_memory = TranslationMemory(RAG_CONFIG["translation"]["memory_path"])
+        return _shared_memory
+
+
+class PatientDataTranslator(BatchTranslator):
+    """
+    Betegadatok fordítása: memória először, a hiányzó kifejezések egyetlen LLM hívásban.
+
+    Args:
+        openai_api_key: OpenAI API kulcs (None: csak a fordítási memória)
+        memory: Fordítási memória (None: a folyamat közös memóriája)
+        llm: Kész chat modell; None esetén a RAG_CONFIG szerint
+        max_memorized_words: Ennél hosszabb szöveg (pl. összefoglaló) nem kerül a memóriába
+    """
+
+    def __init__(self, openai_api_key: str, memory: Optional[TranslationMemory] = None,
+                 llm: Any = None, max_memorized_words: Optional[int] = None):
+        config = RAG_CONFIG["translation"]
+        # API kulcs nélkül csak a fordítási memória használható
+        llm = llm if llm is not None else ChatOpenAI(
+            openai_api_key=openai_api_key,
+            model=config["model"],
+            temperature=config["temperature"]
+        ) if openai_api_key else None
+        super().__init__(llm, memory or get_translation_memory(), max_memorized_words)
+
+    def translate_patient_data(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Betegadatok fordítása egyetlen (memóriából hiányzó) batch-csel"""
+        phrases = collect_phrases(patient_data)
+        translations = self.translate_phrases(phrases)
+        return apply_translations(patient_data, translations)
+
+    async def atranslate_patient_data(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        translations = await self.atranslate_phrases(collect_phrases(patient_data))
+        return apply_translations(patient_data, translations)
+
+
+def collect_phrases(patient_data: Dict[str, Any]) -> List[str]:
+    """Az összes fordítandó kifejezés a betegadatokból"""
+    phrases = []
+    for field_name in TRANSLATED_FIELDS:
+        value = patient_data.get(field_name)
+        if isinstance(value, list):
+            phrases.extend(str(item) for item in value if item)
+        elif value:
+            phrases.append(str(value))
+    return phrases
+
+
+def apply_translations(patient_data: Dict[str, Any], translations: Dict[str, str]) -> Dict[str, Any]:
+    """Fordítások visszaírása az adatstruktúrába (lista marad lista, szöveg szöveg)"""
+    def lookup(item: Any) -> str:
+        return translations.get(normalize_phrase(item), str(item))
+
+    translated = patient_data.copy()
+    for field_name in TRANSLATED_FIELDS:
+        value = patient_data.get(field_name)
+        if isinstance(value, list):
+            translated[field_name] = [lookup(item) for item in value if item]
+        elif value:
+            translated[field_name] = lookup(value)
+        elif field_name in ('symptoms', 'existing_conditions', 'medications'):
+            translated[field_name] = []
+        else:
+            translated[field_name] = ""
+    return translated
+
+
+# Folyamat szinten megosztott fordítók (API kulcsonként)
+_TRANSLATORS: Dict[str, PatientDataTranslator] = {}
+_TRANSLATORS_LOCK = threading.Lock()
+
+
+def get_translator(openai_api_key: str) -> PatientDataTranslator:
+    with _TRANSLATORS_LOCK:
+        translator = _TRANSLATORS.get(openai_api_key)
+        if translator is None:
+            translator = PatientDataTranslator(openai_api_key)
+            _TRANSLATORS[openai_api_key] = translator
+        return translator
+
+
+# Kompatibilitási függvények (korábbi API)
+def translate_text(text: str, openai_api_key: str) -> str:
+    if not text:
+        return ""
+    return get_translator(openai_api_key).translate_phrases([text]).get(normalize_phrase(text), text)
+
+
+def translate_list(items: List[str], openai_api_key: str) -> List[str]:
+    translations = get_translator(openai_api_key).translate_phrases(items)
+    return [translations.get(normalize_phrase(item), item) for item in items if item]
+
+
+def translate_patient_data(patient_data: Dict[str, Any], openai_api_key: str) -> Dict[str, Any]:
+    return get_translator(openai_api_key).translate_patient_data(patient_data)
+
+
+async def atranslate_patient_data(patient_data: Dict[str, Any], openai_api_key: str) -> Dict[str, Any]:
+    return await get_translator(openai_api_key).atranslate_patient_data(patient_data)
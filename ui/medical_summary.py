@@ -13,6 +13,7 @@ from pathlib import Path
 from datetime import datetime
 import re
 import json
+import asyncio
 
 # Streamlitre kell
 try:
@@ -35,7 +36,6 @@ def download_medline():
         download_key = f"medline_download_completed_{hash(str(st.session_state.medline_topics))}"
         
         if not st.session_state.get(download_key, False) and not st.session_state.get('medline_downloaded_pdfs'):
-            import asyncio
             from medline_download import download_medline_pdfs
 
             async def run_download():
@@ -47,18 +47,70 @@ def download_medline():
                 return await download_medline_pdfs(st.session_state.medline_topics, patient_data)
 
             # Letöltés futtatása
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
             try:
-                result = loop.run_until_complete(run_download())
+                result = asyncio.run(run_download())
                 if result['success']:
                     st.session_state.medline_downloaded_pdfs = result['pdf_files']
                     st.session_state[download_key] = True
             except Exception as e:
                 # Silent error handling - logikában marad a hiba információ
                 st.session_state.medline_download_error = str(e)
-            finally:
-                loop.close()
+
+
+# RAG válasz szekciók megjelenítési ikonjai (a végleges eredmény sorrendjében)
+RAG_SECTION_ICONS = {
+    'patient_condition': "📋",
+    'symptom_management': "💊",
+    'recommended_specialist': "👨‍⚕️",
+    'additional_info': "ℹ️",
+}
+
+
+def render_rag_stream(placeholder, progress):
+    """Streamelt RAG válasz kirajzolása: kész szekciók zölden, az aktuális folyamatban"""
+    with placeholder.container():
+        st.markdown("### 🧠 RAG Elemzés Eredménye")
+        for key, icon in RAG_SECTION_ICONS.items():
+            text = progress['sections'].get(key)
+            if not text:
+                continue
+            if key in progress['completed']:
+                st.success(f"{icon} {text}")
+            else:
+                st.info(f"{icon} {text} ▌")
+        if not progress['sections']:
+            st.info("🧠 RAG elemzés folyamatban...")
+
+
+def run_concurrent_analyses(patient_data, stream_placeholder, include_pubmed=True):
+    """
+    RAG és PubMed elemzés párhuzamos futtatása a script szálán (asyncio.run).
+    A PubMed keresés azonnal indul, csak az elemzési lépése várja meg a RAG eredményt.
+    A blokkoló hívások szálakon futnak, a kirajzolás a script szálán marad.
+    
+    Returns:
+        tuple: (rag_results, pubmed_results vagy None)
+    """
+    from rag_pdf import arun_rag_analysis
+
+    async def run_all():
+        rag_task = asyncio.ensure_future(arun_rag_analysis(
+            patient_data,
+            stream_callback=lambda text, progress: render_rag_stream(stream_placeholder, progress)
+        ))
+        if not include_pubmed:
+            return await rag_task, None
+
+        from pubmed_integration import arun_pubmed_analysis
+        pubmed_task = asyncio.ensure_future(arun_pubmed_analysis(patient_data, rag_results=rag_task))
+        try:
+            return await asyncio.gather(rag_task, pubmed_task)
+        except BaseException:
+            rag_task.cancel()
+            pubmed_task.cancel()
+            raise
+
+    return asyncio.run(run_all())
 
 
 def display_medical_summary():
@@ -119,6 +171,11 @@ def display_medical_summary():
 
         # Gomb csak akkor jelenik meg, ha még nem indítottuk el az elemzést
         if not st.session_state['rag_analysis_started']:
+            include_pubmed = st.checkbox(
+                "🔬 PubMed kutatás párhuzamos futtatása",
+                value=True,
+                key="run_pubmed_with_rag"
+            )
             if st.button("🔍 RAG Elemzés indítása", type="primary", key="start_rag_analysis"):
                 # Megjelöljük, hogy elindítottuk az elemzést
                 st.session_state['rag_analysis_started'] = True
@@ -126,17 +183,23 @@ def display_medical_summary():
                 # RAG modul importálása
                 with st.spinner("🧠 RAG elemzés folyamatban..."):
                     download_medline()  # Letöltés indítása, ha még nem történt meg
-                    from rag_pdf import run_rag_analysis
                     
                     # ✅ JAVÍTÁS: Közös függvény használata
                     patient_data_for_rag = prepare_patient_data_for_analysis()
-                    
-                    # RAG elemzés futtatása
-                    rag_results = run_rag_analysis(patient_data_for_rag)
-                    
-                    # Eredmények session state-be mentése
-                    st.session_state['rag_analysis_results'] = rag_results
-                    st.rerun()  # Újraindítjuk az oldalt, hogy megjelenjenek az eredmények
+                
+                # RAG (és PubMed) elemzés párhuzamosan - a RAG válasz szekciói érkezés közben jelennek meg
+                stream_placeholder = st.empty()
+                rag_results, pubmed_results = run_concurrent_analyses(
+                    patient_data_for_rag,
+                    stream_placeholder,
+                    include_pubmed=include_pubmed
+                )
+                
+                # Eredmények session state-be mentése
+                st.session_state['rag_analysis_results'] = rag_results
+                if pubmed_results and pubmed_results.get('success'):
+                    st.session_state['pubmed_analysis_results'] = pubmed_results
+                st.rerun()  # Újraindítjuk az oldalt, hogy megjelenjenek az eredmények
             
         # Eredmény megjelenítése
         rag_results = st.session_state.get('rag_analysis_results')
@@ -270,7 +333,6 @@ def create_medical_display():
 
             # PDF letöltés indítása
             if st.button("📥 Letöltés indítása", type="primary", key="start_medline_download"):
-                import asyncio
                 from medline_download import download_medline_pdfs, get_download_status
 
                 progress_bar = st.progress(0.0)
@@ -285,20 +347,15 @@ def create_medical_display():
                     return await download_medline_pdfs(st.session_state.medline_topics, patient_data)
 
                 with st.spinner("Medline információk letöltése..."):
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        result = loop.run_until_complete(run_download())
-                        if result['success']:
-                            st.session_state.medline_downloaded_pdfs = result['pdf_files']
-                            st.success(f"✅ Sikeres letöltés! {len(result['pdf_files'])} fájl.")
-                            st.rerun()
-                        else:
-                            st.error("❌ Letöltés sikertelen!")
-                            for err in result.get('errors', []):
-                                st.error(err)
-                    finally:
-                        loop.close()
+                    result = asyncio.run(run_download())
+                    if result['success']:
+                        st.session_state.medline_downloaded_pdfs = result['pdf_files']
+                        st.success(f"✅ Sikeres letöltés! {len(result['pdf_files'])} fájl.")
+                        st.rerun()
+                    else:
+                        st.error("❌ Letöltés sikertelen!")
+                        for err in result.get('errors', []):
+                            st.error(err)
         else:
             st.warning("Először generálj Medline témaköröket az AI összefoglaló fülön.")
 